@@ -6,8 +6,349 @@ import re
 import json
 import os
 import logging
-from typing import Dict, List, Tuple, Any, Optional, Union
-from collections import Counter
+import weakref
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Any, Optional, Union, Collection
+from collections import Counter, OrderedDict
+
+# Configurar logging una sola vez, al importar el módulo
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO, 
+                      format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger('CitationStyleDetector')
+
+# Compilación con re2 (si está disponible) compartida con los demás módulos
+try:
+    from .patterns import RE2_AVAILABLE, compile_re2
+except ImportError:
+    from patterns import RE2_AVAILABLE, compile_re2
+
+# Analizador de expresiones regulares de re (sre_parse antes de Python 3.11)
+try:
+    from re import _parser as _sre_parser
+except ImportError:
+    import sre_parse as _sre_parser
+
+# Intentar importar pyahocorasick si está disponible
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+def _count_matches(patterns: List[re.Pattern], text: str, start: int = 0) -> int:
+    """
+    Cuenta las coincidencias de una lista de patrones en el texto.
+    
+    Args:
+        patterns (List[re.Pattern]): Patrones compilados
+        text (str): El texto a analizar
+        start (int): Posición desde la que buscar
+        
+    Returns:
+        int: Número total de coincidencias
+    """
+    total = 0
+    for pattern in patterns:
+        if _is_line_anchored(pattern):
+            total += _count_anchored_matches(pattern, text, start)
+        else:
+            # finditer evita construir la lista de tuplas de grupos que devuelve findall
+            total += sum(1 for _ in pattern.finditer(text, start))
+    return total
+
+# Resultado de _is_line_anchored por (fuente, indicadores) del patrón
+_line_anchored_cache = {}
+
+def _is_line_anchored(pattern: re.Pattern) -> bool:
+    """
+    Indica si todas las coincidencias de un patrón empiezan en un inicio de línea: el
+    patrón analizado debe empezar por '^' fuera de cualquier alternancia (en
+    '^a|b' solo la primera rama está anclada).
+    
+    Args:
+        pattern (re.Pattern): Patrón compilado
+        
+    Returns:
+        bool: True si se pueden contar sus coincidencias con _count_anchored_matches
+    """
+    # Con re2 cada búsqueda recorre el texto entero, así que el atajo sería cuadrático
+    if not isinstance(pattern, re.Pattern):
+        return False
+    key = (pattern.pattern, pattern.flags)
+    anchored = _line_anchored_cache.get(key)
+    if anchored is None:
+        try:
+            items = _sre_parser.parse(pattern.pattern, key[1]).data
+            anchored = bool(items) and items[0] == (_sre_parser.AT, _sre_parser.AT_BEGINNING)
+        except Exception:
+            anchored = False
+        _line_anchored_cache[key] = anchored
+    return anchored
+
+def _count_anchored_matches(pattern: re.Pattern, text: str, start: int = 0) -> int:
+    """
+    Cuenta las coincidencias de un patrón anclado a inicio de línea probando solo
+    los inicios de línea, en lugar de recorrer el texto posición a posición.
+    
+    Args:
+        pattern (re.Pattern): Patrón compilado que empieza por '^' (modo multilínea)
+        text (str): El texto a analizar
+        start (int): Posición desde la que buscar
+        
+    Returns:
+        int: Número de coincidencias, igual que len(pattern.findall(text, start))
+    """
+    count = 0
+    pos = start
+    if pos > 0 and text[pos - 1] != '\n':
+        pos = text.find('\n', pos) + 1
+        if pos == 0:
+            return 0
+    
+    while True:
+        match = pattern.match(text, pos)
+        end = pos
+        if match:
+            count += 1
+            end = match.end()
+            # Una coincidencia puede terminar justo al inicio de la siguiente línea
+            if end > pos and text[end - 1] == '\n':
+                pos = end
+                continue
+        pos = text.find('\n', end) + 1
+        if pos == 0:
+            return count
+
+def _count_paragraph_citations(paragraphs: List[str], citations: List[str]) -> List[int]:
+    """
+    Cuenta, para cada párrafo, cuántas de las citas dadas aparecen en él.
+    
+    Args:
+        paragraphs (List[str]): Los párrafos a analizar
+        citations (List[str]): Las citas a buscar
+        
+    Returns:
+        List[int]: Número de citas presentes en cada párrafo, en el mismo orden
+    """
+    return [sum(1 for citation in citations if citation in paragraph) for paragraph in paragraphs]
+
+# Separador para unir nombres en una sola cadena; no aparece en nombres reales
+_NAME_SEPARATOR = '\x00'
+
+def _partial_name_match(name: str, candidates: Collection[str], haystack: str) -> bool:
+    """
+    Indica si un nombre contiene a alguno de los candidatos o está contenido en alguno.
+    
+    La mitad "contenido en algún candidato" se resuelve con una sola búsqueda en la
+    cadena que une todos los candidatos, en lugar de comparar uno a uno.
+    
+    Args:
+        name (str): Nombre normalizado a comparar
+        candidates (Collection[str]): Nombres normalizados con los que comparar
+        haystack (str): Los candidatos unidos con _NAME_SEPARATOR
+        
+    Returns:
+        bool: True si hay inclusión en algún sentido con algún candidato
+    """
+    if not candidates:
+        return False
+    if _NAME_SEPARATOR in name:
+        # Una búsqueda en la cadena unida podría cruzar el separador
+        return any(name in candidate or candidate in name for candidate in candidates)
+    return name in haystack or any(candidate in name for candidate in candidates)
+
+# Salto de línea tras el que empieza una entrada bibliográfica: cualquier línea no
+# sangrada (la entrada puede empezar por una mayúscula acentuada, una partícula
+# como "van" o un marcador de lista); las sangradas continúan la entrada anterior
+_ENTRY_SPLIT_RE = re.compile(r'\n(?![ \t])')
+
+# Fragmentos comunes de los patrones de citas en texto
+_NAME = r'[A-Za-z\-]+(?:\s[A-Za-z\-]+)?'
+_AUTHOR = rf'{_NAME}(?: et al\.)?'
+_YEAR = r'\d{4}'
+_PAGES = r'\d+(?:-\d+)?'
+_APA_PAGES = rf'(?:,\s(?P<pages>p\.?\s{_PAGES}))?'
+
+# Patrones integrados para detectar citas en texto
+_IN_TEXT_PATTERNS = {
+    'APA': [
+        # (Autor, 2020) o (Autor, 2020, p. 25)
+        rf'\((?P<author>{_AUTHOR}),\s(?P<year>{_YEAR}){_APA_PAGES}\)',
+        
+        # (Autor & Autor, 2020)
+        rf'\((?P<author1>{_NAME})\s&\s(?P<author2>{_NAME}),\s(?P<year>{_YEAR}){_APA_PAGES}\)',
+        
+        # (Autor et al., 2020)
+        rf'\((?P<author>{_NAME})\set\sal\.,\s(?P<year>{_YEAR}){_APA_PAGES}\)',
+        
+        # Autor (2020) o Autor (2020, p. 25)
+        rf'(?P<author>{_NAME})\s\((?P<year>{_YEAR}){_APA_PAGES}\)'
+    ],
+    'MLA': [
+        # (Smith 25)
+        rf'\((?P<author>{_AUTHOR}) (?P<pages>{_PAGES})\)',
+        
+        # (Smith and Johnson 25)
+        rf'\((?P<author1>{_NAME}) and (?P<author2>{_NAME}) (?P<pages>{_PAGES})\)',
+        
+        # Smith (25)
+        rf'(?P<author>{_AUTHOR}) \((?P<pages>{_PAGES})\)'
+    ],
+    'CHICAGO_AUTHOR_DATE': [
+        # (Autor 2020, 25)
+        rf'\((?P<author>{_AUTHOR}) (?P<year>{_YEAR})(?:, (?P<pages>{_PAGES}))?\)',
+        
+        # (Autor and Autor 2020, 25)
+        rf'\((?P<author1>{_NAME}) and (?P<author2>{_NAME}) (?P<year>{_YEAR})(?:, (?P<pages>{_PAGES}))?\)',
+        
+        # Autor (2020, 25)
+        rf'(?P<author>{_AUTHOR}) \((?P<year>{_YEAR})(?:, (?P<pages>{_PAGES}))?\)'
+    ],
+    'CHICAGO_NOTES': [
+        # Footnote format
+        r'^\d+\.\s(?P<citation>.+)',
+        
+        # Ibid., Op. cit., etc.
+        rf'(?P<citation>(?:Ibid\.|Op\. cit\.|Loc\. cit\.)(?:,\s{_PAGES})?)'
+    ],
+    'HARVARD': [
+        # (Autor, 2020) o (Autor, 2020: 25)
+        rf'\((?P<author>{_AUTHOR}),\s(?P<year>{_YEAR})(?:: (?P<pages>{_PAGES}))?\)',
+        
+        # Autor (2020)
+        rf'(?P<author>{_AUTHOR}) \((?P<year>{_YEAR})(?:: (?P<pages>{_PAGES}))?\)'
+    ],
+    'IEEE': [
+        # [1] o [1, 2, 3]
+        r'\[(?P<citation>\d+(?:,\s*\d+)*)\]'
+    ],
+    'VANCOUVER': [
+        # (1) o (1-3)
+        rf'\((?P<citation>{_PAGES})\)',
+        
+        # Superíndice¹,²,³
+        r'(?P<citation>[\u00B9\u00B2\u00B3\u2070-\u2079]+)'
+    ],
+    'CSE': [
+        # (Autor 2020) o (Autor and Autor 2020)
+        rf'\((?P<author>{_AUTHOR}) (?P<year>{_YEAR})\)',
+        
+        # Autor 2020
+        rf'(?P<author>{_AUTHOR}) (?P<year>{_YEAR})'
+    ]
+}
+
+# Patrones integrados para detectar citas bibliográficas completas
+_FULL_CITATION_PATTERNS = {
+    'APA': [
+        # Libro: Apellido, I. (Año). Título. Editorial.
+        r'(?P<author>[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*(?:,?\s&\s[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?\s\((?P<year>\d{4})\)\.\s(?P<title>.+?)\.\s(?P<publisher>[A-Za-z\s]+)\.',
+        
+        # Artículo: Apellido, I. (Año). Título del artículo. Nombre de la revista, vol(num), pp-pp.
+        r'(?P<author>[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*(?:,?\s&\s[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?\s\((?P<year>\d{4})\)\.\s(?P<title>.+?)\.\s(?P<journal>.+?),\s(?P<volume>\d+)(?:\((?P<issue>\d+)\))?,\s(?P<pages>\d+-\d+)\.',
+        
+        # Recurso web: Apellido, I. (Año). Título. Recuperado de URL
+        r'(?P<author>[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*(?:,?\s&\s[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?\s\((?P<year>\d{4})(?:,\s[A-Za-z]+\s\d+)?\)\.\s(?P<title>.+?)\.\s(?:Recuperado|Retrieved)(?:\son|\sde)\s(?P<url>https?://[^\s]+)'
+    ],
+    'MLA': [
+        # Libro: Apellido, Nombre. Título. Editorial, Año.
+        r'(?P<author>[A-Za-z\-]+,\s[A-Za-z\s\-]+)(?:,\sand\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)*\.\s(?P<title>.+?)\.\s(?P<publisher>[A-Za-z\s]+),\s(?P<year>\d{4})\.',
+        
+        # Artículo: Apellido, Nombre. "Título del artículo." Nombre de la revista, vol. número, año, pp. xx-xx.
+        r'(?P<author>[A-Za-z\-]+,\s[A-Za-z\s\-]+)(?:,\sand\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)*\.\s"(?P<title>.+?)\."\s(?P<journal>.+?),\svol\.\s(?P<volume>\d+)(?:,\sno\.\s(?P<issue>\d+))?,\s(?P<year>\d{4}),\spp\.\s(?P<pages>\d+-\d+)\.',
+        
+        # Recurso web: Apellido, Nombre. "Título del artículo." Nombre del sitio web, Fecha, URL. Accessed Fecha.
+        r'(?P<author>[A-Za-z\-]+,\s[A-Za-z\s\-]+)(?:,\sand\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)*\.\s"(?P<title>.+?)\."\s(?P<site>.+?),\s(?P<date>[A-Za-z\.\s\d,]+),\s(?P<url>https?://[^\s]+)(?:\.\s(?:Accessed|Accedido)\s(?P<access_date>[A-Za-z\.\s\d,]+))?.'
+    ],
+    'CHICAGO': [
+        # Libro: Apellido, Nombre. Título. Ciudad: Editorial, Año.
+        r'(?P<author>[A-Za-z\-]+,\s[A-Za-z\s\-]+)(?:,\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)*(?:,\sand\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)?\.\s(?P<title>.+?)\.\s(?P<city>[A-Za-z\s]+):\s(?P<publisher>[A-Za-z\s]+),\s(?P<year>\d{4})\.',
+        
+        # Artículo: Apellido, Nombre. "Título del artículo." Nombre de la revista vol, no. número (Año): pp-pp.
+        r'(?P<author>[A-Za-z\-]+,\s[A-Za-z\s\-]+)(?:,\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)*(?:,\sand\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)?\.\s"(?P<title>.+?)\."\s(?P<journal>.+?)\s(?P<volume>\d+),\sno\.\s(?P<issue>\d+)\s\((?P<year>\d{4})\):\s(?P<pages>\d+-\d+)\.',
+        
+        # Recurso web: Apellido, Nombre. "Título." Sitio web. Fecha. URL.
+        r'(?P<author>[A-Za-z\-]+,\s[A-Za-z\s\-]+)(?:,\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)*(?:,\sand\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)?\.\s"(?P<title>.+?)\."\s(?P<site>.+?)\.\s(?P<date>[A-Za-z\.\s\d,]+)\.\s(?P<url>https?://[^\s]+)\.'
+    ],
+    'HARVARD': [
+        # Libro: Apellido, I. (Año) Título. Lugar de publicación: Editorial.
+        r'(?P<author>[A-Za-z\-]+,\s[A-Z]\.)(?:,\s[A-Za-z\-]+,\s[A-Z]\.)*(?:\sand\s[A-Za-z\-]+,\s[A-Z]\.)?\s\((?P<year>\d{4})\)\s(?P<title>.+?)\.\s(?P<city>[A-Za-z\s]+):\s(?P<publisher>[A-Za-z\s]+)\.',
+        
+        # Artículo: Apellido, I. (Año) 'Título del artículo', Nombre de la revista, Volumen(Número), pp. xx-xx.
+        r'(?P<author>[A-Za-z\-]+,\s[A-Z]\.)(?:,\s[A-Za-z\-]+,\s[A-Z]\.)*(?:\sand\s[A-Za-z\-]+,\s[A-Z]\.)?\s\((?P<year>\d{4})\)\s\'(?P<title>.+?)\',\s(?P<journal>.+?),\s(?P<volume>\d+)(?:\((?P<issue>\d+)\))?,\spp\.\s(?P<pages>\d+-\d+)\.',
+        
+        # Recurso web: Apellido, I. (Año) Título [Online]. Disponible en: URL [Accedido: fecha].
+        r'(?P<author>[A-Za-z\-]+,\s[A-Z]\.)(?:,\s[A-Za-z\-]+,\s[A-Z]\.)*(?:\sand\s[A-Za-z\-]+,\s[A-Z]\.)?\s\((?P<year>\d{4})\)\s(?P<title>.+?)\s\[Online\]\.\s(?:Available|Disponible)(?:\sat|\sen):\s(?P<url>https?://[^\s]+)\s\[(?:Accessed|Accedido):\s(?P<access_date>[A-Za-z\.\s\d,]+)\]'
+    ],
+    'IEEE': [
+        # [1] I. Apellido, "Título del artículo," Nombre de la revista, vol. x, no. x, pp. xx-xx, Fecha.
+        r'\[(?P<number>\d+)\]\s(?P<author>[A-Z]\.\s[A-Za-z\-]+)(?:,\s[A-Z]\.\s[A-Za-z\-]+)*(?:,\sand\s[A-Z]\.\s[A-Za-z\-]+)?,\s"(?P<title>.+?)(?:,|")(?:\s(?P<journal>.+?),\svol\.\s(?P<volume>\d+),\sno\.\s(?P<issue>\d+),\spp\.\s(?P<pages>\d+-\d+),\s(?P<date>[A-Za-z\.\s\d,]+))?',
+        
+        # [1] I. Apellido, Título del libro. Ciudad: Editorial, Año, pp. xx-xx.
+        r'\[(?P<number>\d+)\]\s(?P<author>[A-Z]\.\s[A-Za-z\-]+)(?:,\s[A-Z]\.\s[A-Za-z\-]+)*(?:,\sand\s[A-Z]\.\s[A-Za-z\-]+)?,\s(?P<title>.+?)\.\s(?P<city>[A-Za-z\s]+):\s(?P<publisher>[A-Za-z\s]+),\s(?P<year>\d{4})(?:,\spp\.\s(?P<pages>\d+-\d+))?'
+    ],
+    'VANCOUVER': [
+        # 1. Apellido AB, Apellido CD. Título del artículo. Nombre de la revista. Año;Volumen(Número):Páginas.
+        r'(?P<number>\d+)\.\s(?P<author>[A-Za-z\-]+\s[A-Z]{1,2})(?:,\s[A-Za-z\-]+\s[A-Z]{1,2})*(?:,\s[A-Za-z\-]+\s[A-Z]{1,2})?\.\s(?P<title>.+?)\.\s(?P<journal>.+?)\.\s(?P<year>\d{4});(?P<volume>\d+)(?:\((?P<issue>\d+)\))?:(?P<pages>\d+-\d+)\.',
+        
+        # 1. Apellido AB. Título del libro. Edición. Ciudad: Editorial; Año.
+        r'(?P<number>\d+)\.\s(?P<author>[A-Za-z\-]+\s[A-Z]{1,2})(?:,\s[A-Za-z\-]+\s[A-Z]{1,2})*(?:,\s[A-Za-z\-]+\s[A-Z]{1,2})?\.\s(?P<title>.+?)(?:\.\s(?P<edition>\d+)(?:rd|nd|st|th)\sed)?(?:\.\s(?P<city>[A-Za-z\s]+):\s(?P<publisher>[A-Za-z\s]+);\s(?P<year>\d{4}))?'
+    ],
+    'CSE': [
+        # Apellido IN. Año. Título del artículo. Nombre de la revista. Volumen(Número):Páginas.
+        r'(?P<author>[A-Za-z\-]+\s[A-Z]{1,2})(?:,\s[A-Za-z\-]+\s[A-Z]{1,2})*\.\s(?P<year>\d{4})\.\s(?P<title>.+?)\.\s(?P<journal>.+?)\.\s(?P<volume>\d+)(?:\((?P<issue>\d+)\))?:(?P<pages>\d+-\d+)\.',
+        
+        # Apellido IN, Apellido IN. Año. Título del libro. Ciudad (Estado): Editorial. Páginas p.
+        r'(?P<author>[A-Za-z\-]+\s[A-Z]{1,2})(?:,\s[A-Za-z\-]+\s[A-Z]{1,2})*\.\s(?P<year>\d{4})\.\s(?P<title>.+?)\.\s(?P<city>[A-Za-z\s]+)(?:\s\([A-Z]{2}\))?:\s(?P<publisher>[A-Za-z\s]+)(?:\.\s(?P<pages>\d+)\sp)?'
+    ]
+}
+
+# Encabezados comunes de la sección de bibliografía por estilo, en orden de prioridad
+_BIBLIOGRAPHY_HEADERS = {
+    "APA": [r'Referencias', r'Bibliografía', r'Referencias bibliográficas', 
+           r'References', r'Bibliography', r'Reference List'],
+    "MLA": [r'Obras citadas', r'Bibliografía', r'Works Cited', r'Bibliography'],
+    "CHICAGO": [r'Bibliografía', r'Notas', r'Bibliography', r'Notes', r'References'],
+    "HARVARD": [r'Referencias', r'Bibliografía', r'References', r'Bibliography'],
+    "IEEE": [r'Referencias', r'References'],
+    "VANCOUVER": [r'Referencias', r'Bibliografía', r'References', r'Bibliography'],
+    "CSE": [r'Referencias', r'Bibliografía', r'References', r'Bibliography', r'Cited References']
+}
+
+def _compile_bibliography_headers(headers: List[str]) -> Tuple[re.Pattern, List[re.Pattern], re.Pattern]:
+    """
+    Compila los encabezados de bibliografía de un estilo.
+    
+    Args:
+        headers (List[str]): Encabezados en orden de prioridad
+        
+    Returns:
+        Tuple[re.Pattern, List[re.Pattern], re.Pattern]: La alternancia de encabezados en
+        línea propia con grupos _h0, _h1..., el patrón de cada encabezado por separado y
+        una alternancia que busca los encabezados en cualquier parte de una línea
+    """
+    line_patterns = [rf'(?:^|\n)\s*{header}\s*(?:\n|$)' for header in headers]
+    union = re.compile('|'.join(f'(?P<_h{i}>{p})' for i, p in enumerate(line_patterns)), re.IGNORECASE)
+    patterns = [re.compile(p, re.IGNORECASE) for p in line_patterns]
+    word = re.compile('|'.join(f'(?:{header})' for header in headers), re.IGNORECASE)
+    return union, patterns, word
+
+_BIBLIOGRAPHY_HEADER_RES = {
+    style: _compile_bibliography_headers(headers)
+    for style, headers in _BIBLIOGRAPHY_HEADERS.items()
+}
+
+# Versiones compiladas de los patrones integrados, compartidas por todas las instancias
+_COMPILED_IN_TEXT = {
+    style: [re.compile(p, re.MULTILINE) for p in patterns]
+    for style, patterns in _IN_TEXT_PATTERNS.items()
+}
+_COMPILED_FULL_CITATION = {
+    style: [re.compile(p, re.MULTILINE) for p in patterns]
+    for style, patterns in _FULL_CITATION_PATTERNS.items()
+}
 
 class CitationStyleDetector:
     """
@@ -15,156 +356,264 @@ class CitationStyleDetector:
     Puede identificar APA, MLA, Chicago y otros estilos tanto para citas completas como en el texto.
     """
     
-    def __init__(self, load_custom_patterns: bool = False, custom_patterns_path: str = None):
+    # Patrones auxiliares de validación, compilados una sola vez
+    _APA_MISSING_COMMA_RE = re.compile(r'\([A-Za-z]+ \d{4}\)')
+    _APA_WITH_COMMA_RE = re.compile(r'\([A-Za-z]+, \d{4}\)')
+    _YEAR_PAGE_RE = re.compile(r'\d{4}, \d+')
+    _APA_PAGE_MARKER_RE = re.compile(r'\d{4}, p\.? \d+')
+    _MLA_COMMA_RE = re.compile(r'\([A-Za-z]+, \d+\)')
+    _MLA_AMPERSAND_RE = re.compile(r'[A-Za-z]+ & [A-Za-z]+ \d+')
+    # Nota al pie al inicio de línea; [^\S\n] evita que el espacio salte a la línea siguiente
+    _FOOTNOTE_RE = re.compile(r'^(\d+)\.[^\S\n]', re.MULTILINE)
+    _HARVARD_COLON_RE = re.compile(r'\d{4}: \d+')
+    
+    # Inicio de una nueva referencia: apellido con coma, [n] o n.
+    _NEW_REFERENCE_RE = re.compile(r'^(?:[A-Za-z\-]+,|\[\d+\]|\d+\.)')
+    _WORD_RE = re.compile(r'\b\w+\b')
+    
+    # Patrones de corrección y conversión de citas
+    _FIX_APA_COMMA_RE = re.compile(r'\(([A-Za-z\-]+(?:\s[A-Za-z\-]+)?) (\d{4})')
+    _FIX_APA_PAGE_RE = re.compile(r'(\d{4}), (\d+)')
+    _FIX_MLA_COMMA_RE = re.compile(r'\(([A-Za-z\-]+(?:\s[A-Za-z\-]+)?), (\d+)')
+    _APA_IN_TEXT_RE = re.compile(r'\((?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?),\s\d{4}(?:,\sp\.\s(?P<page>\d+))?\)')
+    _MLA_IN_TEXT_RE = re.compile(r'\((?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?)\s(?P<page>\d+)\)')
+    
+    # Correcciones por estilo, aplicadas en orden: (patrón compilado o literal, reemplazo).
+    # Un literal se sustituye con str.replace, sin pasar por el motor de expresiones.
+    _FIXERS = {
+        'APA': (
+            # Corregir falta de coma entre autor y año
+            (_FIX_APA_COMMA_RE, r'(\1, \2'),
+            # Corregir indicador de página
+            (_FIX_APA_PAGE_RE, r'\1, p. \2'),
+        ),
+        'MLA': (
+            # Corregir coma entre autor y página
+            (_FIX_MLA_COMMA_RE, r'(\1 \2'),
+            # Corregir '&' por 'and'
+            (' & ', ' and '),
+        ),
+        'CHICAGO': (
+            # Corregir formato autor-fecha
+            ('et al ', 'et al., '),
+        ),
+    }
+    # Correcciones adicionales solo para citas parentéticas (las que empiezan por '(')
+    _PARENTHETICAL_FIXERS = {
+        'APA': (
+            # Corregir 'and' por '&'
+            (' and ', ' & '),
+        ),
+    }
+    
+    # Reglas de formato por estilo: (patrón que señala la línea, patrón que la
+    # excusa o None, mensaje). Ninguno de estos patrones cruza saltos de línea.
+    _FORMAT_RULES = {
+        'APA': [
+            # Verificar formato de fecha en citas APA
+            (_APA_MISSING_COMMA_RE, _APA_WITH_COMMA_RE,
+             "Línea {line_num}: La cita parece ser APA pero falta una coma entre el autor y el año."),
+            # Verificar página en formato correcto
+            (_YEAR_PAGE_RE, _APA_PAGE_MARKER_RE,
+             "Línea {line_num}: La cita parece ser APA pero falta indicador de página (p. o pp.).")
+        ],
+        'MLA': [
+            # Verificar que no haya comas entre autor y página en MLA
+            (_MLA_COMMA_RE, None,
+             "Línea {line_num}: La cita parece ser MLA pero tiene una coma entre el autor y el número de página."),
+            # Verificar uso correcto de "and" en vez de "&"
+            (_MLA_AMPERSAND_RE, None,
+             "Línea {line_num}: En MLA debe usarse 'and' en lugar de '&' para conectar autores.")
+        ],
+        'HARVARD': [
+            # Verificar dos puntos para separar año y página
+            (_YEAR_PAGE_RE, _HARVARD_COLON_RE,
+             "Línea {line_num}: En Harvard se usa dos puntos (año: página) en lugar de coma.")
+        ]
+    }
+    
+    # Patrones para extraer claves (autor, año) de las citas en texto
+    _KEY_PARENTHETICAL_YEAR_RE = re.compile(rf'\((?P<author>{_AUTHOR}),\s(?P<year>{_YEAR})')
+    _KEY_NARRATIVE_YEAR_RE = re.compile(rf'(?P<author>{_AUTHOR})\s\((?P<year>{_YEAR})')
+    _KEY_PARENTHETICAL_PAGE_RE = re.compile(rf'\((?P<author>{_AUTHOR})\s\d+')
+    _KEY_NARRATIVE_PAGE_RE = re.compile(rf'(?P<author>{_AUTHOR})\s\(\d+')
+    _KEY_AUTHOR_DATE_RE = re.compile(rf'\((?P<author>{_AUTHOR})\s(?P<year>{_YEAR})')
+    
+    # Patrones de claves por estilo, en el orden en que se aplican
+    _KEY_PATTERNS = {
+        'APA': (_KEY_PARENTHETICAL_YEAR_RE, _KEY_NARRATIVE_YEAR_RE),
+        'HARVARD': (_KEY_PARENTHETICAL_YEAR_RE, _KEY_NARRATIVE_YEAR_RE),
+        'MLA': (_KEY_PARENTHETICAL_PAGE_RE, _KEY_NARRATIVE_PAGE_RE),
+        'CHICAGO': (_KEY_AUTHOR_DATE_RE,)
+    }
+    
+    # Tamaño de texto a partir del cual compensa repartir el conteo entre procesos
+    _PARALLEL_THRESHOLD = 64_000
+    
+    # Número de textos cuyo estilo principal se recuerda
+    _PRIMARY_CACHE_SIZE = 8
+    
+    def __init__(self, load_custom_patterns: bool = False, custom_patterns_path: str = None,
+                 max_workers: Optional[int] = None, use_re2: bool = False):
         """
         Inicializa el detector de estilos de citación.
         
         Args:
             load_custom_patterns (bool): Si se deben cargar patrones personalizados
             custom_patterns_path (str): Ruta al archivo JSON con patrones personalizados
+            max_workers (int, optional): Procesos para analizar textos grandes en paralelo.
+                None desactiva el paralelismo. Los procesos se liberan con close() o al
+                salir de un bloque with.
+            use_re2 (bool): Si se debe usar re2 (tiempo lineal) para los patrones que lo admitan.
+                \\d, \\s y \\uXXXX se traducen a sus equivalentes Unicode; los patrones
+                que re2 no admite (\\w, lookaround, referencias) se quedan en re.
         """
-        # Configurar logging
-        logging.basicConfig(level=logging.INFO, 
-                          format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        self.logger = logging.getLogger('CitationStyleDetector')
-        
-        # Patrones para detectar citas en texto
-        self.in_text_patterns = {
-            'APA': [
-                # (Autor, 2020) o (Autor, 2020, p. 25)
-                r'\((?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?(?: et al\.)?),\s(?P<year>\d{4})(?:,\s(?P<pages>p\.?\s\d+(?:-\d+)?))?\)',
-                
-                # (Autor & Autor, 2020)
-                r'\((?P<author1>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?)\s&\s(?P<author2>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?),\s(?P<year>\d{4})(?:,\s(?P<pages>p\.?\s\d+(?:-\d+)?))?\)',
-                
-                # (Autor et al., 2020)
-                r'\((?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?)\set\sal\.,\s(?P<year>\d{4})(?:,\s(?P<pages>p\.?\s\d+(?:-\d+)?))?\)',
-                
-                # Autor (2020) o Autor (2020, p. 25)
-                r'(?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?)\s\((?P<year>\d{4})(?:,\s(?P<pages>p\.?\s\d+(?:-\d+)?))?\)'
-            ],
-            'MLA': [
-                # (Smith 25)
-                r'\((?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?(?: et al\.)?) (?P<pages>\d+(?:-\d+)?)\)',
-                
-                # (Smith and Johnson 25)
-                r'\((?P<author1>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?) and (?P<author2>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?) (?P<pages>\d+(?:-\d+)?)\)',
-                
-                # Smith (25)
-                r'(?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?(?: et al\.)?) \((?P<pages>\d+(?:-\d+)?)\)'
-            ],
-            'CHICAGO_AUTHOR_DATE': [
-                # (Autor 2020, 25)
-                r'\((?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?(?: et al\.)?) (?P<year>\d{4})(?:, (?P<pages>\d+(?:-\d+)?))?\)',
-                
-                # (Autor and Autor 2020, 25)
-                r'\((?P<author1>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?) and (?P<author2>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?) (?P<year>\d{4})(?:, (?P<pages>\d+(?:-\d+)?))?\)',
-                
-                # Autor (2020, 25)
-                r'(?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?(?: et al\.)?) \((?P<year>\d{4})(?:, (?P<pages>\d+(?:-\d+)?))?\)'
-            ],
-            'CHICAGO_NOTES': [
-                # Footnote format
-                r'^\d+\.\s(?P<citation>.+)',
-                
-                # Ibid., Op. cit., etc.
-                r'(?P<citation>(?:Ibid\.|Op\. cit\.|Loc\. cit\.)(?:,\s\d+(?:-\d+)?)?)'
-            ],
-            'HARVARD': [
-                # (Autor, 2020) o (Autor, 2020: 25)
-                r'\((?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?(?: et al\.)?),\s(?P<year>\d{4})(?:: (?P<pages>\d+(?:-\d+)?))?\)',
-                
-                # Autor (2020)
-                r'(?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?(?: et al\.)?) \((?P<year>\d{4})(?:: (?P<pages>\d+(?:-\d+)?))?\)'
-            ],
-            'IEEE': [
-                # [1] o [1, 2, 3]
-                r'\[(?P<citation>\d+(?:,\s*\d+)*)\]'
-            ],
-            'VANCOUVER': [
-                # (1) o (1-3)
-                r'\((?P<citation>\d+(?:-\d+)?)\)',
-                
-                # Superíndice¹,²,³
-                r'(?P<citation>[\u00B9\u00B2\u00B3\u2070-\u2079]+)'
-            ],
-            'CSE': [
-                # (Autor 2020) o (Autor and Autor 2020)
-                r'\((?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?(?: et al\.)?) (?P<year>\d{4})\)',
-                
-                # Autor 2020
-                r'(?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?(?: et al\.)?) (?P<year>\d{4})'
-            ]
-        }
+        self.max_workers = max_workers
+        self.use_re2 = use_re2 and RE2_AVAILABLE
+        self._pool = None
+        self._last_detect = None
+        self._primary_cache = OrderedDict()
+        self.logger = logger
+        
+        # Los patrones integrados ya están compilados a nivel de módulo; las listas se
+        # comparten entre instancias y solo se copian al añadir patrones personalizados
+        if self.use_re2:
+            self._pattern_engine = {'in_text': {}, 'full_citation': {}}
+            self.in_text_patterns = {}
+            self.full_citation_patterns = {}
+            for bucket, source, patterns in (
+                ('in_text', _IN_TEXT_PATTERNS, self.in_text_patterns),
+                ('full_citation', _FULL_CITATION_PATTERNS, self.full_citation_patterns)
+            ):
+                for style, style_patterns in source.items():
+                    compiled = [self._compile_pattern(p) for p in style_patterns]
+                    patterns[style] = [pattern for pattern, _ in compiled]
+                    self._pattern_engine[bucket][style] = [engine for _, engine in compiled]
+        else:
+            self.in_text_patterns = dict(_COMPILED_IN_TEXT)
+            self.full_citation_patterns = dict(_COMPILED_FULL_CITATION)
+            self._pattern_engine = {
+                'in_text': {style: ['re'] * len(p) for style, p in self.in_text_patterns.items()},
+                'full_citation': {style: ['re'] * len(p) for style, p in self.full_citation_patterns.items()}
+            }
         
-        # Patrones para detectar citas bibliográficas completas
-        self.full_citation_patterns = {
-            'APA': [
-                # Libro: Apellido, I. (Año). Título. Editorial.
-                r'(?P<author>[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*(?:,?\s&\s[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?\s\((?P<year>\d{4})\)\.\s(?P<title>.+?)\.\s(?P<publisher>[A-Za-z\s]+)\.',
-                
-                # Artículo: Apellido, I. (Año). Título del artículo. Nombre de la revista, vol(num), pp-pp.
-                r'(?P<author>[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*(?:,?\s&\s[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?\s\((?P<year>\d{4})\)\.\s(?P<title>.+?)\.\s(?P<journal>.+?),\s(?P<volume>\d+)(?:\((?P<issue>\d+)\))?,\s(?P<pages>\d+-\d+)\.',
-                
-                # Recurso web: Apellido, I. (Año). Título. Recuperado de URL
-                r'(?P<author>[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*(?:,?\s&\s[A-Za-z\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?\s\((?P<year>\d{4})(?:,\s[A-Za-z]+\s\d+)?\)\.\s(?P<title>.+?)\.\s(?:Recuperado|Retrieved)(?:\son|\sde)\s(?P<url>https?://[^\s]+)'
-            ],
-            'MLA': [
-                # Libro: Apellido, Nombre. Título. Editorial, Año.
-                r'(?P<author>[A-Za-z\-]+,\s[A-Za-z\s\-]+)(?:,\sand\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)*\.\s(?P<title>.+?)\.\s(?P<publisher>[A-Za-z\s]+),\s(?P<year>\d{4})\.',
-                
-                # Artículo: Apellido, Nombre. "Título del artículo." Nombre de la revista, vol. número, año, pp. xx-xx.
-                r'(?P<author>[A-Za-z\-]+,\s[A-Za-z\s\-]+)(?:,\sand\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)*\.\s"(?P<title>.+?)\."\s(?P<journal>.+?),\svol\.\s(?P<volume>\d+)(?:,\sno\.\s(?P<issue>\d+))?,\s(?P<year>\d{4}),\spp\.\s(?P<pages>\d+-\d+)\.',
-                
-                # Recurso web: Apellido, Nombre. "Título del artículo." Nombre del sitio web, Fecha, URL. Accessed Fecha.
-                r'(?P<author>[A-Za-z\-]+,\s[A-Za-z\s\-]+)(?:,\sand\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)*\.\s"(?P<title>.+?)\."\s(?P<site>.+?),\s(?P<date>[A-Za-z\.\s\d,]+),\s(?P<url>https?://[^\s]+)(?:\.\s(?:Accessed|Accedido)\s(?P<access_date>[A-Za-z\.\s\d,]+))?.'
-            ],
-            'CHICAGO': [
-                # Libro: Apellido, Nombre. Título. Ciudad: Editorial, Año.
-                r'(?P<author>[A-Za-z\-]+,\s[A-Za-z\s\-]+)(?:,\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)*(?:,\sand\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)?\.\s(?P<title>.+?)\.\s(?P<city>[A-Za-z\s]+):\s(?P<publisher>[A-Za-z\s]+),\s(?P<year>\d{4})\.',
-                
-                # Artículo: Apellido, Nombre. "Título del artículo." Nombre de la revista vol, no. número (Año): pp-pp.
-                r'(?P<author>[A-Za-z\-]+,\s[A-Za-z\s\-]+)(?:,\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)*(?:,\sand\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)?\.\s"(?P<title>.+?)\."\s(?P<journal>.+?)\s(?P<volume>\d+),\sno\.\s(?P<issue>\d+)\s\((?P<year>\d{4})\):\s(?P<pages>\d+-\d+)\.',
-                
-                # Recurso web: Apellido, Nombre. "Título." Sitio web. Fecha. URL.
-                r'(?P<author>[A-Za-z\-]+,\s[A-Za-z\s\-]+)(?:,\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)*(?:,\sand\s[A-Za-z\-]+,\s[A-Za-z\s\-]+)?\.\s"(?P<title>.+?)\."\s(?P<site>.+?)\.\s(?P<date>[A-Za-z\.\s\d,]+)\.\s(?P<url>https?://[^\s]+)\.'
-            ],
-            'HARVARD': [
-                # Libro: Apellido, I. (Año) Título. Lugar de publicación: Editorial.
-                r'(?P<author>[A-Za-z\-]+,\s[A-Z]\.)(?:,\s[A-Za-z\-]+,\s[A-Z]\.)*(?:\sand\s[A-Za-z\-]+,\s[A-Z]\.)?\s\((?P<year>\d{4})\)\s(?P<title>.+?)\.\s(?P<city>[A-Za-z\s]+):\s(?P<publisher>[A-Za-z\s]+)\.',
-                
-                # Artículo: Apellido, I. (Año) 'Título del artículo', Nombre de la revista, Volumen(Número), pp. xx-xx.
-                r'(?P<author>[A-Za-z\-]+,\s[A-Z]\.)(?:,\s[A-Za-z\-]+,\s[A-Z]\.)*(?:\sand\s[A-Za-z\-]+,\s[A-Z]\.)?\s\((?P<year>\d{4})\)\s\'(?P<title>.+?)\',\s(?P<journal>.+?),\s(?P<volume>\d+)(?:\((?P<issue>\d+)\))?,\spp\.\s(?P<pages>\d+-\d+)\.',
-                
-                # Recurso web: Apellido, I. (Año) Título [Online]. Disponible en: URL [Accedido: fecha].
-                r'(?P<author>[A-Za-z\-]+,\s[A-Z]\.)(?:,\s[A-Za-z\-]+,\s[A-Z]\.)*(?:\sand\s[A-Za-z\-]+,\s[A-Z]\.)?\s\((?P<year>\d{4})\)\s(?P<title>.+?)\s\[Online\]\.\s(?:Available|Disponible)(?:\sat|\sen):\s(?P<url>https?://[^\s]+)\s\[(?:Accessed|Accedido):\s(?P<access_date>[A-Za-z\.\s\d,]+)\]'
-            ],
-            'IEEE': [
-                # [1] I. Apellido, "Título del artículo," Nombre de la revista, vol. x, no. x, pp. xx-xx, Fecha.
-                r'\[(?P<number>\d+)\]\s(?P<author>[A-Z]\.\s[A-Za-z\-]+)(?:,\s[A-Z]\.\s[A-Za-z\-]+)*(?:,\sand\s[A-Z]\.\s[A-Za-z\-]+)?,\s"(?P<title>.+?)(?:,|")(?:\s(?P<journal>.+?),\svol\.\s(?P<volume>\d+),\sno\.\s(?P<issue>\d+),\spp\.\s(?P<pages>\d+-\d+),\s(?P<date>[A-Za-z\.\s\d,]+))?',
-                
-                # [1] I. Apellido, Título del libro. Ciudad: Editorial, Año, pp. xx-xx.
-                r'\[(?P<number>\d+)\]\s(?P<author>[A-Z]\.\s[A-Za-z\-]+)(?:,\s[A-Z]\.\s[A-Za-z\-]+)*(?:,\sand\s[A-Z]\.\s[A-Za-z\-]+)?,\s(?P<title>.+?)\.\s(?P<city>[A-Za-z\s]+):\s(?P<publisher>[A-Za-z\s]+),\s(?P<year>\d{4})(?:,\spp\.\s(?P<pages>\d+-\d+))?'
-            ],
-            'VANCOUVER': [
-                # 1. Apellido AB, Apellido CD. Título del artículo. Nombre de la revista. Año;Volumen(Número):Páginas.
-                r'(?P<number>\d+)\.\s(?P<author>[A-Za-z\-]+\s[A-Z]{1,2})(?:,\s[A-Za-z\-]+\s[A-Z]{1,2})*(?:,\s[A-Za-z\-]+\s[A-Z]{1,2})?\.\s(?P<title>.+?)\.\s(?P<journal>.+?)\.\s(?P<year>\d{4});(?P<volume>\d+)(?:\((?P<issue>\d+)\))?:(?P<pages>\d+-\d+)\.',
-                
-                # 1. Apellido AB. Título del libro. Edición. Ciudad: Editorial; Año.
-                r'(?P<number>\d+)\.\s(?P<author>[A-Za-z\-]+\s[A-Z]{1,2})(?:,\s[A-Za-z\-]+\s[A-Z]{1,2})*(?:,\s[A-Za-z\-]+\s[A-Z]{1,2})?\.\s(?P<title>.+?)(?:\.\s(?P<edition>\d+)(?:rd|nd|st|th)\sed)?(?:\.\s(?P<city>[A-Za-z\s]+):\s(?P<publisher>[A-Za-z\s]+);\s(?P<year>\d{4}))?'
-            ],
-            'CSE': [
-                # Apellido IN. Año. Título del artículo. Nombre de la revista. Volumen(Número):Páginas.
-                r'(?P<author>[A-Za-z\-]+\s[A-Z]{1,2})(?:,\s[A-Za-z\-]+\s[A-Z]{1,2})*\.\s(?P<year>\d{4})\.\s(?P<title>.+?)\.\s(?P<journal>.+?)\.\s(?P<volume>\d+)(?:\((?P<issue>\d+)\))?:(?P<pages>\d+-\d+)\.',
-                
-                # Apellido IN, Apellido IN. Año. Título del libro. Ciudad (Estado): Editorial. Páginas p.
-                r'(?P<author>[A-Za-z\-]+\s[A-Z]{1,2})(?:,\s[A-Za-z\-]+\s[A-Z]{1,2})*\.\s(?P<year>\d{4})\.\s(?P<title>.+?)\.\s(?P<city>[A-Za-z\s]+)(?:\s\([A-Z]{2}\))?:\s(?P<publisher>[A-Za-z\s]+)(?:\.\s(?P<pages>\d+)\sp)?'
-            ]
+        # Literales de los que cada estilo necesita al menos uno para poder coincidir.
+        # Comprobarlos con `in` es mucho más barato que ejecutar las expresiones regulares.
+        self._style_prefilter = {
+            'in_text': {
+                'APA': ('(',),
+                'MLA': ('(',),
+                'CHICAGO_AUTHOR_DATE': ('(',),
+                'CHICAGO_NOTES': ('.',),
+                'HARVARD': ('(',),
+                'IEEE': ('[',),
+                'VANCOUVER': ('(',) + tuple('\u00B9\u00B2\u00B3' + ''.join(chr(c) for c in range(0x2070, 0x207A))),
+                'CSE': (' ',)
+            },
+            'full_citation': {
+                'APA': ('(',),
+                'MLA': ('.',),
+                'CHICAGO': ('.',),
+                'HARVARD': ('(',),
+                'IEEE': ('[',),
+                'VANCOUVER': ('.',),
+                'CSE': ('.',)
+            }
         }
         
         # Cargar patrones personalizados si se solicita
         if load_custom_patterns and custom_patterns_path:
             self._load_custom_patterns(custom_patterns_path)
+        
+        # Fusionar los patrones de cada estilo en una sola alternancia
+        self._build_style_unions()
+    
+    def _build_style_unions(self) -> None:
+        """
+        Construye, para cada estilo, una única expresión regular que une todos sus
+        patrones como alternativas con nombre (p. ej. ``(?P<_APA_0>...)``).
+        """
+        self._in_text_unions = {
+            style: self._union_patterns(style, patterns)
+            for style, patterns in self.in_text_patterns.items()
+        }
+        self._full_citation_unions = {
+            style: self._union_patterns(style, patterns)
+            for style, patterns in self.full_citation_patterns.items()
+        }
+        # Extractores especializados por estilo para extract_citations
+        self._in_text_extractors = {
+            style: self._build_extractor(patterns, self._in_text_unions[style])
+            for style, patterns in self.in_text_patterns.items()
+        }
+        self._full_citation_extractors = {
+            style: self._build_extractor(patterns, self._full_citation_unions[style])
+            for style, patterns in self.full_citation_patterns.items()
+        }
+        # Los resultados guardados dejan de ser válidos si cambian los patrones
+        self._last_detect = None
+        self._primary_cache.clear()
+    
+    def _union_patterns(self, style: str, patterns: List[re.Pattern]) -> Optional[re.Pattern]:
+        """
+        Une los patrones de un estilo en una alternancia con grupos renombrados.
+        
+        Args:
+            style (str): Nombre del estilo
+            patterns (List[re.Pattern]): Patrones compilados del estilo
+            
+        Returns:
+            Optional[re.Pattern]: La alternancia compilada, o None si no se puede construir
+        """
+        alternatives = []
+        for i, pattern in enumerate(patterns):
+            source = self._pattern_source(pattern)
+            # Las referencias numéricas cambiarían de significado al anidar el patrón
+            if re.search(r'\\[1-9]', source):
+                return None
+            suffix = f'_{style}_{i}'
+            source = re.sub(r'\(\?P<(\w+)>', lambda m: f'(?P<{m.group(1)}{suffix}>', source)
+            source = re.sub(r'\(\?P=(\w+)\)', lambda m: f'(?P={m.group(1)}{suffix})', source)
+            alternatives.append(f'(?P<_{style}_{i}>{source})')
+        
+        if not alternatives:
+            return None
+        
+        try:
+            return self._compile_pattern('|'.join(alternatives))[0]
+        except re.error:
+            return None
+    
+    def _compile_pattern(self, pattern: str) -> Tuple[Any, str]:
+        """
+        Compila un patrón con re2 si está activado y lo admite, o con re en otro caso.
+        
+        Args:
+            pattern (str): El patrón a compilar
+            
+        Returns:
+            Tuple[Any, str]: El patrón compilado y el nombre del motor usado ('re2' o 're')
+        """
+        compiled = re.compile(pattern, re.MULTILINE)
+        if self.use_re2:
+            # re2 no admite lookaround ni referencias hacia atrás: esos patrones se quedan en re
+            compiled_re2 = compile_re2(pattern, compiled, multiline=True)
+            if compiled_re2 is not None:
+                return compiled_re2, 're2'
+        return compiled, 're'
+    
+    @staticmethod
+    def _pattern_source(pattern: Any) -> str:
+        """
+        Devuelve el texto original de un patrón compilado.
+        
+        Args:
+            pattern: Patrón compilado con re o re2
+            
+        Returns:
+            str: El texto del patrón
+        """
+        return pattern.pattern
     
     def _load_custom_patterns(self, path: str) -> None:
         """
@@ -180,16 +629,29 @@ class CitationStyleDetector:
             # Actualizar patrones in-text
             if 'in_text_patterns' in custom_patterns:
                 for style, patterns in custom_patterns['in_text_patterns'].items():
+                    compiled = [self._compile_pattern(p) for p in patterns]
+                    patterns = [pattern for pattern, _ in compiled]
+                    engines = [engine for _, engine in compiled]
+                    self._pattern_engine['in_text'].setdefault(style, []).extend(engines)
+                    # Los literales requeridos ya no son válidos para este estilo
+                    self._style_prefilter['in_text'][style] = None
                     if style in self.in_text_patterns:
-                        self.in_text_patterns[style].extend(patterns)
+                        # Crear una lista nueva para no modificar la compartida
+                        self.in_text_patterns[style] = self.in_text_patterns[style] + patterns
                     else:
                         self.in_text_patterns[style] = patterns
             
             # Actualizar patrones de citas completas
             if 'full_citation_patterns' in custom_patterns:
                 for style, patterns in custom_patterns['full_citation_patterns'].items():
+                    compiled = [self._compile_pattern(p) for p in patterns]
+                    patterns = [pattern for pattern, _ in compiled]
+                    engines = [engine for _, engine in compiled]
+                    self._pattern_engine['full_citation'].setdefault(style, []).extend(engines)
+                    self._style_prefilter['full_citation'][style] = None
                     if style in self.full_citation_patterns:
-                        self.full_citation_patterns[style].extend(patterns)
+                        # Crear una lista nueva para no modificar la compartida
+                        self.full_citation_patterns[style] = self.full_citation_patterns[style] + patterns
                     else:
                         self.full_citation_patterns[style] = patterns
             
@@ -198,10 +660,58 @@ class CitationStyleDetector:
         except Exception as e:
             self.logger.error(f"Error cargando patrones personalizados: {e}")
     
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """
+        Devuelve el pool de procesos, creándolo la primera vez que se necesita.
+        
+        Returns:
+            ProcessPoolExecutor: El pool de procesos
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            # Si no se llama a close, los procesos se liberan al destruir el detector
+            # o al terminar el intérprete
+            self._pool_finalizer = weakref.finalize(self, self._pool.shutdown, wait=False)
+        return self._pool
+    
+    def close(self) -> None:
+        """
+        Libera el pool de procesos si se llegó a crear, esperando a que terminen sus
+        procesos. El detector puede seguir usándose: el pool se vuelve a crear si hace falta.
+        """
+        if self._pool is not None:
+            self._pool_finalizer.detach()
+            self._pool.shutdown()
+            self._pool = None
+    
+    def __enter__(self) -> 'CitationStyleDetector':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
     def detect_citation_styles(self, text: str) -> Dict[str, Dict[str, int]]:
         """
         Detecta los estilos de citación presentes en el texto.
         
+        Args:
+            text (str): El texto a analizar
+            
+        Returns:
+            Dict[str, Dict[str, int]]: Un diccionario con el conteo de ocurrencias de cada estilo
+        """
+        # Reutilizar el último resultado si se analiza el mismo texto; se guarda solo
+        # una huella del texto para no retener cadenas grandes
+        key = (len(text), hash(text))
+        if self._last_detect is None or self._last_detect[0] != key:
+            self._last_detect = (key, self._count_citation_styles(text))
+        
+        return {bucket: dict(counts) for bucket, counts in self._last_detect[1].items()}
+    
+    def _count_citation_styles(self, text: str) -> Dict[str, Dict[str, int]]:
+        """
+        Cuenta las coincidencias de cada estilo de citación en el texto.
+        
         Args:
             text (str): El texto a analizar
             
@@ -213,24 +723,75 @@ class CitationStyleDetector:
             'full_citation': {style: 0 for style in self.full_citation_patterns}
         }
         
-        # Detectar citas en texto
-        for style, patterns in self.in_text_patterns.items():
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.MULTILINE)
-                results['in_text'][style] += len(matches)
+        # Seleccionar los estilos que pueden tener coincidencias. No se prueba antes
+        # una alternancia de sus patrones: pierde la búsqueda rápida del literal
+        # inicial de cada uno y, si no hay citas, cuesta tanto como contarlas
+        jobs = []
+        for bucket, style_patterns in (
+            ('in_text', self.in_text_patterns),
+            ('full_citation', self.full_citation_patterns)
+        ):
+            for style, patterns in style_patterns.items():
+                # Descartar el estilo si el texto no contiene ninguno de sus literales requeridos
+                literals = self._style_prefilter[bucket].get(style)
+                if literals is not None and not any(lit in text for lit in literals):
+                    continue
+                jobs.append((bucket, style, patterns))
+        
+        # El motor de re no libera el GIL, así que los textos grandes se reparten entre procesos
+        # (los patrones de re2 no se pueden enviar a otros procesos)
+        if self.max_workers and not self.use_re2 and len(text) > self._PARALLEL_THRESHOLD and len(jobs) > 1:
+            pool = self._get_pool()
+            futures = [pool.submit(_count_matches, patterns, text) for _, _, patterns in jobs]
+            counts = [future.result() for future in futures]
+        else:
+            counts = [_count_matches(patterns, text) for _, _, patterns in jobs]
         
-        # Detectar citas bibliográficas completas
-        for style, patterns in self.full_citation_patterns.items():
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.MULTILINE)
-                results['full_citation'][style] += len(matches)
+        for (bucket, style, _), count in zip(jobs, counts):
+            results[bucket][style] += count
         
         return results
     
+    def detect_many(self, texts: List[str]) -> List[Dict[str, Dict[str, int]]]:
+        """
+        Detecta los estilos de citación de varios textos reutilizando los patrones compilados.
+        
+        Args:
+            texts (List[str]): Los textos a analizar
+            
+        Returns:
+            List[Dict[str, Dict[str, int]]]: El conteo de cada estilo para cada texto, en el mismo orden
+        """
+        # Se evita la caché de un solo resultado, que en un lote solo se sobrescribiría
+        return [self._count_citation_styles(text) for text in texts]
+    
     def identify_primary_style(self, text: str) -> Tuple[str, float]:
         """
         Identifica el estilo de citación principal utilizado en el texto.
         
+        Args:
+            text (str): El texto a analizar
+            
+        Returns:
+            Tuple[str, float]: El estilo predominante y su nivel de confianza (0.0-1.0)
+        """
+        # Consultar la caché de los últimos textos clasificados
+        key = (len(text), hash(text))
+        cached = self._primary_cache.get(key)
+        if cached is not None:
+            self._primary_cache.move_to_end(key)
+            return cached
+        
+        result = self._identify_primary_style(text)
+        self._primary_cache[key] = result
+        if len(self._primary_cache) > self._PRIMARY_CACHE_SIZE:
+            self._primary_cache.popitem(last=False)
+        return result
+    
+    def _identify_primary_style(self, text: str) -> Tuple[str, float]:
+        """
+        Calcula el estilo de citación principal a partir del conteo de estilos.
+        
         Args:
             text (str): El texto a analizar
             
@@ -284,6 +845,20 @@ class CitationStyleDetector:
         Returns:
             Dict[str, List[str]]: Un diccionario con problemas detectados por categoría
         """
+        return self._validate_citations(text)[0]
+    
+    def _validate_citations(self, text: str) -> Tuple[Dict[str, List[str]], List[str]]:
+        """
+        Valida las citas del texto y devuelve además las citas sin referencia, para que
+        analyze_text no tenga que volver a cruzar citas y bibliografía.
+        
+        Args:
+            text (str): El texto a analizar
+            
+        Returns:
+            Tuple[Dict[str, List[str]], List[str]]: Los problemas detectados por categoría
+            y la lista de citas sin entrada bibliográfica
+        """
         primary_style, confidence = self.identify_primary_style(text)
         
         issues = {
@@ -294,7 +869,7 @@ class CitationStyleDetector:
         
         if primary_style == "No se detectaron citas":
             issues['recomendaciones'].append("No se detectaron citas en el texto.")
-            return issues
+            return issues, []
         
         if confidence < 0.7:
             issues['inconsistencias_estilo'].append(
@@ -304,73 +879,55 @@ class CitationStyleDetector:
         
         # Validar formato según el estilo predominante
         lines = text.split('\n')
-        for i, line in enumerate(lines):
-            line_num = i + 1
-            
-            # Verificaciones específicas de cada estilo
-            if primary_style == "APA":
-                # Verificar formato de fecha en citas APA
-                if re.search(r'\([A-Za-z]+ \d{4}\)', line) and not re.search(r'\([A-Za-z]+, \d{4}\)', line):
-                    issues['formato_incorrecto'].append(
-                        f"Línea {line_num}: La cita parece ser APA pero falta una coma entre el autor y el año."
-                    )
-                
-                # Verificar página en formato correcto
-                if re.search(r'\d{4}, \d+', line) and not re.search(r'\d{4}, p\.? \d+', line):
-                    issues['formato_incorrecto'].append(
-                        f"Línea {line_num}: La cita parece ser APA pero falta indicador de página (p. o pp.)."
-                    )
-            
-            elif primary_style == "MLA":
-                # Verificar que no haya comas entre autor y página en MLA
-                if re.search(r'\([A-Za-z]+, \d+\)', line):
-                    issues['formato_incorrecto'].append(
-                        f"Línea {line_num}: La cita parece ser MLA pero tiene una coma entre el autor y el número de página."
-                    )
-                
-                # Verificar uso correcto de "and" en vez de "&"
-                if re.search(r'[A-Za-z]+ & [A-Za-z]+ \d+', line):
-                    issues['formato_incorrecto'].append(
-                        f"Línea {line_num}: En MLA debe usarse 'and' en lugar de '&' para conectar autores."
-                    )
-            
-            elif primary_style == "CHICAGO":
-                # Verificar notas al pie numeradas correctamente
-                footnote_match = re.search(r'^(\d+)\.\s', line)
-                if footnote_match:
-                    # Verificar si el número de nota corresponde a la secuencia
-                    footnote_num = int(footnote_match.group(1))
-                    expected_num = 1
-                    for prev_line in lines[:i]:
-                        prev_match = re.search(r'^(\d+)\.\s', prev_line)
-                        if prev_match:
-                            expected_num += 1
-                    
-                    if footnote_num != expected_num:
-                        issues['formato_incorrecto'].append(
-                            f"Línea {line_num}: Número de nota al pie incorrecto. Se esperaba {expected_num}, se encontró {footnote_num}."
-                        )
-            
-            elif primary_style == "HARVARD":
-                # Verificar dos puntos para separar año y página
-                if re.search(r'\d{4}, \d+', line) and not re.search(r'\d{4}: \d+', line):
+        
+        # Posición de inicio de cada línea, para traducir posiciones a números de línea
+        line_starts = [0]
+        for line in lines[:-1]:
+            line_starts.append(line_starts[-1] + len(line) + 1)
+        
+        # Cada regla recorre el texto completo una sola vez; los problemas se ordenan
+        # después por línea y por regla, como si se revisara línea a línea
+        found = []
+        for order, (rule_re, exclude_re, message) in enumerate(self._FORMAT_RULES.get(primary_style, [])):
+            flagged = {bisect_right(line_starts, m.start()) for m in rule_re.finditer(text)}
+            if flagged and exclude_re is not None:
+                flagged -= {bisect_right(line_starts, m.start()) for m in exclude_re.finditer(text)}
+            found.extend((line_num, order, message) for line_num in flagged)
+        
+        found.sort()
+        issues['formato_incorrecto'].extend(
+            message.format(line_num=line_num) for line_num, _, message in found
+        )
+        
+        if primary_style == "CHICAGO":
+            # Verificar notas al pie numeradas correctamente
+            for fn_seen, footnote_match in enumerate(self._FOOTNOTE_RE.finditer(text), 1):
+                # Verificar si el número de nota corresponde a la secuencia
+                footnote_num = int(footnote_match.group(1))
+                if footnote_num != fn_seen:
+                    line_num = bisect_right(line_starts, footnote_match.start())
                     issues['formato_incorrecto'].append(
-                        f"Línea {line_num}: En Harvard se usa dos puntos (año: página) en lugar de coma."
+                        f"Línea {line_num}: Número de nota al pie incorrecto. Se esperaba {fn_seen}, se encontró {footnote_num}."
                     )
         
         # Validar cruce de citas en texto y bibliografía
         in_text_citations = self._extract_citation_keys(text, primary_style)
-        bibliography_entries = self._extract_bibliography_entries(text, primary_style)
+        bibliography_entries = self._extract_bibliography_entries(text, primary_style, lines)
+        # Normalizar cada autor una sola vez para ambas comprobaciones
+        authors_norm = self._normalize_citation_authors(in_text_citations)
+        ref_keys = self._reference_keys(bibliography_entries)
         
         # Verificar citas sin entrada bibliográfica
-        cited_not_referenced = self._find_citations_without_references(in_text_citations, bibliography_entries, primary_style)
+        cited_not_referenced = self._find_citations_without_references(in_text_citations, bibliography_entries,
+                                                                       primary_style, authors_norm, ref_keys)
         for citation in cited_not_referenced:
             issues['inconsistencias_estilo'].append(
                 f"La cita '{citation}' aparece en el texto pero no tiene una entrada correspondiente en la bibliografía."
             )
         
         # Verificar entradas bibliográficas no citadas
-        referenced_not_cited = self._find_references_without_citations(in_text_citations, bibliography_entries, primary_style)
+        referenced_not_cited = self._find_references_without_citations(in_text_citations, bibliography_entries,
+                                                                       primary_style, authors_norm, ref_keys)
         if referenced_not_cited:
             issues['recomendaciones'].append(
                 f"Se encontraron {len(referenced_not_cited)} entradas bibliográficas que no están citadas en el texto."
@@ -390,7 +947,7 @@ class CitationStyleDetector:
                 "Chicago permite dos sistemas: notas al pie (más común en humanidades) y autor-fecha (más común en ciencias)."
             )
         
-        return issues
+        return issues, cited_not_referenced
     
     def _extract_citation_keys(self, text: str, style: str) -> List[Tuple[str, str]]:
         """
@@ -403,62 +960,37 @@ class CitationStyleDetector:
         Returns:
             List[Tuple[str, str]]: Lista de tuplas (autor, año) o (autor, página)
         """
-        keys = []
+        # Eliminar duplicados conservando el orden de aparición
+        return list(dict.fromkeys(self._iter_citation_keys(text, style)))
+    
+    def _iter_citation_keys(self, text: str, style: str):
+        """
+        Genera las claves (autor, año) de las citas en texto a medida que se encuentran.
         
-        # Patrones específicos según estilo
-        if style == "APA" or style == "HARVARD":
-            # Para APA: extraer pares (autor, año)
-            pattern = r'\((?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?(?: et al\.)?),\s(?P<year>\d{4})'
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                author = match.group('author').strip()
-                year = match.group('year').strip()
-                keys.append((author, year))
-            
-            # También forma narrativa: Autor (año)
-            pattern = r'(?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?(?: et al\.)?)\s\((?P<year>\d{4})'
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                author = match.group('author').strip()
-                year = match.group('year').strip()
-                keys.append((author, year))
-        
-        elif style == "MLA":
-            # Para MLA: extraer pares (autor, página) pero para comparar usamos autor
-            pattern = r'\((?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?(?: et al\.)?)\s\d+'
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                author = match.group('author').strip()
-                keys.append((author, ""))  # Año vacío ya que MLA usa páginas
+        Args:
+            text (str): El texto a analizar
+            style (str): El estilo de citación predominante
             
-            # También forma narrativa
-            pattern = r'(?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?(?: et al\.)?)\s\(\d+'
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                author = match.group('author').strip()
-                keys.append((author, ""))
-        
-        elif style == "CHICAGO":
-            # Para Chicago autor-fecha
-            pattern = r'\((?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?(?: et al\.)?)\s(?P<year>\d{4})'
-            matches = re.finditer(pattern, text)
-            for match in matches:
+        Yields:
+            Tuple[str, str]: Tupla (autor, año); el año queda vacío en MLA, que usa páginas
+        """
+        # No extraemos notas al pie de Chicago (requiere análisis más complejo)
+        for pattern in self._KEY_PATTERNS.get(style, ()):
+            has_year = 'year' in pattern.groupindex
+            for match in pattern.finditer(text):
                 author = match.group('author').strip()
-                year = match.group('year').strip()
-                keys.append((author, year))
-            
-            # No extraemos notas al pie aquí (requiere análisis más complejo)
-        
-        # Eliminar duplicados
-        return list(set(keys))
+                year = match.group('year').strip() if has_year else ""
+                yield (author, year)
     
-    def _extract_bibliography_entries(self, text: str, style: str) -> List[Dict[str, str]]:
+    def _extract_bibliography_entries(self, text: str, style: str,
+                                      lines: Optional[List[str]] = None) -> List[Dict[str, str]]:
         """
         Extrae entradas bibliográficas completas del texto.
         
         Args:
             text (str): El texto a analizar
             style (str): El estilo de citación predominante
+            lines (List[str], optional): Líneas del texto, si ya se calcularon
             
         Returns:
             List[Dict[str, str]]: Lista de diccionarios con metadatos de cada entrada
@@ -466,79 +998,150 @@ class CitationStyleDetector:
         entries = []
         
         # Encontrar sección de bibliografía
-        bibliography_section = self._find_bibliography_section(text, style)
+        bibliography_section = self._find_bibliography_section(text, style, lines)
         if not bibliography_section:
             return entries
         
         # Patrones específicos según estilo
         patterns = self.full_citation_patterns.get(style, [])
         
-        for pattern in patterns:
-            matches = re.finditer(pattern, bibliography_section, re.MULTILINE)
-            for match in matches:
-                if hasattr(match, 'groupdict'):
+        # Dividir la bibliografía en entradas candidatas una sola vez: en cada línea
+        # no sangrada, de modo que las líneas de continuación sangradas sigan unidas
+        # a la suya
+        candidates = [entry.strip() for entry in _ENTRY_SPLIT_RE.split(bibliography_section) if entry.strip()]
+        
+        for candidate in candidates:
+            for pattern in patterns:
+                # search y no match: la entrada puede ir tras un marcador de lista
+                match = pattern.search(candidate)
+                if match:
                     entry = match.groupdict()
                     # Limpiar valores None
                     entry = {k: v for k, v in entry.items() if v is not None}
                     entries.append(entry)
+                    # Una entrada solo se cuenta una vez aunque coincida con varios patrones
+                    break
         
         return entries
     
-    def _find_bibliography_section(self, text: str, style: str) -> str:
+    def _find_bibliography_section(self, text: str, style: str,
+                                   lines: Optional[List[str]] = None) -> str:
         """
         Encuentra la sección de bibliografía en el texto.
         
         Args:
             text (str): El texto completo
             style (str): El estilo de citación
+            lines (List[str], optional): Líneas del texto, si ya se calcularon
             
         Returns:
             str: Texto de la sección de bibliografía o cadena vacía
         """
-        # Encabezados comunes por estilo
-        headers = {
-            "APA": [r'Referencias', r'Bibliografía', r'Referencias bibliográficas', 
-                   r'References', r'Bibliography', r'Reference List'],
-            "MLA": [r'Obras citadas', r'Bibliografía', r'Works Cited', r'Bibliography'],
-            "CHICAGO": [r'Bibliografía', r'Notas', r'Bibliography', r'Notes', r'References'],
-            "HARVARD": [r'Referencias', r'Bibliografía', r'References', r'Bibliography'],
-            "IEEE": [r'Referencias', r'References'],
-            "VANCOUVER": [r'Referencias', r'Bibliografía', r'References', r'Bibliography'],
-            "CSE": [r'Referencias', r'Bibliografía', r'References', r'Bibliography', r'Cited References']
-        }
-        
-        # Obtener encabezados para el estilo actual
-        style_headers = headers.get(style, [])
-        
-        # Buscar encabezados en el texto
-        for header in style_headers:
-            pattern = fr'(?i)(?:^|\n)\s*{header}\s*(?:\n|$)'
-            match = re.search(pattern, text)
-            if match:
-                # Extraer desde el encabezado hasta el final
-                start_pos = match.start()
-                return text[start_pos:]
+        header_res = _BIBLIOGRAPHY_HEADER_RES.get(style)
+        if header_res is None:
+            header_union, header_patterns, header_word = None, [], None
+        else:
+            header_union, header_patterns, header_word = header_res
+        
+        # Buscar encabezados en el texto con una sola pasada sobre la alternancia.
+        # Se conserva la prioridad de la lista: si la primera coincidencia es de un
+        # encabezado posterior, los anteriores aún pueden aparecer más adelante.
+        match = header_union.search(text) if header_union is not None else None
+        if match:
+            index = int(match.lastgroup[2:])
+            for pattern in header_patterns[:index]:
+                earlier = pattern.search(text, match.start())
+                if earlier:
+                    # Extraer desde el encabezado hasta el final
+                    return text[earlier.start():]
+            return text[match.start():]
         
         # Si no se encontró un encabezado, buscar patrones de referencias al final del texto
-        lines = text.split('\n')
+        if lines is None:
+            lines = text.split('\n')
+        # La alternancia del estilo coincide al inicio de la línea si y solo si lo hace
+        # alguno de sus patrones, así que basta una llamada por línea
+        union = self._full_citation_unions.get(style)
+        line_patterns = [union] if union is not None else self.full_citation_patterns.get(style, [])
         for i in range(len(lines) - 1, 0, -1):
-            for pattern in self.full_citation_patterns.get(style, []):
-                if re.match(pattern, lines[i]):
+            for pattern in line_patterns:
+                if pattern.match(lines[i]):
                     # Encontró una línea que parece ser una referencia
                     # Buscar hacia atrás hasta encontrar una línea en blanco o un encabezado
                     start_line = i
                     while start_line > 0 and lines[start_line-1].strip():
                         start_line -= 1
-                        if any(re.search(fr'(?i){h}', lines[start_line]) for h in style_headers):
+                        if header_word is not None and header_word.search(lines[start_line]):
                             break
                     
                     return '\n'.join(lines[start_line:])
         
         return ""
     
+    @staticmethod
+    def _reference_surname(ref: Dict[str, str]) -> str:
+        """
+        Obtiene el apellido normalizado del primer autor de una entrada bibliográfica.
+        
+        Args:
+            ref (Dict[str, str]): Entrada bibliográfica
+            
+        Returns:
+            str: Apellido en minúsculas, o cadena vacía si no hay autor
+        """
+        # Quedarse con lo anterior a la primera coma sin partir todo el campo
+        ref_author = ref.get('author', '')
+        comma = ref_author.find(',')
+        if comma >= 0:
+            ref_author = ref_author[:comma]
+        return ref_author.strip().casefold()
+    
+    @staticmethod
+    def _normalize_citation_author(author: str) -> str:
+        """
+        Normaliza el autor de una cita en texto para compararlo con la bibliografía.
+        
+        Args:
+            author (str): Autor tal como aparece en la cita
+            
+        Returns:
+            str: Autor en minúsculas y sin "et al."
+        """
+        return author.casefold().replace('et al.', '').strip()
+    
+    @classmethod
+    def _normalize_citation_authors(cls, citations: List[Tuple[str, str]]) -> Dict[str, str]:
+        """
+        Normaliza los autores distintos de una lista de citas en texto.
+        
+        Args:
+            citations (List[Tuple[str, str]]): Lista de citas en texto (autor, año)
+            
+        Returns:
+            Dict[str, str]: Autor original -> autor normalizado
+        """
+        return {author: cls._normalize_citation_author(author) for author in {a for a, _ in citations}}
+    
+    @classmethod
+    def _reference_keys(cls, references: List[Dict[str, str]]) -> Tuple[List[str], List[str]]:
+        """
+        Extrae en listas paralelas el apellido normalizado y el año de cada referencia.
+        
+        Args:
+            references (List[Dict[str, str]]): Lista de entradas bibliográficas
+            
+        Returns:
+            Tuple[List[str], List[str]]: Apellidos y años, en el orden de las referencias
+        """
+        surnames = [cls._reference_surname(ref) for ref in references]
+        years = [ref.get('year', '') for ref in references]
+        return surnames, years
+    
     def _find_citations_without_references(self, citations: List[Tuple[str, str]], 
                                          references: List[Dict[str, str]], 
-                                         style: str) -> List[str]:
+                                         style: str,
+                                         authors_norm: Optional[Dict[str, str]] = None,
+                                         ref_keys: Optional[Tuple[List[str], List[str]]] = None) -> List[str]:
         """
         Encuentra citas en texto que no tienen entrada en la bibliografía.
         
@@ -546,50 +1149,57 @@ class CitationStyleDetector:
             citations (List[Tuple[str, str]]): Lista de citas en texto (autor, año)
             references (List[Dict[str, str]]): Lista de entradas bibliográficas
             style (str): Estilo de citación
+            authors_norm (Dict[str, str], optional): Autores ya normalizados de las citas
+            ref_keys (Tuple[List[str], List[str]], optional): Apellidos y años de las referencias
             
         Returns:
             List[str]: Lista de citas sin referencia correspondiente
         """
         missing = []
         
+        # El criterio de comparación no cambia dentro de los bucles
+        by_year = style in ["APA", "HARVARD", "CHICAGO"]
+        by_author = style == "MLA"
+        
+        # Indexar la bibliografía una sola vez: años por apellido para la búsqueda
+        # exacta y apellidos distintos por año para la comparación por inclusión
+        years_by_surname = {}
+        surnames_by_year = {}
+        if (by_year or by_author) and ref_keys is None:
+            ref_keys = self._reference_keys(references)
+        for ref_author_norm, ref_year in (zip(*ref_keys) if by_year or by_author else ()):
+            if not ref_author_norm:
+                continue
+            years_by_surname.setdefault(ref_author_norm, set()).add(ref_year)
+            surnames_by_year.setdefault(ref_year, set()).add(ref_author_norm)
+        haystack_by_year = {year: _NAME_SEPARATOR.join(names) for year, names in surnames_by_year.items()}
+        all_haystack = _NAME_SEPARATOR.join(years_by_surname)
+        
+        # Normalizar cada autor distinto una sola vez
+        if authors_norm is None:
+            authors_norm = self._normalize_citation_authors(citations)
+        
         for author, year in citations:
+            author_norm = authors_norm[author]
             found = False
             
-            for ref in references:
-                # Comparar según el estilo
-                if style in ["APA", "HARVARD", "CHICAGO"]:
-                    # Extraer apellido del autor de la referencia
-                    ref_author = ref.get('author', '')
-                    if ref_author:
-                        ref_author = ref_author.split(',')[0].strip()
-                    
-                    ref_year = ref.get('year', '')
-                    
-                    # Comparar apellido y año
-                    if author and ref_author and year and ref_year:
-                        # Normalizar para comparación
-                        author_norm = author.lower().replace('et al.', '').strip()
-                        ref_author_norm = ref_author.lower().strip()
-                        
-                        if author_norm in ref_author_norm or ref_author_norm in author_norm:
-                            if year == ref_year:
-                                found = True
-                                break
-                
-                elif style == "MLA":
-                    # En MLA solo comparamos autor (apellido)
-                    ref_author = ref.get('author', '')
-                    if ref_author:
-                        ref_author = ref_author.split(',')[0].strip()
-                    
-                    if author and ref_author:
-                        # Normalizar para comparación
-                        author_norm = author.lower().replace('et al.', '').strip()
-                        ref_author_norm = ref_author.lower().strip()
-                        
-                        if author_norm in ref_author_norm or ref_author_norm in author_norm:
-                            found = True
-                            break
+            # Comparar según el estilo
+            if by_year:
+                # Comparar apellido y año
+                if author and year:
+                    if year in years_by_surname.get(author_norm, ()):
+                        found = True
+                    else:
+                        found = _partial_name_match(author_norm, surnames_by_year.get(year, ()),
+                                                    haystack_by_year.get(year, ''))
+            
+            elif by_author:
+                # En MLA solo comparamos autor (apellido)
+                if author:
+                    if author_norm in years_by_surname:
+                        found = True
+                    else:
+                        found = _partial_name_match(author_norm, years_by_surname, all_haystack)
             
             if not found and author.strip():  # Evitar falsos positivos con cadenas vacías
                 citation_text = f"{author} ({year})" if year else author
@@ -599,7 +1209,9 @@ class CitationStyleDetector:
     
     def _find_references_without_citations(self, citations: List[Tuple[str, str]], 
                                          references: List[Dict[str, str]], 
-                                         style: str) -> List[Dict[str, str]]:
+                                         style: str,
+                                         authors_norm: Optional[Dict[str, str]] = None,
+                                         ref_keys: Optional[Tuple[List[str], List[str]]] = None) -> List[Dict[str, str]]:
         """
         Encuentra entradas bibliográficas que no están citadas en el texto.
         
@@ -607,51 +1219,93 @@ class CitationStyleDetector:
             citations (List[Tuple[str, str]]): Lista de citas en texto (autor, año)
             references (List[Dict[str, str]]): Lista de entradas bibliográficas
             style (str): Estilo de citación
+            authors_norm (Dict[str, str], optional): Autores ya normalizados de las citas
+            ref_keys (Tuple[List[str], List[str]], optional): Apellidos y años de las referencias
             
         Returns:
             List[Dict[str, str]]: Lista de referencias no citadas
         """
         unused = []
         
-        for ref in references:
+        # El criterio de comparación no cambia dentro de los bucles
+        by_year = style in ["APA", "HARVARD", "CHICAGO"]
+        by_author = style == "MLA"
+        
+        # Indexar las citas una sola vez: años por autor para la búsqueda exacta
+        # y autores distintos por año para la comparación por inclusión
+        years_by_author = {}
+        authors_by_year = {}
+        if (by_year or by_author) and authors_norm is None:
+            authors_norm = self._normalize_citation_authors(citations)
+        for author, year in (citations if by_year or by_author else ()):
+            if not author:
+                continue
+            author_norm = authors_norm[author]
+            years = years_by_author.setdefault(author_norm, set())
+            if year:
+                years.add(year)
+                authors_by_year.setdefault(year, set()).add(author_norm)
+        haystack_by_year = {year: _NAME_SEPARATOR.join(names) for year, names in authors_by_year.items()}
+        all_haystack = _NAME_SEPARATOR.join(years_by_author)
+        
+        # Apellido y año de cada referencia, extraídos una sola vez
+        if ref_keys is None:
+            ref_keys = self._reference_keys(references)
+        
+        for ref, ref_author_norm, ref_year in zip(references, *ref_keys):
             cited = False
             
-            # Extraer autor y año de la referencia
-            ref_author = ref.get('author', '')
-            if ref_author:
-                ref_author = ref_author.split(',')[0].strip()
-            
-            ref_year = ref.get('year', '')
+            # Comparar según el estilo
+            if by_year:
+                if ref_author_norm and ref_year:
+                    if ref_year in years_by_author.get(ref_author_norm, ()):
+                        cited = True
+                    else:
+                        cited = _partial_name_match(ref_author_norm, authors_by_year.get(ref_year, ()),
+                                                    haystack_by_year.get(ref_year, ''))
             
-            for author, year in citations:
-                # Comparar según el estilo
-                if style in ["APA", "HARVARD", "CHICAGO"]:
-                    if author and ref_author and year and ref_year:
-                        # Normalizar para comparación
-                        author_norm = author.lower().replace('et al.', '').strip()
-                        ref_author_norm = ref_author.lower().strip()
-                        
-                        if author_norm in ref_author_norm or ref_author_norm in author_norm:
-                            if year == ref_year:
-                                cited = True
-                                break
-                
-                elif style == "MLA":
-                    # En MLA solo comparamos autor (apellido)
-                    if author and ref_author:
-                        # Normalizar para comparación
-                        author_norm = author.lower().replace('et al.', '').strip()
-                        ref_author_norm = ref_author.lower().strip()
-                        
-                        if author_norm in ref_author_norm or ref_author_norm in author_norm:
-                            cited = True
-                            break
+            elif by_author:
+                # En MLA solo comparamos autor (apellido)
+                if ref_author_norm:
+                    if ref_author_norm in years_by_author:
+                        cited = True
+                    else:
+                        cited = _partial_name_match(ref_author_norm, years_by_author, all_haystack)
             
-            if not cited and ref_author.strip():  # Evitar falsos positivos
+            if not cited and ref_author_norm:  # Evitar falsos positivos
                 unused.append(ref)
         
         return unused
     
+    @staticmethod
+    def _build_extractor(patterns: List[re.Pattern], union: Optional[re.Pattern]):
+        """
+        Crea una función especializada que extrae las coincidencias de un estilo.
+        
+        La función captura la lista de patrones y la alternancia del estilo, de modo
+        que cada llamada evita las búsquedas en los diccionarios de patrones. La
+        alternancia se recorre una sola vez para saber si hay alguna coincidencia y
+        dónde está la primera; los patrones empiezan a buscar desde ahí.
+        
+        Args:
+            patterns (List[re.Pattern]): Patrones compilados del estilo
+            union (Optional[re.Pattern]): Alternancia del estilo, si se pudo construir
+            
+        Returns:
+            Callable[[str], List[str]]: Función que devuelve el texto de cada coincidencia,
+            patrón por patrón
+        """
+        def extract(text: str) -> List[str]:
+            start = 0
+            if union is not None:
+                first = union.search(text)
+                if first is None:
+                    return []
+                start = first.start()
+            return [match.group(0) for pattern in patterns for match in pattern.finditer(text, start)]
+        
+        return extract
+    
     def extract_citations(self, text: str) -> Dict[str, List[str]]:
         """
         Extrae todas las citas encontradas en el texto.
@@ -675,30 +1329,26 @@ class CitationStyleDetector:
         
         # Extraer citas en texto para el estilo predominante
         if primary_style in self.in_text_patterns:
-            patterns = self.in_text_patterns[primary_style]
+            styles = [primary_style]
             if primary_style == "CHICAGO":
                 # Para Chicago, incluir tanto autor-fecha como notas
-                patterns = self.in_text_patterns.get("CHICAGO_AUTHOR_DATE", []) + \
-                          self.in_text_patterns.get("CHICAGO_NOTES", [])
+                styles = ["CHICAGO_AUTHOR_DATE", "CHICAGO_NOTES"]
             
-            for pattern in patterns:
-                # Usar finditer para obtener el texto completo de la coincidencia
-                matches = re.finditer(pattern, text, re.MULTILINE)
-                for match in matches:
-                    citations['en_texto'].append(match.group(0))
+            for style in styles:
+                # Usar el extractor del estilo para obtener el texto completo de cada coincidencia
+                extractor = self._in_text_extractors.get(style)
+                if extractor is not None:
+                    citations['en_texto'].extend(extractor(text))
         
         # Extraer citas bibliográficas para el estilo predominante
         if primary_style in self.full_citation_patterns:
             # Encontrar la sección de bibliografía
             bibliography_section = self._find_bibliography_section(text, primary_style)
             if bibliography_section:
-                patterns = self.full_citation_patterns[primary_style]
-                
-                for pattern in patterns:
-                    # Buscar coincidencias en la sección de bibliografía
-                    matches = re.finditer(pattern, bibliography_section, re.MULTILINE)
-                    for match in matches:
-                        citations['bibliograficas'].append(match.group(0))
+                # Buscar coincidencias en la sección de bibliografía
+                citations['bibliograficas'].extend(
+                    self._full_citation_extractors[primary_style](bibliography_section)
+                )
                 
                 # Si no se encontraron coincidencias con los patrones,
                 # usar un enfoque línea por línea para capturar posibles referencias
@@ -706,17 +1356,15 @@ class CitationStyleDetector:
                     lines = bibliography_section.split('\n')
                     current_ref = ""
                     
-                    for line in lines:
-                        line = line.strip()
+                    for line in (l.strip() for l in lines):
                         if not line:
                             if current_ref:
                                 citations['bibliograficas'].append(current_ref)
                                 current_ref = ""
                         else:
                             # Detectar si es el inicio de una nueva referencia o continuación
-                            if (re.match(r'^[A-Za-z\-]+,', line) or  # Inicia con apellido
-                                re.match(r'^\[\d+\]', line) or       # Inicia con [n]
-                                re.match(r'^\d+\.', line)):          # Inicia con n.
+                            # Inicia con apellido, con [n] o con n.
+                            if self._NEW_REFERENCE_RE.match(line):
                                 if current_ref:
                                     citations['bibliograficas'].append(current_ref)
                                 current_ref = line
@@ -727,9 +1375,9 @@ class CitationStyleDetector:
                     if current_ref:
                         citations['bibliograficas'].append(current_ref)
         
-        # Eliminar duplicados y ordenar
-        citations['en_texto'] = sorted(list(set(citations['en_texto'])))
-        citations['bibliograficas'] = sorted(list(set(citations['bibliograficas'])))
+        # Eliminar duplicados y ordenar (sorted ya devuelve una lista nueva)
+        citations['en_texto'] = sorted(set(citations['en_texto']))
+        citations['bibliograficas'] = sorted(set(citations['bibliograficas']))
         
         return citations
     
@@ -745,7 +1393,7 @@ class CitationStyleDetector:
         """
         style_counts = self.detect_citation_styles(text)
         primary_style, confidence = self.identify_primary_style(text)
-        validation = self.validate_citations(text)
+        validation, cited_not_referenced = self._validate_citations(text)
         
         # Contar citas totales
         total_in_text = sum(style_counts['in_text'].values())
@@ -780,15 +1428,8 @@ class CitationStyleDetector:
                     if chicago_notes > 0 and chicago_author > 0:
                         recommendations.append("Elija un solo sistema Chicago: notas al pie o autor-fecha, no mezcle ambos.")
             
-            # Verificar consistencia entre citas y bibliografía
+            # Verificar consistencia entre citas y bibliografía (ya cruzadas en la validación)
             if total_in_text > 0 and total_full > 0:
-                in_text_citations = self._extract_citation_keys(text, primary_style)
-                bibliography_entries = self._extract_bibliography_entries(text, primary_style)
-                
-                cited_not_referenced = self._find_citations_without_references(
-                    in_text_citations, bibliography_entries, primary_style
-                )
-                
                 if cited_not_referenced:
                     recommendations.append(
                         f"Añadir entradas bibliográficas para las {len(cited_not_referenced)} citas que no tienen referencia."
@@ -820,6 +1461,23 @@ class CitationStyleDetector:
             'recomendaciones': unique_recommendations
         }
     
+    def analyze_bytes(self, data: bytes, encoding: str = 'utf-8') -> Dict:
+        """
+        Analiza un texto recibido como bytes (p. ej. leído de un archivo en modo binario).
+        
+        El contenido se decodifica una sola vez y el resto del análisis reutiliza la
+        misma cadena. Los patrones dependen de clases Unicode (\\w, letras acentuadas),
+        por lo que no se aplican directamente sobre los bytes.
+        
+        Args:
+            data (bytes): El texto codificado
+            encoding (str): Codificación del texto
+        
+        Returns:
+            Dict: Un diccionario con el análisis completo
+        """
+        return self.analyze_text(data.decode(encoding, errors='replace'))
+    
     def analyze_citation_patterns(self, text: str) -> Dict:
         """
         Analiza patrones de citación avanzados como distribución y densidad.
@@ -835,9 +1493,9 @@ class CitationStyleDetector:
         
         # Contar párrafos y palabras
         paragraphs = [p for p in text.split('\n\n') if p.strip()]
-        words = re.findall(r'\b\w+\b', text)
         total_paragraphs = len(paragraphs)
-        total_words = len(words)
+        # Contar las palabras sin construir la lista completa
+        total_words = sum(1 for _ in self._WORD_RE.finditer(text))
         
         # Calcular densidad de citas
         citation_count = len(citations['en_texto'])
@@ -846,28 +1504,70 @@ class CitationStyleDetector:
         
         # Análisis de distribución
         paragraphs_with_citations = 0
-        citations_per_paragraph = []
+        # Los conteos son enteros pequeños con muchas repeticiones: basta un histograma
+        # y las sumas por tercio del documento, sin guardar la lista de conteos
+        histogram = Counter()
+        third_sums = [0, 0, 0]
+        first_bound = total_paragraphs // 3
+        second_bound = 2 * total_paragraphs // 3
+        
+        # Con Aho-Corasick cada párrafo se recorre una sola vez para todas las citas;
+        # se cuentan citas distintas presentes, igual que con la comprobación `in`
+        automaton = None
+        if AHOCORASICK_AVAILABLE and citations['en_texto']:
+            automaton = ahocorasick.Automaton()
+            for i, citation in enumerate(citations['en_texto']):
+                if citation:
+                    automaton.add_word(citation, i)
+            automaton.make_automaton()
+            # La cadena vacía aparece en cualquier párrafo
+            empty_citations = sum(1 for citation in citations['en_texto'] if not citation)
+        
+        if automaton is not None:
+            counts = (len({i for _, i in automaton.iter(paragraph)}) + empty_citations
+                      for paragraph in paragraphs)
+        elif self.max_workers and len(text) > self._PARALLEL_THRESHOLD and len(paragraphs) > 1:
+            # Los párrafos son independientes: se reparten en bloques contiguos entre
+            # procesos, ya que las comparaciones de cadenas no liberan el GIL
+            pool = self._get_pool()
+            chunk_size = -(-len(paragraphs) // self.max_workers)
+            futures = [
+                pool.submit(_count_paragraph_citations, paragraphs[i:i + chunk_size], citations['en_texto'])
+                for i in range(0, len(paragraphs), chunk_size)
+            ]
+            counts = (count for future in futures for count in future.result())
+        else:
+            counts = (sum(1 for citation in citations['en_texto'] if citation in paragraph)
+                      for paragraph in paragraphs)
         
-        for paragraph in paragraphs:
-            count = 0
-            for citation in citations['en_texto']:
-                if citation in paragraph:
-                    count += 1
-            
-            citations_per_paragraph.append(count)
+        for index, count in enumerate(counts):
+            histogram[count] += 1
+            third_sums[0 if index < first_bound else 1 if index < second_bound else 2] += count
             if count > 0:
                 paragraphs_with_citations += 1
         
         # Calcular estadísticas
-        max_citations = max(citations_per_paragraph) if citations_per_paragraph else 0
-        avg_citations = sum(citations_per_paragraph) / len(citations_per_paragraph) if citations_per_paragraph else 0
-        median_citations = sorted(citations_per_paragraph)[len(citations_per_paragraph)//2] if citations_per_paragraph else 0
+        max_citations = 0
+        avg_citations = 0
+        median_citations = 0
+        if total_paragraphs:
+            # Máximo y mediana salen del histograma sin ordenar todos los conteos
+            values = sorted(histogram)
+            max_citations = values[-1]
+            avg_citations = sum(third_sums) / total_paragraphs
+            
+            # Mediana superior, igual que sorted(...)[n // 2]
+            middle = total_paragraphs // 2
+            accumulated = 0
+            for value in values:
+                accumulated += histogram[value]
+                if accumulated > middle:
+                    median_citations = value
+                    break
         
         # Calcular patrón de uso (principio, medio, final)
         if total_paragraphs >= 3:
-            first_third = sum(citations_per_paragraph[:total_paragraphs//3])
-            middle_third = sum(citations_per_paragraph[total_paragraphs//3:2*total_paragraphs//3])
-            last_third = sum(citations_per_paragraph[2*total_paragraphs//3:])
+            first_third, middle_third, last_third = third_sums
             
             distribution = {
                 'principio': first_third / citation_count if citation_count > 0 else 0,
@@ -957,28 +1657,16 @@ class CitationStyleDetector:
         """
         fixed = citation
         
-        if style == "APA":
-            # Corregir falta de coma entre autor y año
-            fixed = re.sub(r'\(([A-Za-z\-]+(?:\s[A-Za-z\-]+)?) (\d{4})', r'(\1, \2', fixed)
-            
-            # Corregir indicador de página
-            fixed = re.sub(r'(\d{4}), (\d+)', r'\1, p. \2', fixed)
-            
-            # Corregir 'and' por '&' en citas parentéticas
-            if fixed.startswith('('):
-                fixed = re.sub(r' and ', r' & ', fixed)
-        
-        elif style == "MLA":
-            # Corregir coma entre autor y página
-            fixed = re.sub(r'\(([A-Za-z\-]+(?:\s[A-Za-z\-]+)?), (\d+)', r'(\1 \2', fixed)
-            
-            # Corregir '&' por 'and'
-            fixed = re.sub(r' & ', r' and ', fixed)
+        fixers = self._FIXERS.get(style, ())
+        # Ninguna corrección cambia el primer carácter, así que se decide antes de aplicarlas
+        if citation.startswith('('):
+            fixers += self._PARENTHETICAL_FIXERS.get(style, ())
         
-        elif style == "CHICAGO":
-            # Corregir formato autor-fecha
-            if "et al" in fixed:
-                fixed = re.sub(r'et al ', r'et al., ', fixed)
+        for pattern, replacement in fixers:
+            if isinstance(pattern, str):
+                fixed = fixed.replace(pattern, replacement)
+            else:
+                fixed = pattern.sub(replacement, fixed)
         
         return fixed
     
@@ -1002,7 +1690,7 @@ class CitationStyleDetector:
         if citation_type == 'in_text':
             if from_style == "APA" and to_style == "MLA":
                 # De (Autor, 2020, p. 25) a (Autor 25)
-                match = re.search(r'\((?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?),\s\d{4}(?:,\sp\.\s(?P<page>\d+))?\)', citation)
+                match = self._APA_IN_TEXT_RE.search(citation)
                 if match:
                     author = match.group('author')
                     page = match.group('page') or ""
@@ -1014,7 +1702,7 @@ class CitationStyleDetector:
             elif from_style == "MLA" and to_style == "APA":
                 # De (Autor 25) a (Autor, 2020, p. 25)
                 # Necesitaríamos el año que no está en la cita MLA
-                match = re.search(r'\((?P<author>[A-Za-z\-]+(?:\s[A-Za-z\-]+)?)\s(?P<page>\d+)\)', citation)
+                match = self._MLA_IN_TEXT_RE.search(citation)
                 if match:
                     return f"({match.group('author')}, YYYY, p. {match.group('page')})"
             
@@ -2,10 +2,48 @@
 # Implementación de extracción de citas
 
 import re
+import sys
 import logging
-from typing import Dict, List, Tuple, Set, Optional, Any
-from collections import defaultdict
+from typing import Dict, List, Tuple, Set, Optional, Any, Iterable
+from collections import defaultdict, Counter, OrderedDict
+from itertools import islice
 
+# Intentar importar regex si está disponible
+try:
+    import regex
+    REGEX_AVAILABLE = True
+except ImportError:
+    REGEX_AVAILABLE = False
+
+# Compilación con re2 (si está disponible) compartida con los demás módulos
+try:
+    from .patterns import RE2_AVAILABLE, Re2Pattern, compile_re2
+except ImportError:
+    from patterns import RE2_AVAILABLE, Re2Pattern, compile_re2
+
+# Secuencia de letras de un nombre de autor en los patrones de citas en texto
+_AUTHOR_CHARS = r'[A-Za-zÀ-ÿ\-]+'
+# Los cuantificadores posesivos existen en regex y en re desde Python 3.11
+_POSSESSIVE_AVAILABLE = REGEX_AVAILABLE or sys.version_info >= (3, 11)
+
+
+def _compile_possessive(pattern: str) -> Any:
+    """
+    Compila un patrón con cuantificadores posesivos ("++"), que solo deben usarse donde
+    el carácter siguiente no pertenece a la repetición. Sin soporte para ellos, se
+    compilan como "+", con las mismas coincidencias.
+    
+    Args:
+        pattern (str): Patrón como cadena
+        
+    Returns:
+        Any: Patrón compilado (re.Pattern o regex.Pattern)
+    """
+    if sys.version_info >= (3, 11):
+        return re.compile(pattern)
+    if REGEX_AVAILABLE:
+        return regex.compile(pattern)
+    return re.compile(pattern.replace('++', '+'))
 
 class CitationExtractor:
     """
@@ -15,6 +53,167 @@ class CitationExtractor:
     para diferentes estilos de citación, incluyendo APA, MLA, Chicago, etc.
     """
     
+    # Literales de los que toda cita en texto de cada estilo contiene al menos uno,
+    # buscados en el texto en UTF-8 con cada dígito cambiado por 0 (", 0000" es coma,
+    # espacio y un año); si el texto no tiene ninguno, el estilo no puede tener
+    # coincidencias
+    _STYLE_PREFILTERS = {
+        'APA': (b', 0000', b' (0000'),
+        'MLA': (b'0)',),
+        'CHICAGO': (b' 0000', b' (0000', b'0.', b'Ibid.', b'Op. cit.', b'Loc. cit.'),
+        'HARVARD': (b', 0000', b' (0000'),
+        'IEEE': (b'[0',),
+        'VANCOUVER': (b'(0', b'[0') + tuple(chr(c).encode() for c in (0xB9, 0xB2, 0xB3, *range(0x2070, 0x207A))),
+        'CSE': (b' 0000', b'['),
+    }
+    # Cambia cada dígito ASCII por 0. \d también reconoce dígitos de otros sistemas
+    # de escritura; si el texto los tiene, no se descarta ningún estilo por literales.
+    _DIGIT_CANON_TABLE = bytes.maketrans(b'123456789', b'000000000')
+    _NON_ASCII_DIGIT_RE = re.compile(r'[^\D0-9]')
+    
+    # Fragmentos en minúsculas de los encabezados de bibliografía. Se evitan s, k e i
+    # porque re.IGNORECASE también las iguala con ſ, K (Kelvin), ı e İ.
+    _HEADER_KEYWORDS = ('referenc', 'ogr', 'obra', 'wor', 'not')
+    
+    # Caracteres que re.IGNORECASE iguala con i o s pero que str.lower() no convierte
+    # en ellas (İ pasaría a "i" más un punto combinante)
+    _HEADER_CASE_TABLE = str.maketrans({'İ': 'i', 'ı': 'i', 'ſ': 's'})
+    
+    # Inicio de una entrada bibliográfica en una línea sin espacios iniciales:
+    # apellido y coma, [n] o n.; en CSE también "Autor Nombre año."
+    _AUTHOR_ENTRY_START_RE = re.compile(r'[A-Za-zÀ-ÿ\-]+,')
+    _NUMBERED_ENTRY_START_RE = re.compile(r'\[\d+\]|\d+\.')
+    _ENTRY_START_RES = {
+        'APA': _AUTHOR_ENTRY_START_RE,
+        'MLA': _AUTHOR_ENTRY_START_RE,
+        'CHICAGO': _AUTHOR_ENTRY_START_RE,
+        'HARVARD': _AUTHOR_ENTRY_START_RE,
+        'IEEE': _NUMBERED_ENTRY_START_RE,
+        'VANCOUVER': _NUMBERED_ENTRY_START_RE,
+        'CSE': re.compile(r'\[\d+\]|\d+\.|\w+\s\w+\s\d{4}\.'),
+    }
+    
+    # Estilos cuyos patrones locales ya garantizan las comprobaciones de
+    # _is_valid_citation para citas en texto (año o número presente, paréntesis
+    # cerrados, longitud mínima); solo falta la longitud máxima. No están Chicago,
+    # cuyas notas pueden no llevar año, ni Vancouver, cuyos superíndices no son \d.
+    _SELF_VALIDATING_STYLES = frozenset({'APA', 'MLA', 'CHICAGO_AUTHOR_DATE', 'HARVARD', 'IEEE', 'CSE'})
+    
+    # Comprobaciones de las citas en texto: año de 4 dígitos y algún número
+    _YEAR_RE = re.compile(r'\d{4}')
+    _DIGIT_RE = re.compile(r'\d')
+    
+    # Forma de una entrada bibliográfica válida, en un solo patrón por estilo: termina
+    # con un signo de puntuación y contiene un año (salvo en MLA); en APA, MLA, Chicago
+    # y Harvard empieza con apellido y coma, y en IEEE y Vancouver lleva [n] al inicio
+    # o "n." en cualquier parte. La longitud se comprueba aparte.
+    _BIB_AUTHOR_VALIDATOR_RE = re.compile(r'(?=[A-Za-zÀ-ÿ\-]+,)(?=.*[.!?]$).*?\d{4}', re.DOTALL)
+    _BIB_NUMBERED_VALIDATOR_RE = re.compile(r'(?=\[\d+\]|.*?\d+\.)(?=.*[.!?]$).*?\d{4}', re.DOTALL)
+    _BIB_VALIDATOR_RES = {
+        'APA': _BIB_AUTHOR_VALIDATOR_RE,
+        'MLA': re.compile(r'(?=[A-Za-zÀ-ÿ\-]+,).*[.!?]$', re.DOTALL),
+        'CHICAGO': _BIB_AUTHOR_VALIDATOR_RE,
+        'HARVARD': _BIB_AUTHOR_VALIDATOR_RE,
+        'IEEE': _BIB_NUMBERED_VALIDATOR_RE,
+        'VANCOUVER': _BIB_NUMBERED_VALIDATOR_RE,
+    }
+    _BIB_DEFAULT_VALIDATOR_RE = re.compile(r'(?=.*[.!?]$).*?\d{4}', re.DOTALL)
+    
+    # Primera entrada bibliográfica con la forma típica del estilo, para localizar la
+    # bibliografía cuando no tiene encabezado: Apellido, I. (Año). en APA, Apellido,
+    # Nombre. en MLA y [1] I. Apellido en IEEE
+    _APA_FIRST_ENTRY_RE = re.compile(r'\n[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?\s\(\d{4}\)\.')
+    _FIRST_ENTRY_RES = {
+        'APA': _APA_FIRST_ENTRY_RE,
+        'MLA': re.compile(r'\n[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+\.\s'),
+        'IEEE': re.compile(r'\n\[\d+\]\s[A-Z]\.\s[A-Za-zÀ-ÿ\-]+'),
+    }
+    # Encabezado de la sección siguiente a la bibliografía (p.ej., "Apéndices")
+    _NEXT_SECTION_RE = re.compile(r'\n\s*[A-Z][A-Za-zÀ-ÿ\s]+\s*\n')
+    # Línea en blanco entre entradas de estilos no reconocidos
+    _BLANK_LINE_SPLIT_RE = re.compile(r'\n\s*\n')
+    
+    # Marcadores específicos de cada estilo
+    _MARKER_APA_AMP_RE = re.compile(r'\([A-Za-zÀ-ÿ\-]+ & [A-Za-zÀ-ÿ\-]+,')
+    _MARKER_MLA_AND_RE = re.compile(r'\([A-Za-zÀ-ÿ\-]+ and [A-Za-zÀ-ÿ\-]+ \d+')
+    _MARKER_MLA_PAGES_RE = re.compile(r'\([A-Za-zÀ-ÿ\-]+ \d+\)')
+    _MARKER_CHICAGO_FOOTNOTE_RE = re.compile(r'^\d+\.\s', re.MULTILINE)
+    _MARKER_CHICAGO_LATIN_RE = re.compile(r'Ibid\.|Op\. cit\.|Loc\. cit\.')
+    _MARKER_IEEE_BRACKET_RE = re.compile(r'\[\d+\]')
+    _MARKER_VANCOUVER_PAREN_RE = re.compile(r'\(\d+\)')
+    _MARKER_CSE_NAMEYEAR_RE = re.compile(r'[A-Za-zÀ-ÿ\-]+ [A-Z]{1,2}\. \d{4}\.')
+    # Año y página de APA ("2020, p. 45") y de Harvard ("2020: 45"), que se buscan
+    # con _has_year_page (equivalen a r'\d{4}, p\. \d+' y r'\d{4}: \d+')
+    _MARKER_APA_P_SEPARATOR = ', p. '
+    _MARKER_HARVARD_COLON_SEPARATOR = ': '
+    
+    # Patrones de metadatos por estilo
+    # Cita parentética: (Autor, año, p. XX)
+    _META_APA_PARENTHETICAL_RE = re.compile(r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?),\s(?P<year>\d{4})(?:,\s(?P<page>p\.?\s\d+(?:-\d+)?))?\)')
+    # Cita narrativa: Autor (año, p. XX)
+    _META_APA_NARRATIVE_RE = re.compile(r'(?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s\((?P<year>\d{4})(?:,\s(?P<page>p\.?\s\d+(?:-\d+)?))?\)')
+    # Cita parentética: (Autor página)
+    _META_MLA_PARENTHETICAL_RE = re.compile(r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s(?P<page>\d+(?:-\d+)?)\)')
+    # Cita narrativa: Autor (página)
+    _META_MLA_NARRATIVE_RE = re.compile(r'(?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s\((?P<page>\d+(?:-\d+)?)\)')
+    # Cita autor-fecha: (Autor año, página)
+    _META_CHICAGO_PARENTHETICAL_RE = re.compile(r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s(?P<year>\d{4})(?:,\s(?P<page>\d+(?:-\d+)?))?\)')
+    # Cita narrativa: Autor (año, página)
+    _META_CHICAGO_NARRATIVE_RE = re.compile(r'(?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s\((?P<year>\d{4})(?:,\s(?P<page>\d+(?:-\d+)?))?\)')
+    # Cita parentética: (Autor, año: página)
+    _META_HARVARD_PARENTHETICAL_RE = re.compile(r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?),\s(?P<year>\d{4})(?::\s(?P<page>\d+(?:-\d+)?))?\)')
+    # Cita narrativa: Autor (año: página)
+    _META_HARVARD_NARRATIVE_RE = re.compile(r'(?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s\((?P<year>\d{4})(?::\s(?P<page>\d+(?:-\d+)?))?\)')
+    # Cita numérica: [1] o (1)
+    _META_NUMBER_RE = re.compile(r'[\[\(](?P<number>\d+)[\]\)]')
+    # Libro: Apellido, I. (Año). Título. Editorial.
+    _META_APA_BOOK_RE = re.compile(r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s(?:[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?))*((?:,|\s)&\s(?:[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?))?\s\((?P<year>\d{4})\)\.\s(?P<title>[^\.]+)\.\s(?P<publisher>[^\.]+)')
+    # Artículo: Apellido, I. (Año). Título del artículo. Revista, vol(num), pp-pp.
+    _META_APA_ARTICLE_RE = re.compile(r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s(?:[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?))*((?:,|\s)&\s(?:[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?))?\s\((?P<year>\d{4})\)\.\s(?P<title>[^\.]+)\.\s(?P<journal>[^,]+),\s(?P<volume>\d+)(?:\((?P<issue>\d+)\))?,\s(?P<pages>\d+-\d+)')
+    # En MLA, los apellidos (hasta la coma), el título del libro (hasta el punto), la
+    # editorial y la revista (hasta la coma) y los números son posesivos: devolverles
+    # caracteres no puede producir otra coincidencia. Los nombres no, porque pueden
+    # contener " and ", ni el título del artículo, que devuelve su punto final.
+    # Los autores, que terminan en el primer punto, son comunes a libros y artículos:
+    # una sola búsqueda los recorre una vez y la rama que coincide (grupo "book" o
+    # "article") da el tipo de obra. Los grupos repetidos en la otra rama llevan el
+    # prefijo "article_" y se renombran con _METADATA_GROUP_ALIASES.
+    # Libro: Apellido, Nombre. Título. Editorial, Año.
+    # Artículo: Apellido, Nombre. "Título del artículo." Revista, vol. num, año, pp. xx-xx.
+    _META_MLA_BIBLIOGRAPHY_RE = _compile_possessive(r'^(?P<author>[A-Za-zÀ-ÿ\-]++,\s[A-Za-zÀ-ÿ\s\-]+)(?:,\s(?:[A-Za-zÀ-ÿ\-]++,\s[A-Za-zÀ-ÿ\s\-]+))*(?:,? and (?:[A-Za-zÀ-ÿ\-]++,\s[A-Za-zÀ-ÿ\s\-]+))?\.\s'
+                                                    r'(?:(?P<book>(?P<title>[^\.]++)\.\s(?P<publisher>[^,]++),\s(?P<year>\d{4}))'
+                                                    r'|(?P<article>"(?P<article_title>[^"]+)\."\s(?P<journal>[^,]++),\svol\.\s(?P<volume>\d++)(?:,\sno\.\s(?P<issue>\d++))?,\s(?P<article_year>\d{4}),\s(?:pp\.|p\.)\s(?P<pages>\d++-\d+)))')
+    
+    # Patrones de metadatos por (estilo, tipo de cita), en orden de prueba, con los
+    # datos que se añaden si el patrón coincide; _METADATA_FALLBACKS se añade si
+    # ninguno coincide
+    _METADATA_PATTERNS = {
+        ('APA', 'in_text'): ((_META_APA_PARENTHETICAL_RE, None), (_META_APA_NARRATIVE_RE, None)),
+        ('MLA', 'in_text'): ((_META_MLA_PARENTHETICAL_RE, None), (_META_MLA_NARRATIVE_RE, None)),
+        ('CHICAGO', 'in_text'): ((_META_CHICAGO_PARENTHETICAL_RE, None), (_META_CHICAGO_NARRATIVE_RE, None)),
+        ('CHICAGO_AUTHOR_DATE', 'in_text'): ((_META_CHICAGO_PARENTHETICAL_RE, None), (_META_CHICAGO_NARRATIVE_RE, None)),
+        ('HARVARD', 'in_text'): ((_META_HARVARD_PARENTHETICAL_RE, None), (_META_HARVARD_NARRATIVE_RE, None)),
+        ('IEEE', 'in_text'): ((_META_NUMBER_RE, None),),
+        ('VANCOUVER', 'in_text'): ((_META_NUMBER_RE, None),),
+        ('APA', 'bibliography'): ((_META_APA_BOOK_RE, None), (_META_APA_ARTICLE_RE, {'type': 'article'})),
+        ('MLA', 'bibliography'): ((_META_MLA_BIBLIOGRAPHY_RE, None),),
+    }
+    _METADATA_FALLBACKS = {
+        ('APA', 'bibliography'): {'type': 'book'},
+    }
+    # Ramas de un patrón con varios tipos de obra, con los datos que añade cada una,
+    # y nombres de los grupos que se repiten en más de una rama
+    _METADATA_BRANCHES = {
+        'book': {'type': 'book'},
+        'article': {'type': 'article'},
+    }
+    _METADATA_GROUP_ALIASES = {'article_title': 'title', 'article_year': 'year'}
+    
+    # Resultados recientes de detección de estilo y división en secciones
+    _SECTION_CACHE_SIZE = 16
+    # Metadatos de citas recientes (una misma cita suele repetirse en el documento)
+    _METADATA_CACHE_SIZE = 4096
+    
     def __init__(self, patterns=None):
         """
         Inicializa el extractor de citas.
@@ -24,6 +223,8 @@ class CitationExtractor:
         """
         self.logger = logging.getLogger('CitationExtractor')
         self.patterns = patterns
+        self._section_cache = OrderedDict()
+        self._metadata_cache = OrderedDict()
         
         # Inicializar patrones básicos para detección de secciones
         self._init_section_patterns()
@@ -93,11 +294,12 @@ class CitationExtractor:
                 r'\([A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?(?: and [A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)? \d+(?:-\d+)?\)',
                 r'[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?(?: and [A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)? \(\d+(?:-\d+)?\)'
             ],
-            'CHICAGO_AUTHOR_DATE': [
+            # Chicago reúne los patrones de autor-fecha y de notas (ver _in_text_subkinds)
+            'CHICAGO': [
+                # Autor-fecha
                 r'\([A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?(?: and [A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)? \d{4}(?:, \d+(?:-\d+)?)?\)',
-                r'[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?(?: and [A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)? \(\d{4}(?:, \d+(?:-\d+)?)?\)'
-            ],
-            'CHICAGO_NOTES': [
+                r'[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?(?: and [A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)? \(\d{4}(?:, \d+(?:-\d+)?)?\)',
+                # Notas
                 r'^\d+\.\s.+',
                 r'(?:Ibid\.|Op\. cit\.|Loc\. cit\.)(?:,\s\d+(?:-\d+)?)?'
             ],
@@ -121,6 +323,329 @@ class CitationExtractor:
                 r'\[[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?:,\s\d{4})?\]'
             ]
         }
+        
+        # Subestilo de cada patrón de los estilos que agrupan varios, para poder
+        # extraer solo las citas de uno de ellos (p. ej. CHICAGO_NOTES)
+        self._in_text_subkinds = {
+            'CHICAGO': ['CHICAGO_AUTHOR_DATE', 'CHICAGO_AUTHOR_DATE', 'CHICAGO_NOTES', 'CHICAGO_NOTES']
+        }
+        
+        # Compilar todos los patrones una sola vez
+        self._compile_section_patterns()
+    
+    def _compile_section_patterns(self):
+        """
+        Compila los encabezados de bibliografía y los patrones de citas en texto.
+        
+        Los encabezados se mantienen también como cadenas en ``bibliography_headers``;
+        de cada uno se derivan la búsqueda del encabezado en cualquier línea, la
+        búsqueda como línea completa (seguida de líneas en blanco) y la eliminación
+        del encabezado al inicio de una sección.
+        """
+        self._header_res = {}
+        self._header_line_res = {}
+        self._header_strip_res = {}
+        for style, headers in self.bibliography_headers.items():
+            header_res, line_res, strip_res = [], [], []
+            for header in headers:
+                # Los indicadores en línea deben ir al principio del patrón, así que el
+                # "(?i)" de cada encabezado pasa a re.IGNORECASE
+                body = header[4:] if header.startswith('(?i)') else header
+                header_res.append(re.compile(body, re.IGNORECASE | re.MULTILINE))
+                if body.startswith('^') and body.endswith('$'):
+                    # El encabezado ya ocupa la línea completa: no hace falta volver a
+                    # anclarlo, y "\s*$" tras su "$" no cambia dónde empieza la coincidencia
+                    line_res.append(header_res[-1])
+                    strip_res.append(re.compile(f"{body}\\s*\n", re.IGNORECASE))
+                else:
+                    line_res.append(re.compile(f"^{body}\\s*$", re.IGNORECASE | re.MULTILINE))
+                    strip_res.append(re.compile(f"^{body}\\s*\n", re.IGNORECASE))
+            self._header_res[style] = header_res
+            self._header_line_res[style] = line_res
+            self._header_strip_res[style] = strip_res
+        
+        sources = self.in_text_patterns
+        self.in_text_patterns = {
+            style: [self._compile_in_text_pattern(pattern) if isinstance(pattern, str) else pattern
+                    for pattern in patterns]
+            for style, patterns in self.in_text_patterns.items()
+        }
+        
+        # Para la detección de estilo: encabezados distintos (varios estilos comparten
+        # los mismos) y una alternancia por estilo de sus patrones de citas en texto.
+        # Los encabezados literales se compilan en minúsculas y sin re.IGNORECASE, y
+        # se buscan en el texto en minúsculas; el resto, en el texto original.
+        self._distinct_header_res = {}
+        for headers in self._header_res.values():
+            for header in headers:
+                if header.pattern not in self._distinct_header_res:
+                    lowercase = self._lowercase_header(header.pattern)
+                    self._distinct_header_res[header.pattern] = (
+                        (re.compile(lowercase, re.MULTILINE), True) if lowercase is not None else (header, False)
+                    )
+        self._any_header_on_lowercase = all(on_lowercase for _, on_lowercase in self._distinct_header_res.values())
+        self._any_header_re = self._union_patterns(
+            [header for header, _ in self._distinct_header_res.values()] if self._any_header_on_lowercase
+            else [header for headers in self._header_res.values() for header in headers]
+        )
+        
+        # Si todos son literales de línea completa, cada uno se busca con str.find en
+        # el texto en minúsculas, comprobando que ocupe la línea entera: es mucho más
+        # rápido que una alternancia anclada con ^, que se prueba en cada posición
+        self._header_lines = None
+        lowercase_headers = [header.pattern for header, _ in self._distinct_header_res.values()]
+        if (self._any_header_on_lowercase and lowercase_headers
+                and all(body.startswith('^') and body.endswith('$') for body in lowercase_headers)):
+            self._header_lines = {
+                source: re.sub(r'\\(.)', r'\1', body[1:-1])
+                for source, body in zip(self._distinct_header_res, lowercase_headers)
+            }
+        
+        # Búsqueda de encabezados como línea completa, por estilo y para todos los
+        # estilos a la vez (en orden de prioridad, sin repetir encabezados)
+        self._header_searches = {
+            style: self._build_header_search(list(zip(headers, self._header_line_res[style])))
+            for style, headers in self.bibliography_headers.items()
+        }
+        all_headers = {}
+        for style, headers in self.bibliography_headers.items():
+            for header, header_re in zip(headers, self._header_line_res[style]):
+                all_headers.setdefault(header, header_re)
+        self._all_headers_search = self._build_header_search(list(all_headers.items()))
+        self._in_text_unions = {
+            style: self._union_in_text_patterns(sources.get(style, []), patterns)
+            for style, patterns in self.in_text_patterns.items()
+        }
+        
+        # El marcador de CSE empieza por letras y no por un literal, así que re lo
+        # prueba en cada posición: con re2 se recorre el texto una sola vez
+        self._marker_cse_re = self._with_re2(self._MARKER_CSE_NAMEYEAR_RE)
+        
+        # Validadores de citas por (estilo, tipo de cita), con solo las comprobaciones
+        # de cada estilo
+        self._validators = {
+            ('APA', 'in_text'): self._validate_author_date_in_text,
+            ('MLA', 'in_text'): self._validate_mla_in_text,
+            ('CHICAGO', 'in_text'): self._validate_author_date_in_text,
+            ('CHICAGO_AUTHOR_DATE', 'in_text'): self._validate_author_date_in_text,
+            ('IEEE', 'in_text'): self._validate_numeric_in_text,
+            ('VANCOUVER', 'in_text'): self._validate_numeric_in_text,
+        }
+        for style, validator_re in self._BIB_VALIDATOR_RES.items():
+            self._validators[(style, 'bibliography')] = self._bibliography_validator(validator_re)
+        self._default_bibliography_validator = self._bibliography_validator(self._BIB_DEFAULT_VALIDATOR_RE)
+    
+    def _may_contain_header(self, text: str, text_lower: Optional[str] = None) -> bool:
+        """
+        Comprobación rápida, con literales, de si el texto puede contener algún
+        encabezado de bibliografía.
+        
+        Args:
+            text (str): Texto a analizar
+            text_lower (str, optional): El texto ya pasado a minúsculas
+            
+        Returns:
+            bool: False si es seguro que no hay ningún encabezado
+        """
+        if text_lower is None:
+            text_lower = text.lower()
+        return any(keyword in text_lower for keyword in self._HEADER_KEYWORDS)
+    
+    @staticmethod
+    def _lowercase_header(body: str) -> Optional[str]:
+        """
+        Convierte a minúsculas un encabezado literal (opcionalmente anclado con ^ y $)
+        para buscarlo sin re.IGNORECASE.
+        
+        Args:
+            body (str): Patrón del encabezado, sin indicadores en línea
+            
+        Returns:
+            Optional[str]: El patrón en minúsculas, o None si no es un literal
+        """
+        core = body[1:] if body.startswith('^') else body
+        core = core[:-1] if core.endswith('$') else core
+        # re.escape también escapa los espacios, que en el patrón ya son literales
+        if not core or core != re.escape(core).replace('\\ ', ' '):
+            return None
+        return body.lower()
+    
+    @classmethod
+    def _lower_for_headers(cls, text: str) -> str:
+        """
+        Pasa el texto a minúsculas de forma que un encabezado literal en minúsculas
+        coincida donde el original coincidiría con re.IGNORECASE.
+        
+        Args:
+            text (str): Texto a convertir
+            
+        Returns:
+            str: Texto en minúsculas
+        """
+        # translate es lento en textos largos: solo se usa si hace falta
+        if not text.isascii() and any(char in text for char in 'İıſ'):
+            text = text.translate(cls._HEADER_CASE_TABLE)
+        return text.lower()
+    
+    @staticmethod
+    def _build_header_search(headers: List[Tuple[str, re.Pattern]]) -> Tuple[List[Tuple[str, re.Pattern]], Optional[re.Pattern]]:
+        """
+        Prepara la búsqueda de una lista de encabezados ordenada por prioridad.
+        
+        Args:
+            headers (List[Tuple[str, re.Pattern]]): Pares (encabezado, patrón de línea completa)
+            
+        Returns:
+            Tuple[List[Tuple[str, re.Pattern]], Optional[re.Pattern]]: Los mismos pares y una
+            alternancia con un grupo ``_h{i}`` por encabezado, o None si no se puede construir
+        """
+        union = None
+        if headers:
+            try:
+                union = re.compile(
+                    '|'.join(f'(?P<_h{i}>{header_re.pattern})' for i, (_, header_re) in enumerate(headers)),
+                    re.IGNORECASE | re.MULTILINE
+                )
+            except re.error:
+                union = None
+        return headers, union
+    
+    @staticmethod
+    def _search_headers(text: str, header_search: Tuple[List[Tuple[str, re.Pattern]], Optional[re.Pattern]]) -> Optional[Tuple[str, int]]:
+        """
+        Busca el primer encabezado, por orden de prioridad, que aparece en el texto.
+        
+        Equivale a probar los encabezados uno a uno sobre todo el texto, pero con una
+        sola pasada de la alternancia: ningún encabezado aparece antes de su primera
+        coincidencia, y uno de mayor prioridad que apareciera en esa misma posición
+        habría ganado en la alternancia, así que solo hace falta buscar los de mayor
+        prioridad a partir de ella.
+        
+        Args:
+            text (str): Texto completo
+            header_search: Resultado de _build_header_search
+            
+        Returns:
+            Optional[Tuple[str, int]]: El encabezado y la posición donde empieza, o None
+        """
+        headers, union = header_search
+        if union is None:
+            for header, header_re in headers:
+                match = header_re.search(text)
+                if match:
+                    return header, match.start()
+            return None
+        
+        first = union.search(text)
+        if first is None:
+            return None
+        index = int(first.lastgroup[2:])
+        for header, header_re in headers[:index]:
+            match = header_re.search(text, first.start())
+            if match:
+                return header, match.start()
+        return headers[index][0], first.start()
+    
+    @staticmethod
+    def _compile_in_text_pattern(pattern: str) -> Any:
+        """
+        Compila un patrón de citas en texto.
+        
+        En estos patrones una secuencia de letras de autor nunca va seguida de otra
+        letra, así que devolverle caracteres no puede producir otra coincidencia: se
+        vuelve posesiva para que el motor no retroceda dentro de ella. Los patrones
+        con nombres de autor se compilan con el módulo regex si está disponible, y
+        los que no empiezan por un literal, con re2 si está disponible.
+        
+        Args:
+            pattern (str): Patrón como cadena
+            
+        Returns:
+            Any: Patrón compilado (re.Pattern, regex.Pattern o Re2Pattern)
+        """
+        source = pattern
+        if _POSSESSIVE_AVAILABLE and _AUTHOR_CHARS in pattern:
+            pattern = pattern.replace(_AUTHOR_CHARS, _AUTHOR_CHARS + '+')
+            compiled = regex.compile(pattern) if REGEX_AVAILABLE else re.compile(pattern)
+        else:
+            compiled = re.compile(pattern)
+        
+        # Los patrones que empiezan por un literal ya los localiza rápido re; en el
+        # resto, que empiezan por letras de autor, re2 evita probar cada posición
+        if source[:2] not in ('\\(', '\\['):
+            return CitationExtractor._with_re2(compiled, source)
+        return compiled
+    
+    @staticmethod
+    def _with_re2(compiled: Any, source: Optional[str] = None) -> Any:
+        """
+        Acompaña un patrón compilado de su equivalente en re2, si re2 está disponible
+        y el patrón se puede traducir.
+        
+        Args:
+            compiled (Any): Patrón compilado (re.Pattern o regex.Pattern)
+            source (str, optional): Patrón original como cadena, si no es compiled.pattern
+            
+        Returns:
+            Any: Re2Pattern, o el mismo patrón compilado
+        """
+        compiled_re2 = compile_re2(source if source is not None else compiled.pattern, compiled)
+        return compiled_re2 if compiled_re2 is not None else compiled
+    
+    @staticmethod
+    def _union_patterns(patterns: List[Any]) -> Optional[Any]:
+        """
+        Une varios patrones compilados con los mismos indicadores en una sola alternancia.
+        
+        Args:
+            patterns (List[Any]): Patrones a unir (re.Pattern o, sin indicadores, regex.Pattern)
+            
+        Returns:
+            Optional[Any]: La alternancia compilada, o None si no se puede construir
+        """
+        if not patterns:
+            return None
+        source = '|'.join(f'(?:{pattern.pattern})' for pattern in patterns)
+        
+        if all(isinstance(pattern, re.Pattern) for pattern in patterns):
+            if len({pattern.flags for pattern in patterns}) != 1:
+                return None
+            try:
+                return re.compile(source, patterns[0].flags)
+            except re.error:
+                return None
+        
+        # Algún patrón es de regex: la alternancia también, y solo si ninguno lleva indicadores
+        if any(isinstance(pattern, re.Pattern) and pattern.flags != re.UNICODE for pattern in patterns):
+            return None
+        try:
+            return regex.compile(source)
+        except regex.error:
+            return None
+    
+    @classmethod
+    def _union_in_text_patterns(cls, sources: List[Any], patterns: List[Any]) -> Optional[Any]:
+        """
+        Une los patrones de citas en texto de un estilo en una alternancia, con re2 si
+        alguno de ellos usa re2.
+        
+        Args:
+            sources (List[Any]): Patrones originales (cadenas o patrones compilados)
+            patterns (List[Any]): Los mismos patrones compilados
+            
+        Returns:
+            Optional[Any]: La alternancia compilada, o None si no se puede construir
+        """
+        union = cls._union_patterns([pattern.fallback if isinstance(pattern, Re2Pattern) else pattern
+                                     for pattern in patterns])
+        if union is None or not any(isinstance(pattern, Re2Pattern) for pattern in patterns):
+            return union
+        
+        if all(isinstance(source, str) for source in sources):
+            compiled_re2 = compile_re2('|'.join(f'(?:{source})' for source in sources), union)
+            if compiled_re2 is not None:
+                return compiled_re2
+        return union
     
     def extract_all_citations(self, text: str, style: Optional[str] = None) -> Dict[str, List[str]]:
         """
@@ -144,50 +669,60 @@ class CitationExtractor:
         if not style:
             style = self._detect_citation_style(text)
         
+        # Separar el texto principal y la bibliografía una sola vez
+        main_text = self._extract_main_text(text)
+        bib_section = self._extract_bibliography_section(text, style)
+        
         # Extraer citas en texto
-        result['en_texto'] = self.extract_in_text_citations(text, style)
+        result['en_texto'] = self.extract_in_text_citations(text, style, main_text=main_text)
         
         # Extraer citas bibliográficas
-        result['bibliograficas'] = self.extract_bibliography_citations(text, style)
+        result['bibliograficas'] = self.extract_bibliography_citations(text, style, bib_section=bib_section)
         
         return result
     
-    def extract_in_text_citations(self, text: str, style: str) -> List[str]:
+    def extract_in_text_citations(self, text: str, style: str, main_text: Optional[str] = None) -> List[str]:
         """
         Extrae citas en texto según un estilo específico.
         
         Args:
             text (str): Texto a analizar
             style (str): Estilo de citación
+            main_text (str, optional): Texto principal ya separado de la bibliografía
             
         Returns:
             List[str]: Lista de citas en texto encontradas
         """
-        citations = []
+        # Citas válidas sin duplicados, en orden de aparición
+        citations = {}
         
         # Separar el texto de la bibliografía para evitar falsos positivos
-        main_text = self._extract_main_text(text)
+        if main_text is None:
+            main_text = self._extract_main_text(text)
         
         # Patrones a utilizar según el estilo
         patterns = []
+        # Si las coincidencias ya cumplen las comprobaciones del estilo
+        self_validating = False
         
         # Si se usan patrones desde una clase externa
         if self.patterns and hasattr(self.patterns, 'get_pattern'):
             patterns = self.patterns.get_pattern(style, 'in_text')
         else:
             # Usar patrones locales básicos
-            if style == 'CHICAGO':
-                # Para Chicago, revisar tanto autor-fecha como notas
-                patterns = self.in_text_patterns.get('CHICAGO_AUTHOR_DATE', []) + \
-                          self.in_text_patterns.get('CHICAGO_NOTES', [])
-            else:
-                patterns = self.in_text_patterns.get(style, [])
+            # Chicago revisa tanto autor-fecha como notas; un subestilo, solo sus patrones
+            patterns = self.in_text_patterns.get(style) or self._subkind_patterns(style)
+            self_validating = style in self._SELF_VALIDATING_STYLES
         
         # Si no hay patrones disponibles, probar con todos los estilos
         if not patterns:
             for s, ps in self.in_text_patterns.items():
                 patterns.extend(ps)
         
+        # Validar cada cita (evitar falsos positivos); si el patrón ya garantiza las
+        # comprobaciones del estilo, solo queda por comprobar la longitud
+        validate = self._validate_in_text_length if self_validating else self._validator(style, 'in_text')
+        
         # Aplicar cada patrón al texto principal
         for pattern in patterns:
             if isinstance(pattern, str):
@@ -198,10 +733,8 @@ class CitationExtractor:
             if hasattr(pattern, 'finditer'):
                 for match in pattern.finditer(main_text):
                     citation = match.group(0)
-                    
-                    # Validar la cita (evitar falsos positivos)
-                    if self._is_valid_citation(citation, style, 'in_text'):
-                        citations.append(citation)
+                    if citation not in citations and validate(citation):
+                        citations[citation] = None
             else:
                 # Fallback para patrones como cadenas
                 matches = re.findall(pattern, main_text)
@@ -212,32 +745,43 @@ class CitationExtractor:
                         # Para tuplas de grupos de captura
                         citation = match[0] if match else ""
                     
-                    if citation and self._is_valid_citation(citation, style, 'in_text'):
-                        citations.append(citation)
+                    if citation and citation not in citations and validate(citation):
+                        citations[citation] = None
         
-        # Eliminar duplicados preservando el orden
-        unique_citations = []
-        seen = set()
-        for citation in citations:
-            if citation not in seen:
-                seen.add(citation)
-                unique_citations.append(citation)
+        return list(citations)
+    
+    def _subkind_patterns(self, style: str) -> List[Any]:
+        """
+        Obtiene los patrones de citas en texto de un subestilo (p. ej. CHICAGO_NOTES)
+        dentro del estilo que lo agrupa.
         
-        return unique_citations
+        Args:
+            style (str): Subestilo de citación
+            
+        Returns:
+            List[Any]: Patrones del subestilo, o lista vacía si no es un subestilo
+        """
+        for parent, subkinds in self._in_text_subkinds.items():
+            if style in subkinds:
+                return [pattern for pattern, subkind in zip(self.in_text_patterns.get(parent, []), subkinds)
+                        if subkind == style]
+        return []
     
-    def extract_bibliography_citations(self, text: str, style: str) -> List[str]:
+    def extract_bibliography_citations(self, text: str, style: str, bib_section: Optional[str] = None) -> List[str]:
         """
         Extrae entradas bibliográficas según un estilo específico.
         
         Args:
             text (str): Texto a analizar
             style (str): Estilo de citación
+            bib_section (str, optional): Sección de bibliografía ya extraída
             
         Returns:
             List[str]: Lista de entradas bibliográficas encontradas
         """
         # Extraer la sección de bibliografía
-        bib_section = self._extract_bibliography_section(text, style)
+        if bib_section is None:
+            bib_section = self._extract_bibliography_section(text, style)
         if not bib_section:
             return []
         
@@ -245,18 +789,53 @@ class CitationExtractor:
         entries = self._split_bibliography_entries(bib_section, style)
         
         # Limpiar y validar cada entrada
-        valid_entries = []
-        for entry in entries:
-            entry = entry.strip()
-            if entry and self._is_valid_citation(entry, style, 'bibliography'):
-                valid_entries.append(entry)
+        validate = self._validator(style, 'bibliography')
+        return [entry for entry in map(str.strip, entries) if validate(entry)]
+    
+    def _cached(self, kind: str, text: str, style: Optional[str], compute):
+        """
+        Devuelve un resultado reciente para el mismo texto o lo calcula y lo guarda.
+        
+        Se guarda solo una huella del texto (longitud y hash) para no retener
+        cadenas grandes.
         
-        return valid_entries
+        Args:
+            kind (str): Tipo de resultado
+            text (str): Texto analizado
+            style (str, optional): Estilo, si el resultado depende de él
+            compute: Función sin argumentos que calcula el resultado
+            
+        Returns:
+            El resultado guardado o recién calculado
+        """
+        key = (kind, style, len(text), hash(text))
+        cache = self._section_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        
+        result = compute()
+        cache[key] = result
+        if len(cache) > self._SECTION_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
     
     def _detect_citation_style(self, text: str) -> str:
         """
         Detecta el estilo de citación predominante en el texto.
         
+        Args:
+            text (str): Texto a analizar
+            
+        Returns:
+            str: Estilo de citación detectado ('APA', 'MLA', etc.)
+        """
+        return self._cached('style', text, None, lambda: self._scan_citation_style(text))
+    
+    def _scan_citation_style(self, text: str) -> str:
+        """
+        Calcula el estilo de citación predominante en el texto, sin caché.
+        
         Args:
             text (str): Texto a analizar
             
@@ -264,39 +843,131 @@ class CitationExtractor:
             str: Estilo de citación detectado ('APA', 'MLA', etc.)
         """
         # Conteo de coincidencias por estilo
-        style_counts = defaultdict(int)
+        style_counts = Counter()
         
         # Verificar encabezados de bibliografía
-        for style, headers in self.bibliography_headers.items():
-            for header in headers:
-                if re.search(header, text, re.IGNORECASE | re.MULTILINE):
-                    style_counts[style] += 5  # Dar mayor peso a los encabezados
-        
-        # Verificar patrones de citas en texto
+        found_headers = self._found_headers(text)
+        if found_headers:
+            for style, headers in self._header_res.items():
+                for header in headers:
+                    if header.pattern in found_headers:
+                        style_counts[style] += 5  # Dar mayor peso a los encabezados
+        # Los encabezados de Chicago no puntúan: su conteo es solo el de sus citas en
+        # texto, que antes sustituía a estos puntos al sumar autor-fecha y notas
+        chicago_header_points = style_counts.get('CHICAGO', 0)
+        
+        # Verificar patrones de citas en texto. La alternancia del estilo se recorre
+        # una vez: sin coincidencias no hay nada que contar y, si las hay, ninguna
+        # empieza antes de la primera. Cada patrón se sigue contando por separado,
+        # porque una sola alternancia ocultaría coincidencias solapadas.
+        canonical = text.encode('utf-8', 'surrogatepass').translate(self._DIGIT_CANON_TABLE)
+        only_ascii_digits = None
         for style, patterns in self.in_text_patterns.items():
-            for pattern in patterns:
-                matches = re.findall(pattern, text)
-                style_counts[style] += len(matches)
-        
-        # Si es Chicago, combinar conteos de autor-fecha y notas
-        if 'CHICAGO_AUTHOR_DATE' in style_counts or 'CHICAGO_NOTES' in style_counts:
-            author_date = style_counts.pop('CHICAGO_AUTHOR_DATE', 0)
-            notes = style_counts.pop('CHICAGO_NOTES', 0)
-            style_counts['CHICAGO'] = author_date + notes
+            count = 0
+            literals = self._STYLE_PREFILTERS.get(style)
+            possible = literals is None or any(literal in canonical for literal in literals)
+            if not possible:
+                # Los dígitos de otros sistemas no se cambian por 0: solo se descarta
+                # el estilo si no hay ninguno
+                if only_ascii_digits is None:
+                    only_ascii_digits = text.isascii() or self._NON_ASCII_DIGIT_RE.search(text) is None
+                possible = not only_ascii_digits
+            if possible:
+                union = self._in_text_unions.get(style)
+                first = union.search(text) if union is not None else None
+                if union is None or first is not None:
+                    start = first.start() if first is not None else 0
+                    count = sum(len(pattern.findall(text, start)) for pattern in patterns)
+            # El estilo se registra aunque no tenga coincidencias, como antes
+            style_counts[style] += count
+        
+        if chicago_header_points:
+            style_counts['CHICAGO'] -= chicago_header_points
+        elif 'CHICAGO' in style_counts:
+            # Sin encabezados de Chicago, el estilo va el último en caso de empate
+            style_counts['CHICAGO'] = style_counts.pop('CHICAGO')
         
         # Encontrar el estilo con mayor número de coincidencias
+        # (most_common conserva el primer estilo en caso de empate, como max)
         if style_counts:
-            max_style = max(style_counts.items(), key=lambda x: x[1])
-            if max_style[1] > 0:
-                return max_style[0]
+            max_style, max_count = style_counts.most_common(1)[0]
+            if max_count > 0:
+                return max_style
         
         # Si no se puede determinar, devolver APA como predeterminado
         return 'APA'
     
+    def _found_headers(self, text: str) -> Set[str]:
+        """
+        Busca qué encabezados de bibliografía aparecen en el texto.
+        
+        Los literales descartan primero los textos sin ninguno. Después, si todos son
+        literales de línea completa, se buscan como líneas del texto en minúsculas; si
+        no, la alternancia descarta los textos sin ninguno y cada encabezado distinto se
+        busca una sola vez.
+        
+        Args:
+            text (str): Texto a analizar
+            
+        Returns:
+            Set[str]: Patrones originales de los encabezados encontrados
+        """
+        text_lower = self._lower_for_headers(text)
+        if not self._may_contain_header(text, text_lower):
+            return set()
+        
+        if self._header_lines is not None:
+            return {
+                source for source, line in self._header_lines.items()
+                if self._contains_line(text_lower, line)
+            }
+        
+        any_header_text = text_lower if self._any_header_on_lowercase else text
+        if self._any_header_re is not None and not self._any_header_re.search(any_header_text):
+            return set()
+        return {
+            source for source, (header, on_lowercase) in self._distinct_header_res.items()
+            if header.search(text_lower if on_lowercase else text)
+        }
+    
+    @staticmethod
+    def _contains_line(text: str, line: str) -> bool:
+        """
+        Indica si alguna línea del texto es exactamente la dada, como haría el
+        patrón ^línea$ en modo multilínea.
+        
+        Args:
+            text (str): Texto a analizar
+            line (str): Contenido de la línea, sin saltos de línea
+            
+        Returns:
+            bool: True si la línea aparece completa
+        """
+        width = len(line)
+        pos = text.find(line)
+        while pos >= 0:
+            end = pos + width
+            if (pos == 0 or text[pos - 1] == '\n') and (end == len(text) or text[end] == '\n'):
+                return True
+            pos = text.find(line, pos + 1)
+        return False
+    
     def _extract_main_text(self, text: str) -> str:
         """
         Extrae el texto principal excluyendo la sección de bibliografía.
         
+        Args:
+            text (str): Texto completo
+            
+        Returns:
+            str: Texto principal sin bibliografía
+        """
+        return self._cached('main_text', text, None, lambda: self._scan_main_text(text))
+    
+    def _scan_main_text(self, text: str) -> str:
+        """
+        Busca el texto principal excluyendo la sección de bibliografía, sin caché.
+        
         Args:
             text (str): Texto completo
             
@@ -304,40 +975,61 @@ class CitationExtractor:
             str: Texto principal sin bibliografía
         """
         # Buscar el inicio de la sección de bibliografía
-        for style, headers in self.bibliography_headers.items():
-            for header in headers:
-                match = re.search(f"(?i)^{header}\\s*$", text, re.MULTILINE)
-                if match:
-                    # Devolver el texto hasta el encabezado de bibliografía
-                    return text[:match.start()]
+        found = self._search_headers(text, self._all_headers_search) if self._may_contain_header(text) else None
+        if found:
+            # Devolver el texto hasta el encabezado de bibliografía
+            return text[:found[1]]
         
         # Si no se encuentra un encabezado claro, buscar patrones típicos
         # que indiquen el inicio de una bibliografía
         
         # Patrón para una entrada bibliográfica APA
-        apa_pattern = r'\n[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?\s\(\d{4}\)\.'
-        match = re.search(apa_pattern, text)
+        match = self._APA_FIRST_ENTRY_RE.search(text)
         if match:
-            # Buscar la línea completa donde comienza esta entrada
-            start_pos = match.start()
-            while start_pos > 0 and text[start_pos-1] != '\n':
-                start_pos -= 1
-            # Retroceder hasta encontrar una línea en blanco o el inicio del texto
-            while start_pos > 0:
-                if text[start_pos:start_pos+2] == '\n\n':
-                    start_pos += 2
-                    break
-                start_pos -= 1
-            
-            return text[:start_pos]
+            return text[:self._block_start(text, match.start())]
         
         # Si no se encuentra bibliografía, devolver el texto completo
         return text
     
+    @staticmethod
+    def _block_start(text: str, pos: int) -> int:
+        """
+        Busca el inicio del bloque de texto (párrafo) que contiene una posición.
+        
+        Retrocede hasta el inicio de la línea y, desde ahí, hasta justo después de la
+        línea en blanco anterior, o hasta el inicio del texto si no la hay.
+        
+        Args:
+            text (str): Texto completo
+            pos (int): Posición dentro del bloque
+            
+        Returns:
+            int: Posición donde empieza el bloque
+        """
+        # Inicio de la línea
+        line_start = text.rfind('\n', 0, pos) + 1
+        # Último "\n\n" que empieza entre la posición 1 y el inicio de la línea
+        blank = text.rfind('\n\n', 1, line_start + 2)
+        return blank + 2 if blank != -1 else 0
+    
     def _extract_bibliography_section(self, text: str, style: str) -> str:
         """
         Extrae la sección de bibliografía del texto.
         
+        Args:
+            text (str): Texto completo
+            style (str): Estilo de citación
+            
+        Returns:
+            str: Sección de bibliografía o cadena vacía si no se encuentra
+        """
+        return self._cached('bibliography', text, style,
+                            lambda: self._scan_bibliography_section(text, style))
+    
+    def _scan_bibliography_section(self, text: str, style: str) -> str:
+        """
+        Busca la sección de bibliografía del texto, sin caché.
+        
         Args:
             text (str): Texto completo
             style (str): Estilo de citación
@@ -346,87 +1038,34 @@ class CitationExtractor:
             str: Sección de bibliografía o cadena vacía si no se encuentra
         """
         # Buscar los encabezados específicos del estilo
-        headers = self.bibliography_headers.get(style, [])
-        if not headers:
+        header_search = self._header_searches.get(style)
+        if header_search is None or not header_search[0]:
             # Si no hay encabezados específicos, usar todos los encabezados conocidos
-            for style_headers in self.bibliography_headers.values():
-                headers.extend(style_headers)
+            header_search = self._all_headers_search
         
-        # Buscar el encabezado en el texto
-        for header in headers:
-            match = re.search(f"(?i)^{header}\\s*$", text, re.MULTILINE)
-            if match:
-                # Extraer desde el encabezado hasta el final
-                bibliography = text[match.start():]
-                
-                # Verificar si hay otro encabezado después que indique
-                # el final de la bibliografía (p.ej., "Apéndices", "Anexos", etc.)
-                next_section = re.search(r'\n\s*[A-Z][A-Za-zÀ-ÿ\s]+\s*\n', bibliography[len(header):])
-                if next_section:
-                    # Limitar la bibliografía hasta el siguiente encabezado
-                    bibliography = bibliography[:len(header) + next_section.start()]
-                
-                return bibliography
+        # Buscar el encabezado en el texto, salvo que ningún encabezado pueda aparecer
+        found = self._search_headers(text, header_search) if self._may_contain_header(text) else None
+        if found:
+            header, header_start = found
+            
+            # Verificar si hay otro encabezado después que indique
+            # el final de la bibliografía (p.ej., "Apéndices", "Anexos", etc.)
+            next_section = self._NEXT_SECTION_RE.search(text, header_start + len(header))
+            if next_section:
+                # Limitar la bibliografía hasta el siguiente encabezado
+                return text[header_start:next_section.start()]
+            
+            # Extraer desde el encabezado hasta el final
+            return text[header_start:]
         
         # Si no se encuentra un encabezado claro, intentar detectar patrones típicos
         # de entradas bibliográficas según el estilo
-        
-        # Para APA
-        if style == 'APA':
-            # Buscar patrones como: Apellido, I. (Año).
-            apa_pattern = r'\n[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?\s\(\d{4}\)\.'
-            matches = list(re.finditer(apa_pattern, text))
-            if matches:
-                # Encontrar la primera coincidencia
-                first_match = matches[0]
+        first_entry = self._FIRST_ENTRY_RES.get(style)
+        if first_entry is not None:
+            first_match = first_entry.search(text)
+            if first_match:
                 # Buscar el inicio real de la bibliografía (línea en blanco anterior)
-                start_pos = first_match.start()
-                while start_pos > 0 and text[start_pos-1] != '\n':
-                    start_pos -= 1
-                # Retroceder hasta encontrar una línea en blanco o el inicio del texto
-                while start_pos > 0:
-                    if text[start_pos:start_pos+2] == '\n\n':
-                        start_pos += 2
-                        break
-                    start_pos -= 1
-                
-                return text[start_pos:]
-        
-        # Para MLA
-        elif style == 'MLA':
-            # Buscar patrones como: Apellido, Nombre.
-            mla_pattern = r'\n[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+\.\s'
-            matches = list(re.finditer(mla_pattern, text))
-            if matches:
-                first_match = matches[0]
-                start_pos = first_match.start()
-                while start_pos > 0 and text[start_pos-1] != '\n':
-                    start_pos -= 1
-                while start_pos > 0:
-                    if text[start_pos:start_pos+2] == '\n\n':
-                        start_pos += 2
-                        break
-                    start_pos -= 1
-                
-                return text[start_pos:]
-        
-        # Para IEEE
-        elif style == 'IEEE':
-            # Buscar patrones como: [1] I. Apellido,
-            ieee_pattern = r'\n\[\d+\]\s[A-Z]\.\s[A-Za-zÀ-ÿ\-]+'
-            matches = list(re.finditer(ieee_pattern, text))
-            if matches:
-                first_match = matches[0]
-                start_pos = first_match.start()
-                while start_pos > 0 and text[start_pos-1] != '\n':
-                    start_pos -= 1
-                while start_pos > 0:
-                    if text[start_pos:start_pos+2] == '\n\n':
-                        start_pos += 2
-                        break
-                    start_pos -= 1
-                
-                return text[start_pos:]
+                return text[self._block_start(text, first_match.start()):]
         
         # No se encontró sección de bibliografía
         return ""
@@ -443,98 +1082,20 @@ class CitationExtractor:
             List[str]: Lista de entradas bibliográficas
         """
         # Eliminar el encabezado de la bibliografía
-        for header in self.bibliography_headers.get(style, []):
-            bib_section = re.sub(f"(?i)^{header}\\s*\n", "", bib_section)
+        for header in self._header_strip_res.get(style, []):
+            bib_section = header.sub("", bib_section)
         
         entries = []
         
         # Diferentes estrategias según el estilo
-        if style == 'APA' or style == 'MLA' or style == 'CHICAGO' or style == 'HARVARD':
-            # Para estilos con formato de autor-fecha o autor-título
-            # Las entradas suelen comenzar con un apellido seguido de coma
-            
-            # Dividir por líneas
-            lines = bib_section.split('\n')
-            current_entry = ""
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    # Línea vacía marca el final de una entrada
-                    if current_entry.strip():
-                        entries.append(current_entry.strip())
-                        current_entry = ""
-                elif re.match(r'^[A-Za-zÀ-ÿ\-]+,', line):
-                    # Línea que comienza con apellido y coma, posible inicio de nueva entrada
-                    if current_entry.strip():
-                        entries.append(current_entry.strip())
-                    current_entry = line
-                else:
-                    # Continuación de la entrada actual
-                    current_entry += " " + line
-            
-            # Añadir la última entrada si existe
-            if current_entry.strip():
-                entries.append(current_entry.strip())
-        
-        elif style == 'IEEE' or style == 'VANCOUVER':
-            # Para estilos con entradas numeradas
-            
-            # Dividir por líneas
-            lines = bib_section.split('\n')
-            current_entry = ""
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    # Línea vacía marca el final de una entrada
-                    if current_entry.strip():
-                        entries.append(current_entry.strip())
-                        current_entry = ""
-                elif re.match(r'^\[\d+\]|\d+\.', line):
-                    # Línea que comienza con número entre corchetes o número seguido de punto
-                    if current_entry.strip():
-                        entries.append(current_entry.strip())
-                    current_entry = line
-                else:
-                    # Continuación de la entrada actual
-                    current_entry += " " + line
-            
-            # Añadir la última entrada si existe
-            if current_entry.strip():
-                entries.append(current_entry.strip())
-        
-        elif style == 'CSE':
-            # Para CSE, similar a Vancouver pero con formato específico
-            
-            # Dividir por líneas
-            lines = bib_section.split('\n')
-            current_entry = ""
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    # Línea vacía marca el final de una entrada
-                    if current_entry.strip():
-                        entries.append(current_entry.strip())
-                        current_entry = ""
-                elif re.match(r'^\[\d+\]|\d+\.|\w+\s\w+\s\d{4}\.', line):
-                    # Inicio de nueva entrada (por número o autor año)
-                    if current_entry.strip():
-                        entries.append(current_entry.strip())
-                    current_entry = line
-                else:
-                    # Continuación de la entrada actual
-                    current_entry += " " + line
-            
-            # Añadir la última entrada si existe
-            if current_entry.strip():
-                entries.append(current_entry.strip())
+        entry_start = self._ENTRY_START_RES.get(style)
+        if entry_start is not None:
+            entries = self._accumulate_entries(bib_section.splitlines(), entry_start)
         
         else:
             # Método genérico para cualquier estilo no reconocido
             # Intentar dividir por líneas en blanco
-            raw_entries = re.split(r'\n\s*\n', bib_section)
+            raw_entries = self._BLANK_LINE_SPLIT_RE.split(bib_section)
             for entry in raw_entries:
                 entry = entry.strip()
                 if entry:
@@ -542,6 +1103,41 @@ class CitationExtractor:
         
         return entries
     
+    @staticmethod
+    def _accumulate_entries(lines: Iterable[str], entry_start: re.Pattern) -> List[str]:
+        """
+        Agrupa líneas en entradas bibliográficas. Una línea en blanco o una línea que
+        empieza como una entrada nueva cierran la entrada actual; el resto de líneas
+        la continúan.
+        
+        Args:
+            lines (Iterable[str]): Líneas de la sección de bibliografía
+            entry_start (re.Pattern): Patrón que reconoce el inicio de una entrada
+            
+        Returns:
+            List[str]: Lista de entradas bibliográficas
+        """
+        entries = []
+        current = []
+        starts_entry = entry_start.match
+        
+        for line in map(str.strip, lines):
+            if not line:
+                if current:
+                    entries.append(" ".join(current))
+                    current.clear()
+                continue
+            
+            if current and starts_entry(line):
+                entries.append(" ".join(current))
+                current.clear()
+            current.append(line)
+        
+        if current:
+            entries.append(" ".join(current))
+        
+        return entries
+    
     def _is_valid_citation(self, citation: str, style: str, citation_type: str) -> bool:
         """
         Verifica si una cita es válida según criterios básicos.
@@ -554,73 +1150,123 @@ class CitationExtractor:
         Returns:
             bool: True si la cita es válida, False en caso contrario
         """
-        # Longitud mínima
-        if len(citation) < 3:
-            return False
+        return self._validator(style, citation_type)(citation)
+    
+    def _validator(self, style: str, citation_type: str):
+        """
+        Obtiene la función que valida las citas de un estilo y tipo.
         
-        # Para citas en texto
+        Args:
+            style (str): Estilo de citación
+            citation_type (str): Tipo de cita ('in_text', 'bibliography')
+            
+        Returns:
+            Función que recibe el texto de la cita y devuelve si es válida
+        """
+        validator = self._validators.get((style, citation_type))
+        if validator is not None:
+            return validator
         if citation_type == 'in_text':
-            # Verificar estructuras comunes según el estilo
-            if style == 'APA':
-                # Debe contener un año de 4 dígitos
-                if not re.search(r'\d{4}', citation):
-                    return False
-                # Para citas parentéticas, debe tener paréntesis balanceados
-                if citation.startswith('(') and not citation.endswith(')'):
-                    return False
-            
-            elif style == 'MLA':
-                # Debe contener un número de página para la mayoría de citas
-                if '(' in citation and ')' in citation and not re.search(r'\d+', citation):
-                    return False
-            
-            elif style == 'CHICAGO_AUTHOR_DATE' or style == 'CHICAGO':
-                # Similares a APA
-                if not re.search(r'\d{4}', citation):
-                    return False
-                # Para citas parentéticas, debe tener paréntesis balanceados
-                if citation.startswith('(') and not citation.endswith(')'):
-                    return False
-            
-            elif style == 'IEEE' or style == 'VANCOUVER':
-                # Debe contener un número
-                if not re.search(r'\d+', citation):
-                    return False
-            
-            # Longitud máxima razonable para una cita en texto
-            if len(citation) > 100:
-                return False
-        
-        # Para bibliografía
-        elif citation_type == 'bibliography':
-            # Criterios generales para entradas bibliográficas
-            
-            # Debe terminar con un signo de puntuación
-            if not re.search(r'[.!?]$', citation):
-                return False
-            
-            # Debe contener un año en la mayoría de estilos (excepto algunos casos MLA)
-            if style != 'MLA' and not re.search(r'\d{4}', citation):
-                return False
-            
-            # Para IEEE y Vancouver, debe comenzar con un número
-            if (style == 'IEEE' or style == 'VANCOUVER') and not re.search(r'^\[\d+\]|\d+\.', citation):
-                return False
-            
-            # Para otros estilos, debe comenzar con apellido y coma
-            if style in ['APA', 'MLA', 'CHICAGO', 'HARVARD'] and not re.search(r'^[A-Za-zÀ-ÿ\-]+,', citation):
-                return False
-            
-            # Longitud mínima para una entrada bibliográfica
-            if len(citation) < 20:
-                return False
-            
-            # Máximo razonable para evitar texto completo
-            if len(citation) > 1000:
-                return False
+            return self._validate_in_text_length
+        if citation_type == 'bibliography':
+            return self._default_bibliography_validator
+        return self._validate_min_length
+    
+    @staticmethod
+    def _validate_min_length(citation: str) -> bool:
+        """
+        Valida la longitud mínima de una cita.
         
+        Args:
+            citation (str): Texto de la cita
+            
+        Returns:
+            bool: True si la cita tiene al menos 3 caracteres
+        """
+        return len(citation) >= 3
+    
+    @staticmethod
+    def _validate_in_text_length(citation: str) -> bool:
+        """
+        Valida la longitud de una cita en texto, entre la mínima y una máxima
+        razonable.
+        
+        Args:
+            citation (str): Texto de la cita
+            
+        Returns:
+            bool: True si la cita tiene entre 3 y 100 caracteres
+        """
+        return 3 <= len(citation) <= 100
+    
+    @classmethod
+    def _validate_author_date_in_text(cls, citation: str) -> bool:
+        """
+        Valida una cita en texto autor-fecha (APA, Chicago): debe contener un año de
+        4 dígitos y, si es parentética, tener paréntesis balanceados.
+        
+        Args:
+            citation (str): Texto de la cita
+            
+        Returns:
+            bool: True si la cita es válida, False en caso contrario
+        """
+        if not 3 <= len(citation) <= 100:
+            return False
+        if citation.startswith('(') and not citation.endswith(')'):
+            return False
+        return cls._YEAR_RE.search(citation) is not None
+    
+    @classmethod
+    def _validate_mla_in_text(cls, citation: str) -> bool:
+        """
+        Valida una cita en texto MLA: entre paréntesis debe contener un número de
+        página.
+        
+        Args:
+            citation (str): Texto de la cita
+            
+        Returns:
+            bool: True si la cita es válida, False en caso contrario
+        """
+        if not 3 <= len(citation) <= 100:
+            return False
+        if '(' in citation and ')' in citation:
+            return cls._DIGIT_RE.search(citation) is not None
         return True
     
+    @classmethod
+    def _validate_numeric_in_text(cls, citation: str) -> bool:
+        """
+        Valida una cita en texto numérica (IEEE, Vancouver): debe contener un número.
+        
+        Args:
+            citation (str): Texto de la cita
+            
+        Returns:
+            bool: True si la cita es válida, False en caso contrario
+        """
+        return 3 <= len(citation) <= 100 and cls._DIGIT_RE.search(citation) is not None
+    
+    @staticmethod
+    def _bibliography_validator(validator_re: re.Pattern):
+        """
+        Crea la función que valida entradas bibliográficas con la forma de un estilo.
+        
+        Args:
+            validator_re (re.Pattern): Patrón con la forma de una entrada del estilo
+            
+        Returns:
+            Función que recibe la entrada y devuelve si es válida: con una longitud
+            razonable (ni fragmentos ni texto completo) y con la forma del estilo
+        """
+        matches = validator_re.match
+        
+        def validate(citation: str) -> bool:
+            return 20 <= len(citation) <= 1000 and matches(citation) is not None
+        
+        return validate
+    
     def extract_citation_metadata(self, citation: str, style: str, citation_type: str) -> Dict[str, Any]:
         """
         Extrae metadatos estructurados de una cita.
@@ -633,93 +1279,57 @@ class CitationExtractor:
         Returns:
             Dict[str, Any]: Metadatos extraídos (autor, año, título, etc.)
         """
-        metadata = {}
+        key = (citation, style, citation_type)
+        cache = self._metadata_cache
+        if key in cache:
+            cache.move_to_end(key)
+        else:
+            cache[key] = self._parse_citation_metadata(citation, style, citation_type)
+            if len(cache) > self._METADATA_CACHE_SIZE:
+                cache.popitem(last=False)
         
-        # Para citas en texto
-        if citation_type == 'in_text':
-            if style == 'APA':
-                # Cita parentética: (Autor, año, p. XX)
-                match = re.search(r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?),\s(?P<year>\d{4})(?:,\s(?P<page>p\.?\s\d+(?:-\d+)?))?\)', citation)
-                if match:
-                    metadata.update(match.groupdict())
-                else:
-                    # Cita narrativa: Autor (año, p. XX)
-                    match = re.search(r'(?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s\((?P<year>\d{4})(?:,\s(?P<page>p\.?\s\d+(?:-\d+)?))?\)', citation)
-                    if match:
-                        metadata.update(match.groupdict())
-            
-            elif style == 'MLA':
-                # Cita parentética: (Autor página)
-                match = re.search(r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s(?P<page>\d+(?:-\d+)?)\)', citation)
-                if match:
-                    metadata.update(match.groupdict())
-                else:
-                    # Cita narrativa: Autor (página)
-                    match = re.search(r'(?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s\((?P<page>\d+(?:-\d+)?)\)', citation)
-                    if match:
-                        metadata.update(match.groupdict())
-            
-            elif style == 'CHICAGO' or style == 'CHICAGO_AUTHOR_DATE':
-                # Cita autor-fecha: (Autor año, página)
-                match = re.search(r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s(?P<year>\d{4})(?:,\s(?P<page>\d+(?:-\d+)?))?\)', citation)
-                if match:
-                    metadata.update(match.groupdict())
-                else:
-                    # Cita narrativa: Autor (año, página)
-                    match = re.search(r'(?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s\((?P<year>\d{4})(?:,\s(?P<page>\d+(?:-\d+)?))?\)', citation)
-                    if match:
-                        metadata.update(match.groupdict())
-            
-            elif style == 'HARVARD':
-                # Cita parentética: (Autor, año: página)
-                match = re.search(r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?),\s(?P<year>\d{4})(?::\s(?P<page>\d+(?:-\d+)?))?\)', citation)
-                if match:
-                    metadata.update(match.groupdict())
-                else:
-                    # Cita narrativa: Autor (año: página)
-                    match = re.search(r'(?P<author>[A-Za-zÀ-ÿ\-]+(?: [A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s\((?P<year>\d{4})(?::\s(?P<page>\d+(?:-\d+)?))?\)', citation)
-                    if match:
-                        metadata.update(match.groupdict())
-            
-            elif style == 'IEEE' or style == 'VANCOUVER':
-                # Cita numérica: [1] o (1)
-                match = re.search(r'[\[\(](?P<number>\d+)[\]\)]', citation)
-                if match:
-                    metadata['number'] = match.group('number')
+        # Copia para que el llamador pueda modificar el resultado sin alterar la caché
+        return dict(cache[key])
+    
+    def _parse_citation_metadata(self, citation: str, style: str, citation_type: str) -> Dict[str, Any]:
+        """
+        Aplica los patrones de metadatos del estilo y tipo de cita (sin caché).
         
-        # Para bibliografía
-        elif citation_type == 'bibliography':
-            if style == 'APA':
-                # Libro: Apellido, I. (Año). Título. Editorial.
-                match = re.search(r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s(?:[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?))*((?:,|\s)&\s(?:[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?))?\s\((?P<year>\d{4})\)\.\s(?P<title>[^\.]+)\.\s(?P<publisher>[^\.]+)', citation)
-                if match:
-                    metadata.update(match.groupdict())
-                else:
-                    # Artículo: Apellido, I. (Año). Título del artículo. Revista, vol(num), pp-pp.
-                    match = re.search(r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s(?:[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?))*((?:,|\s)&\s(?:[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?))?\s\((?P<year>\d{4})\)\.\s(?P<title>[^\.]+)\.\s(?P<journal>[^,]+),\s(?P<volume>\d+)(?:\((?P<issue>\d+)\))?,\s(?P<pages>\d+-\d+)', citation)
-                    if match:
-                        metadata.update(match.groupdict())
-                        metadata['type'] = 'article'
-                    else:
-                        metadata['type'] = 'book'
+        Args:
+            citation (str): Texto de la cita
+            style (str): Estilo de citación
+            citation_type (str): Tipo de cita ('in_text', 'bibliography')
             
-            elif style == 'MLA':
-                # Libro: Apellido, Nombre. Título. Editorial, Año.
-                match = re.search(r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\s\-]+)(?:,\s(?:[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\s\-]+))*(?:,? and (?:[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\s\-]+))?\.\s(?P<title>[^\.]+)\.\s(?P<publisher>[^,]+),\s(?P<year>\d{4})', citation)
-                if match:
-                    metadata.update(match.groupdict())
-                    metadata['type'] = 'book'
-                else:
-                    # Artículo: Apellido, Nombre. "Título del artículo." Revista, vol. num, año, pp. xx-xx.
-                    match = re.search(r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\s\-]+)(?:,\s(?:[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\s\-]+))*(?:,? and (?:[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\s\-]+))?\.\s"(?P<title>[^"]+)\."\s(?P<journal>[^,]+),\svol\.\s(?P<volume>\d+)(?:,\sno\.\s(?P<issue>\d+))?,\s(?P<year>\d{4}),\s(?:pp\.|p\.)\s(?P<pages>\d+-\d+)', citation)
-                    if match:
-                        metadata.update(match.groupdict())
-                        metadata['type'] = 'article'
-        
-        # Limpiar valores None
-        metadata = {k: v for k, v in metadata.items() if v is not None}
+        Returns:
+            Dict[str, Any]: Metadatos extraídos
+        """
+        # Probar los patrones del estilo y tipo de cita hasta que uno coincida
+        for pattern, extra in self._METADATA_PATTERNS.get((style, citation_type), ()):
+            match = pattern.search(citation)
+            if match:
+                metadata = match.groupdict()
+                
+                # Patrón con una rama por tipo de obra: la rama coincidente se cierra la
+                # última y sus grupos sustituyen a los de las demás
+                branch = self._METADATA_BRANCHES.get(match.lastgroup)
+                if branch is not None:
+                    aliases = self._METADATA_GROUP_ALIASES
+                    metadata = {
+                        aliases.get(k, k): v for k, v in metadata.items()
+                        if v is not None and k not in self._METADATA_BRANCHES
+                    }
+                    metadata.update(branch)
+                    return metadata
+                
+                # Limpiar valores None (solo los grupos opcionales que no participaron)
+                if None in metadata.values():
+                    metadata = {k: v for k, v in metadata.items() if v is not None}
+                
+                if extra:
+                    metadata.update(extra)
+                return metadata
         
-        return metadata
+        return dict(self._METADATA_FALLBACKS.get((style, citation_type), {}))
     
     def extract_citation_graph(self, text: str, style: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -741,8 +1351,10 @@ class CitationExtractor:
         # Extraer todas las citas
         citations = self.extract_all_citations(text, style)
         
-        # Extraer metadatos de cada cita en texto
+        # Extraer metadatos de cada cita en texto y, de paso, su autor simplificado y
+        # su año para la comparación (None si no tiene ninguno de los dos)
         in_text_nodes = []
+        in_text_keys = []
         for citation in citations['en_texto']:
             metadata = self.extract_citation_metadata(citation, style, 'in_text')
             in_text_nodes.append({
@@ -750,37 +1362,50 @@ class CitationExtractor:
                 'metadata': metadata,
                 'type': 'in_text'
             })
-        
-        # Extraer metadatos de cada entrada bibliográfica
+            author = metadata.get('author', '')
+            year = metadata.get('year', '')
+            in_text_keys.append((self._in_text_author_key(author), year) if author or year else None)
+        
+        # Extraer metadatos de cada entrada bibliográfica y preparar una vez sus datos
+        # de comparación, agrupados por año: salvo en MLA, una cita solo puede
+        # corresponder a entradas de su mismo año. Una entrada repetida se enlaza con
+        # su primera aparición.
         bib_nodes = []
-        for citation in citations['bibliograficas']:
+        bib_candidates = []
+        bib_candidates_by_year = defaultdict(list)
+        first_bib_idx = {}
+        for bib_idx, citation in enumerate(citations['bibliograficas']):
             metadata = self.extract_citation_metadata(citation, style, 'bibliography')
             bib_nodes.append({
                 'text': citation,
                 'metadata': metadata,
                 'type': 'bibliography'
             })
+            candidate = (first_bib_idx.setdefault(citation, bib_idx), citation) + \
+                self._bib_author_key(metadata.get('author', ''))
+            bib_candidates.append(candidate)
+            bib_candidates_by_year[metadata.get('year', '')].append(candidate)
         
         # Establecer relaciones entre citas
         edges = []
-        for in_text in in_text_nodes:
-            # Extraer autor y año (si están disponibles)
-            author = in_text['metadata'].get('author', '')
-            year = in_text['metadata'].get('year', '')
-            
-            if author or year:
-                for bib in bib_nodes:
-                    bib_author = bib['metadata'].get('author', '')
-                    bib_year = bib['metadata'].get('year', '')
-                    
-                    # Comprobar si la cita en texto corresponde a esta entrada bibliográfica
-                    if self._is_matching_citation(author, year, bib_author, bib_year, style):
-                        edges.append({
-                            'source': in_text['text'],
-                            'target': bib['text'],
-                            'source_idx': in_text_nodes.index(in_text),
-                            'target_idx': bib_nodes.index(bib)
-                        })
+        match_by_year = style != 'MLA'
+        for in_text_idx, (citation, key) in enumerate(zip(citations['en_texto'], in_text_keys)):
+            if key is None:
+                continue
+            author_simple, year = key
+            candidates = bib_candidates_by_year.get(year, ()) if match_by_year else bib_candidates
+            # Una arista por cada entrada bibliográfica que corresponde a la cita en texto
+            # (como en _is_matching_citation)
+            edges.extend([
+                {
+                    'source': citation,
+                    'target': bib_citation,
+                    'source_idx': in_text_idx,
+                    'target_idx': bib_idx
+                }
+                for bib_idx, bib_citation, bib_author_simple, bib_surname in candidates
+                if author_simple in bib_author_simple or bib_surname in author_simple
+            ])
         
         return {
             'in_text_nodes': in_text_nodes,
@@ -788,45 +1413,68 @@ class CitationExtractor:
             'edges': edges
         }
     
-    def _is_matching_citation(self, author: str, year: str, 
-                           bib_author: str, bib_year: str, style: str) -> bool:
+    def _is_matching_citation(self, in_text_key: Tuple[str, str],
+                           bib_key: Tuple[str, str, str], style: str) -> bool:
         """
         Determina si una cita en texto corresponde a una entrada bibliográfica.
         
+        Las claves se calculan una sola vez por cita y por entrada (ver
+        _in_text_author_key y _bib_author_key), no en cada comparación.
+        
         Args:
-            author (str): Autor en la cita en texto
-            year (str): Año en la cita en texto
-            bib_author (str): Autor en la entrada bibliográfica
-            bib_year (str): Año en la entrada bibliográfica
+            in_text_key (Tuple[str, str]): Autor simplificado y año de la cita en texto
+            bib_key (Tuple[str, str, str]): Autor simplificado, apellido principal y
+                año de la entrada bibliográfica
             style (str): Estilo de citación
             
         Returns:
             bool: True si hay correspondencia, False en caso contrario
         """
+        author_simple, year = in_text_key
+        bib_author_simple, bib_surname, bib_year = bib_key
+        
         # Si la cita no tiene autor ni año, no podemos emparejarla
-        if not author and not year:
+        if not author_simple and not year:
             return False
         
-        # Simplificar nombres para comparación
-        author_simple = author.lower().replace('et al.', '').strip()
-        bib_author_simple = bib_author.lower().strip()
+        # Salvo en MLA (solo autor), el año debe coincidir: es la comprobación más barata
+        if style != 'MLA' and year != bib_year:
+            return False
+        
+        return author_simple in bib_author_simple or bib_surname in author_simple
+    
+    @staticmethod
+    def _in_text_author_key(author: str) -> str:
+        """
+        Simplifica el autor de una cita en texto para compararlo con la bibliografía.
         
-        # Extraer apellido principal de bib_author (antes de la primera coma)
+        Args:
+            author (str): Autor en la cita en texto
+            
+        Returns:
+            str: Autor en minúsculas y sin "et al."
+        """
+        return author.lower().replace('et al.', '').strip()
+    
+    @staticmethod
+    def _bib_author_key(bib_author: str) -> Tuple[str, str]:
+        """
+        Simplifica el autor de una entrada bibliográfica para compararlo con las citas
+        en texto.
+        
+        Args:
+            bib_author (str): Autor en la entrada bibliográfica
+            
+        Returns:
+            Tuple[str, str]: Autor en minúsculas y apellido principal (antes de la
+            primera coma o, sin comas, la primera palabra)
+        """
+        bib_author_simple = bib_author.lower().strip()
         if ',' in bib_author_simple:
             bib_surname = bib_author_simple.split(',')[0].strip()
         else:
             bib_surname = bib_author_simple.split()[0].strip() if bib_author_simple else ""
-        
-        # En MLA, solo comparamos autor
-        if style == 'MLA':
-            # Verificar si el autor de la cita está en el autor bibliográfico
-            return author_simple in bib_author_simple or bib_surname in author_simple
-        
-        # Para otros estilos, verificar autor y año
-        author_match = author_simple in bib_author_simple or bib_surname in author_simple
-        year_match = year == bib_year
-        
-        return author_match and year_match
+        return bib_author_simple, bib_surname
     
     def identify_style_markers(self, text: str) -> Dict[str, Dict[str, int]]:
         """
@@ -848,58 +1496,95 @@ class CitationExtractor:
             'CSE': {'in_text': 0, 'bibliography': 0, 'headers': 0, 'specific': 0}
         }
         
-        # Verificar encabezados
-        for style, headers in self.bibliography_headers.items():
+        # Verificar encabezados (cada encabezado distinto se busca una sola vez)
+        found_headers = self._found_headers(text)
+        for style, headers in self._header_res.items():
             for header in headers:
-                if re.search(header, text, re.IGNORECASE | re.MULTILINE):
+                if header.pattern in found_headers:
                     markers[style]['headers'] += 1
         
         # Verificar marcadores específicos por estilo
         
         # APA: uso de "&" en citas parentéticas
-        if re.search(r'\([A-Za-zÀ-ÿ\-]+ & [A-Za-zÀ-ÿ\-]+,', text):
+        if self._MARKER_APA_AMP_RE.search(text):
             markers['APA']['specific'] += 1
         
         # APA: formato de fecha con p.
-        if re.search(r'\d{4}, p\. \d+', text):
+        if self._has_year_page(text, self._MARKER_APA_P_SEPARATOR):
             markers['APA']['specific'] += 1
         
         # MLA: uso de "and" en lugar de "&"
-        if re.search(r'\([A-Za-zÀ-ÿ\-]+ and [A-Za-zÀ-ÿ\-]+ \d+', text):
+        if self._MARKER_MLA_AND_RE.search(text):
             markers['MLA']['specific'] += 1
         
         # MLA: páginas sin "p."
-        if re.search(r'\([A-Za-zÀ-ÿ\-]+ \d+\)', text):
+        if self._MARKER_MLA_PAGES_RE.search(text):
             markers['MLA']['specific'] += 1
         
         # Chicago: sistema de notas
-        footnote_count = len(re.findall(r'^\d+\.\s', text, re.MULTILINE))
-        if footnote_count > 0:
-            markers['CHICAGO']['specific'] += min(footnote_count, 5)  # Limitar a 5 máximo
+        markers['CHICAGO']['specific'] += self._count_matches(
+            self._MARKER_CHICAGO_FOOTNOTE_RE, text, 5)  # Limitar a 5 máximo
         
         # Chicago: términos latinos (Ibid., Op. cit.)
-        latin_count = len(re.findall(r'Ibid\.|Op\. cit\.|Loc\. cit\.', text))
-        if latin_count > 0:
-            markers['CHICAGO']['specific'] += min(latin_count, 3)  # Limitar a 3 máximo
+        markers['CHICAGO']['specific'] += self._count_matches(
+            self._MARKER_CHICAGO_LATIN_RE, text, 3)  # Limitar a 3 máximo
         
         # Harvard: uso de dos puntos para páginas
-        if re.search(r'\d{4}: \d+', text):
+        if self._has_year_page(text, self._MARKER_HARVARD_COLON_SEPARATOR):
             markers['HARVARD']['specific'] += 1
         
         # IEEE: citas numéricas entre corchetes
-        bracket_count = len(re.findall(r'\[\d+\]', text))
-        if bracket_count > 0:
-            markers['IEEE']['specific'] += min(bracket_count, 5)  # Limitar a 5 máximo
+        markers['IEEE']['specific'] += self._count_matches(
+            self._MARKER_IEEE_BRACKET_RE, text, 5)  # Limitar a 5 máximo
         
         # Vancouver: citas numéricas entre paréntesis
-        if re.search(r'\(\d+\)', text):
+        if self._MARKER_VANCOUVER_PAREN_RE.search(text):
             markers['VANCOUVER']['specific'] += 1
         
         # CSE: formato específico de nombre-año
-        if re.search(r'[A-Za-zÀ-ÿ\-]+ [A-Z]{1,2}\. \d{4}\.', text):
+        if self._marker_cse_re.search(text):
             markers['CSE']['specific'] += 1
         
         return markers
+    
+    @staticmethod
+    def _has_year_page(text: str, separator: str) -> bool:
+        """
+        Indica si el texto contiene el separador precedido de cuatro dígitos y
+        seguido de un dígito. Buscar el separador con str.find y comprobar los
+        dígitos alrededor es más rápido que una expresión regular que empieza por
+        \\d, que el motor tiene que probar en cada posición.
+        
+        Args:
+            text (str): Texto a analizar
+            separator (str): Separador entre año y página
+            
+        Returns:
+            bool: True si hay al menos una coincidencia
+        """
+        width = len(separator)
+        pos = text.find(separator, 4)
+        while pos >= 0:
+            # isdecimal acepta los mismos dígitos que \d
+            if text[pos - 4:pos].isdecimal() and text[pos + width:pos + width + 1].isdecimal():
+                return True
+            pos = text.find(separator, pos + 1)
+        return False
+    
+    @staticmethod
+    def _count_matches(pattern: Any, text: str, limit: int) -> int:
+        """
+        Cuenta las coincidencias de un patrón, dejando de buscar al llegar al límite.
+        
+        Args:
+            pattern (Any): Patrón compilado
+            text (str): Texto a analizar
+            limit (int): Número máximo de coincidencias a contar
+            
+        Returns:
+            int: Número de coincidencias, como mucho limit
+        """
+        return sum(1 for _ in islice(pattern.finditer(text), limit))
 
 
 # Ejemplo de uso
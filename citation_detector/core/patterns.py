@@ -4,7 +4,237 @@
 # Patrones de expresiones regulares para la detección de estilos de citación
 
 import re
-from typing import Dict, List, Pattern, Union
+import threading
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Pattern, Tuple, Union
+
+# Intentar importar re2 si está disponible
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# Sin registro de errores de re2: los patrones que no admite se usan con re
+_RE2_OPTIONS = None
+if RE2_AVAILABLE and hasattr(re2, 'Options'):
+    _RE2_OPTIONS = re2.Options()
+    _RE2_OPTIONS.log_errors = False
+
+# Intentar importar pcre2 (PCRE2 con compilación JIT) si está disponible
+try:
+    import pcre2
+    PCRE2_AVAILABLE = True
+except ImportError:
+    PCRE2_AVAILABLE = False
+
+# Intentar importar pyahocorasick si está disponible
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Equivalentes en re2 de las clases de re, que en cadenas son Unicode: \s son los
+# caracteres de str.isspace() (aquí sin corchetes, para usarlos también dentro de
+# una clase) y \d los dígitos decimales (categoría Nd)
+_RE2_WHITESPACE_CHARS = r'\t\n\x{b}\x{c}\r\x{1c}-\x{1f} \x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}'
+_RE2_DIGIT = r'\p{Nd}'
+_RE2_TOKEN_RE = re.compile(r'\\u[0-9A-Fa-f]{4}|\\.|\(\?.?|.', re.DOTALL)
+# re2 trabaja con UTF-8, que no admite sustitutos sueltos
+_SURROGATE_RE = re.compile('[\ud800-\udfff]')
+
+
+class Re2Pattern:
+    """
+    Patrón compilado con re2, que recorre el texto en tiempo lineal sin retroceder,
+    con un patrón equivalente de re (o regex) para los textos que re2 no puede
+    codificar. Ofrece los métodos de búsqueda de re.Pattern que usa el paquete.
+    """
+    
+    __slots__ = ('pattern', 'fallback', '_re2')
+    
+    def __init__(self, compiled: Any, fallback: Any):
+        self.pattern = fallback.pattern
+        self.fallback = fallback
+        self._re2 = compiled
+    
+    def _engine(self, text: str) -> Any:
+        if text.isascii() or _SURROGATE_RE.search(text) is None:
+            return self._re2
+        return self.fallback
+    
+    def search(self, text: str, pos: int = 0):
+        return self._engine(text).search(text, pos)
+    
+    def match(self, text: str, pos: int = 0):
+        return self._engine(text).match(text, pos)
+    
+    def finditer(self, text: str, pos: int = 0):
+        return self._engine(text).finditer(text, pos)
+    
+    def findall(self, text: str, pos: int = 0):
+        return self._engine(text).findall(text, pos)
+
+
+def re2_source(pattern: str, multiline: bool = False) -> Optional[str]:
+    """
+    Traduce un patrón de re a la sintaxis de re2 con el mismo comportamiento.
+    
+    Solo se traducen patrones sin indicadores en línea, aserciones ni referencias
+    (ni "$" fuera del modo multilínea, donde re también lo acepta antes de un salto
+    de línea final); \\s, \\d y \\uXXXX se reescriben con sus equivalentes Unicode.
+    
+    Args:
+        pattern (str): Patrón de re
+        multiline (bool): Si el patrón se usa en modo multilínea
+        
+    Returns:
+        Optional[str]: El patrón para re2, o None si no se puede traducir
+    """
+    translated = []
+    in_class = False
+    for token in _RE2_TOKEN_RE.findall(pattern):
+        if token.startswith('\\u'):
+            token = f'\\x{{{token[2:]}}}'
+        elif token == '\\d':
+            token = _RE2_DIGIT
+        elif token == '\\s':
+            token = _RE2_WHITESPACE_CHARS if in_class else f'[{_RE2_WHITESPACE_CHARS}]'
+        elif token[0] == '\\' and token[1:].isalnum():
+            # \w, \b, \S, referencias...
+            return None
+        elif token == '[' and not in_class:
+            in_class = True
+        elif token == ']' and in_class:
+            in_class = False
+        elif not in_class and ((token == '$' and not multiline)
+                               or (token.startswith('(?') and token not in ('(?:', '(?P'))):
+            return None
+        translated.append(token)
+    return ''.join(translated)
+
+
+def compile_re2(pattern: str, fallback: Any = None, multiline: bool = False) -> Optional[Re2Pattern]:
+    """
+    Compila un patrón de re con re2, con las mismas coincidencias que re, si re2 está
+    disponible y el patrón se puede traducir (ver re2_source).
+    
+    Args:
+        pattern (str): Patrón de re como cadena
+        fallback (Any, optional): El patrón ya compilado con re (o regex); si no se
+            da, se compila con re
+        multiline (bool): Si el patrón se usa en modo multilínea
+        
+    Returns:
+        Optional[Re2Pattern]: El patrón compilado, o None si no se puede usar re2
+    """
+    if not RE2_AVAILABLE:
+        return None
+    source = re2_source(pattern, multiline)
+    if source is None:
+        return None
+    if fallback is None:
+        fallback = re.compile(pattern, re.MULTILINE if multiline else 0)
+    if multiline:
+        source = '(?m)' + source
+    try:
+        return Re2Pattern(re2.compile(source, _RE2_OPTIONS), fallback)
+    except re2.error:
+        return None
+
+# Fragmentos comunes de los patrones: apellido, autor (uno o dos apellidos), año y
+# página con "p."
+_SURNAME = r'[A-Za-zÀ-ÿ\-]+'
+_AUTHOR = rf'{_SURNAME}(?:\s{_SURNAME})?'
+_YEAR = r'\d{4}'
+_PAGE = r'p\.?\s\d+(?:-\d+)?'
+
+# Bloques de autores (y año) con los que empiezan varias variantes de bibliografía
+# de un estilo. Solo se pueden leer de una manera, así que las alternancias de cada
+# estilo los recorren una sola vez para todas sus variantes (ver _compile_union)
+_APA_AUTHORS = (
+    rf'^(?P<author>{_SURNAME},\s[A-Z]\.(?:\s[A-Z]\.)?)'  # Autor principal
+    rf'(?:,\s{_SURNAME},\s[A-Z]\.(?:\s[A-Z]\.)?)*'  # Autores adicionales (opcional)
+    rf'(?:,?\s&\s{_SURNAME},\s[A-Z]\.(?:\s[A-Z]\.)?)?'  # Último autor con & (opcional)
+)
+_APA_AUTHORS_YEAR = _APA_AUTHORS + rf'\s\((?P<year>{_YEAR})\)\.\s'
+_HARVARD_AUTHORS_YEAR = (
+    rf'^(?P<author>{_SURNAME},\s[A-Z]\.(?:\s[A-Z]\.)?)'  # Autor principal
+    rf'(?:,\s{_SURNAME},\s[A-Z]\.(?:\s[A-Z]\.)?)*'  # Autores adicionales (opcional)
+    rf'(?:\sand\s{_SURNAME},\s[A-Z]\.(?:\s[A-Z]\.)?)?'  # Último autor (opcional)
+    rf'\s\((?P<year>{_YEAR})\)'  # Año
+)
+_VANCOUVER_AUTHORS = (
+    r'^(?P<ref_num>\d+\.\s)?'  # Número de referencia (opcional)
+    rf'(?P<author>{_SURNAME}\s[A-Z]{{1,2}})'  # Primer autor
+    rf'(?:,\s{_SURNAME}\s[A-Z]{{1,2}})*'  # Autores adicionales
+    r'(?:,\set\sal)?'  # "et al" para muchos autores
+)
+_CSE_AUTHORS_YEAR = (
+    rf'^(?P<author>{_SURNAME}\s[A-Z]{{1,2}})'  # Primer autor
+    rf'(?:,\s{_SURNAME}\s[A-Z]{{1,2}})*'  # Autores adicionales
+    r'(?:,\set\sal)?'  # "et al" para muchos autores
+    rf'\.\s(?P<year>{_YEAR})\.'  # Año
+)
+
+
+class _LazyCompileDict(MutableMapping):
+    """
+    Diccionario de patrones compilados por estilo (o categoría) que compila cada
+    entrada a partir de sus fuentes la primera vez que se pide, para no pagar al crear
+    la instancia la compilación de estilos que no se van a usar.
+    """
+    
+    def __init__(self, sources: Dict[str, Any], compile_value: Callable[[str, Any], Any]):
+        """
+        Args:
+            sources (Dict[str, Any]): Patrones como cadenas por clave; se consultan en
+                cada acceso, así que las claves nuevas quedan disponibles
+            compile_value (Callable[[str, Any], Any]): Compila las fuentes de una clave,
+                que recibe junto con la clave
+        """
+        self._sources = sources
+        self._compile_value = compile_value
+        self._compiled = {}
+    
+    def __getitem__(self, key):
+        try:
+            return self._compiled[key]
+        except KeyError:
+            pass
+        # Si dos hilos compilan la misma clave a la vez, ambos obtienen un resultado
+        # equivalente y basta con quedarse con uno
+        value = self._compiled[key] = self._compile_value(key, self._sources[key])
+        return value
+    
+    def __setitem__(self, key, value):
+        self._compiled[key] = value
+    
+    def __delitem__(self, key):
+        del self._compiled[key]
+    
+    def __iter__(self):
+        yield from self._sources
+        for key in list(self._compiled):
+            if key not in self._sources:
+                yield key
+    
+    def __len__(self):
+        return len(self._sources) + sum(1 for key in self._compiled if key not in self._sources)
+    
+    def __contains__(self, key):
+        return key in self._sources or key in self._compiled
+    
+    def invalidate(self, key: str):
+        """
+        Descarta lo compilado para una clave, que se recompilará desde sus fuentes en
+        el siguiente acceso.
+        
+        Args:
+            key (str): Clave cuyas fuentes han cambiado
+        """
+        self._compiled.pop(key, None)
 
 
 class CitationPatterns:
@@ -19,10 +249,50 @@ class CitationPatterns:
     - Patrones especiales para casos particulares
     """
     
-    def __init__(self):
+    # Nombre o referencia de un grupo con nombre, para hacerlo único en una alternancia
+    _GROUP_NAME_RE = re.compile(r'(?<!\\)(\(\?P[<=])(\w+)')
+    # Apertura de un grupo con nombre, que en las copias sin capturas pasa a "(?:"
+    _CAPTURE_GROUP_RE = re.compile(r'(?<!\\)\(\?P<\w+>')
+    # Prefijo del grupo que envuelve cada variante en la alternancia de un estilo
+    _VARIANT_GROUP = 'variant__'
+    # Comienzo que comparten las variantes de bibliografía de un estilo y que su
+    # alternancia recorre una sola vez
+    _BIBLIOGRAPHY_SHARED_PREFIXES = {
+        'APA': _APA_AUTHORS,
+        'HARVARD': _HARVARD_AUTHORS_YEAR,
+        'VANCOUVER': _VANCOUVER_AUTHORS,
+        'CSE': _CSE_AUTHORS_YEAR,
+    }
+    # Encabezado literal de línea completa que no distingue mayúsculas: (?i)^texto$
+    _LITERAL_HEADER_RE = re.compile(r'\(\?i\)\^([^$]+)\$')
+    # Comienzo que comparten todas las variantes de bibliografía de un estilo, para
+    # descartar una entrada sin probarlas (ver candidate_styles). MLA, Vancouver y CSE
+    # no tienen uno: su variante de recursos web admite casi cualquier comienzo
+    _BIBLIOGRAPHY_PRELUDES = {
+        'APA': rf'{_SURNAME},\s[A-Z]\.',
+        'CHICAGO': rf'{_SURNAME},\s',
+        'CHICAGO_NOTES': r'\d+\.\s',
+        'HARVARD': rf'{_SURNAME},\s[A-Z]\.',
+        'IEEE': r'\[\d+\]\s',
+    }
+    
+    def __init__(self, use_re2: bool = False, use_pcre_jit: bool = False):
         """
         Inicializa todos los patrones de detección de citas por estilo.
+        
+        Args:
+            use_re2 (bool): Si se debe usar re2 (tiempo lineal) para los patrones que lo admitan.
+                Los patrones se traducen con re2_source (\\d, \\s y \\uXXXX pasan a sus
+                equivalentes Unicode); los que re2 no admite (\\w, lookaround, indicadores
+                en línea, referencias) se compilan con re.
+            use_pcre_jit (bool): Si se debe usar PCRE2 con compilación JIT para los patrones
+                que lo admitan (si no se usa re2). La compilación JIT se paga una vez al crear
+                la instancia. Su \\s no incluye los separadores \\x1c-\\x1f y no acepta
+                textos con sustitutos sueltos, por lo que es opcional.
         """
+        self.use_re2 = use_re2 and RE2_AVAILABLE
+        self.use_pcre_jit = use_pcre_jit and PCRE2_AVAILABLE
+        
         # Inicializar diccionarios de patrones
         self.in_text_patterns = {}
         self.bibliography_patterns = {}
@@ -50,40 +320,37 @@ class CitationPatterns:
         # Patrones para citas en texto APA
         self.in_text_patterns['APA'] = [
             # Cita parentética básica (Autor, Año)
-            r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?),\s(?P<year>\d{4})\)',
+            rf'\((?P<author>{_AUTHOR}(?: et al\.)?),\s(?P<year>{_YEAR})\)',
             
             # Cita parentética con página (Autor, Año, p. XX)
-            r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?),\s(?P<year>\d{4}),\s(?P<page>p\.?\s\d+(?:-\d+)?)\)',
+            rf'\((?P<author>{_AUTHOR}(?: et al\.)?),\s(?P<year>{_YEAR}),\s(?P<page>{_PAGE})\)',
             
             # Cita narrativa: Autor (Año)
-            r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s\((?P<year>\d{4})\)',
+            rf'(?P<author>{_AUTHOR}(?: et al\.)?)\s\((?P<year>{_YEAR})\)',
             
             # Cita narrativa con página: Autor (Año, p. XX)
-            r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s\((?P<year>\d{4}),\s(?P<page>p\.?\s\d+(?:-\d+)?)\)',
+            rf'(?P<author>{_AUTHOR}(?: et al\.)?)\s\((?P<year>{_YEAR}),\s(?P<page>{_PAGE})\)',
             
             # Dos autores con & (Autor & Autor, Año)
-            r'\((?P<author1>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s&\s(?P<author2>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?),\s(?P<year>\d{4})(?:,\s(?P<page>p\.?\s\d+(?:-\d+)?))?\)',
+            rf'\((?P<author1>{_AUTHOR})\s&\s(?P<author2>{_AUTHOR}),\s(?P<year>{_YEAR})(?:,\s(?P<page>{_PAGE}))?\)',
             
             # Dos autores con & narrativo: Autor y Autor (Año)
-            r'(?P<author1>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\sy\s(?P<author2>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s\((?P<year>\d{4})(?:,\s(?P<page>p\.?\s\d+(?:-\d+)?))?\)',
+            rf'(?P<author1>{_AUTHOR})\sy\s(?P<author2>{_AUTHOR})\s\((?P<year>{_YEAR})(?:,\s(?P<page>{_PAGE}))?\)',
             
             # Tres o más autores: (Autor et al., Año)
-            r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\set\sal\.,\s(?P<year>\d{4})(?:,\s(?P<page>p\.?\s\d+(?:-\d+)?))?\)',
+            rf'\((?P<author>{_AUTHOR})\set\sal\.,\s(?P<year>{_YEAR})(?:,\s(?P<page>{_PAGE}))?\)',
             
             # Tres o más autores narrativo: Autor et al. (Año)
-            r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\set\sal\.\s\((?P<year>\d{4})(?:,\s(?P<page>p\.?\s\d+(?:-\d+)?))?\)',
+            rf'(?P<author>{_AUTHOR})\set\sal\.\s\((?P<year>{_YEAR})(?:,\s(?P<page>{_PAGE}))?\)',
             
             # Múltiples citas: (Autor, Año; Autor, Año)
-            r'\((?:(?:[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?),\s\d{4}(?:,\sp\.?\s\d+(?:-\d+)?)?;\s?)+(?:[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?),\s\d{4}(?:,\sp\.?\s\d+(?:-\d+)?)?\)'
+            rf'\((?:(?:{_AUTHOR}(?: et al\.)?),\s{_YEAR}(?:,\s{_PAGE})?;\s?)+(?:{_AUTHOR}(?: et al\.)?),\s{_YEAR}(?:,\s{_PAGE})?\)'
         ]
         
         # Patrones para referencias bibliográficas APA
         self.bibliography_patterns['APA'] = [
             # Libro básico
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)'  # Autor principal
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*'  # Autores adicionales (opcional)
-            r'(?:,?\s&\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?'  # Último autor con & (opcional)
-            r'\s\((?P<year>\d{4})\)\.\s'  # Año
+            _APA_AUTHORS_YEAR +
             r'(?P<title>[^\.]+)\.'  # Título
             r'(?:\s\([^)]+\)\.)?'  # Información adicional en paréntesis (opcional) 
             r'(?:\s(?P<edition>\d+[a-zª]+\sed\.))?'  # Edición (opcional)
@@ -91,10 +358,7 @@ class CitationPatterns:
             r'\s(?P<publisher>[^\.]+)\.',  # Editorial
             
             # Artículo de revista
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)'  # Autor principal
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*'  # Autores adicionales (opcional)
-            r'(?:,?\s&\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?'  # Último autor con & (opcional)
-            r'\s\((?P<year>\d{4})\)\.\s'  # Año
+            _APA_AUTHORS_YEAR +
             r'(?P<title>[^\.]+)\.\s'  # Título del artículo
             r'(?P<journal>[^,]+),\s'  # Nombre de la revista
             r'(?P<volume>\d+)'  # Volumen
@@ -102,23 +366,18 @@ class CitationPatterns:
             r',\s(?P<pages>\d+(?:-\d+)?)\.',  # Páginas
             
             # Capítulo de libro
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)'  # Autor del capítulo
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*'  # Autores adicionales (opcional)
-            r'(?:,?\s&\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?'  # Último autor con & (opcional)
-            r'\s\((?P<year>\d{4})\)\.\s'  # Año
+            _APA_AUTHORS_YEAR +  # Autores del capítulo y año
             r'(?P<chapter_title>[^\.]+)\.\s'  # Título del capítulo
-            r'En\s(?:(?P<editor>[A-Za-zÀ-ÿ\-]+)(?:\s[A-Z]\.(?:\s[A-Z]\.)?)?)+'  # Editor(es)
-            r'(?:(?:,\s|\s&\s)(?:[A-Za-zÀ-ÿ\-]+)(?:\s[A-Z]\.(?:\s[A-Z]\.)?)?)*'  # Editores adicionales
+            rf'En\s(?:(?P<editor>{_SURNAME})(?:\s[A-Z]\.(?:\s[A-Z]\.)?)?)+'  # Editor(es)
+            rf'(?:(?:,\s|\s&\s)(?:{_SURNAME})(?:\s[A-Z]\.(?:\s[A-Z]\.)?)?)*'  # Editores adicionales
             r'(?:\s\(Ed[s]?\.\)|\s\(Eds\.\))?,\s'  # Indicador de editor(es)
             r'(?P<book_title>[^(]+)'  # Título del libro
             r'(?:\s\((?:pp\.|p\.)\s(?P<pages>\d+(?:-\d+)?)\))\.\s'  # Páginas
             r'(?P<publisher>[^\.]+)\.',  # Editorial
             
             # Recurso electrónico (APA 7)
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)'  # Autor principal
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*'  # Autores adicionales (opcional)
-            r'(?:,?\s&\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?'  # Último autor con & (opcional)
-            r'\s\((?P<year>\d{4})(?:,\s[A-Za-zÀ-ÿ]+\s\d+)?\)\.\s'  # Año y fecha específica (opcional)
+            _APA_AUTHORS +
+            rf'\s\((?P<year>{_YEAR})(?:,\s[A-Za-zÀ-ÿ]+\s\d+)?\)\.\s'  # Año y fecha específica (opcional)
             r'(?P<title>[^\.]+)\.\s'  # Título
             r'(?P<site>[^\.]+)\.'  # Nombre del sitio
             r'(?:\s(?P<url>https?://[^\s]+))?'  # URL (opcional)
@@ -131,71 +390,71 @@ class CitationPatterns:
         # Patrones para citas en texto MLA
         self.in_text_patterns['MLA'] = [
             # Cita parentética básica (Apellido página)
-            r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s(?P<page>\d+(?:-\d+)?)\)',
+            rf'\((?P<author>{_AUTHOR})\s(?P<page>\d+(?:-\d+)?)\)',
             
             # Cita narrativa con página: Apellido (página)
-            r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s\((?P<page>\d+(?:-\d+)?)\)',
+            rf'(?P<author>{_AUTHOR})\s\((?P<page>\d+(?:-\d+)?)\)',
             
             # Dos autores: (Apellido and Apellido página)
-            r'\((?P<author1>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\sand\s(?P<author2>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s(?P<page>\d+(?:-\d+)?)\)',
+            rf'\((?P<author1>{_AUTHOR})\sand\s(?P<author2>{_AUTHOR})\s(?P<page>\d+(?:-\d+)?)\)',
             
             # Dos autores narrativo: Apellido and Apellido (página)
-            r'(?P<author1>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\sand\s(?P<author2>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s\((?P<page>\d+(?:-\d+)?)\)',
+            rf'(?P<author1>{_AUTHOR})\sand\s(?P<author2>{_AUTHOR})\s\((?P<page>\d+(?:-\d+)?)\)',
             
             # Tres o más autores: (Apellido et al. página)
-            r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\set\sal\.\s(?P<page>\d+(?:-\d+)?)\)',
+            rf'\((?P<author>{_AUTHOR})\set\sal\.\s(?P<page>\d+(?:-\d+)?)\)',
             
             # Tres o más autores narrativo: Apellido et al. (página)
-            r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\set\sal\.\s\((?P<page>\d+(?:-\d+)?)\)',
+            rf'(?P<author>{_AUTHOR})\set\sal\.\s\((?P<page>\d+(?:-\d+)?)\)',
             
             # Cita con título abreviado para múltiples obras del mismo autor: (Apellido, "Título abreviado" página)
-            r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?),\s[""](?P<title>[^""]+)[""]\s(?P<page>\d+(?:-\d+)?)\)',
+            rf'\((?P<author>{_AUTHOR}),\s[""](?P<title>[^""]+)[""]\s(?P<page>\d+(?:-\d+)?)\)',
             
             # Sin página, solo autor: (Apellido)
-            r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\)'
+            rf'\((?P<author>{_AUTHOR})\)'
         ]
         
         # Patrones para referencias bibliográficas MLA
         self.bibliography_patterns['MLA'] = [
             # Libro básico
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)(?:\.|,)'  # Autor principal 
+            rf'^(?P<author>{_SURNAME},\s[A-Za-zÀ-ÿ\-\s]+)(?:\.|,)'  # Autor principal 
             r'(?:,\sand\s[A-Za-zÀ-ÿ\-\s]+)?'  # Co-autor (opcional)
             r'\s(?P<title>[^\.]+)(?:\.|,)'  # Título (en cursiva, pero no detectable en plaintext)
             r'(?:\stranslated\sby\s[A-Za-zÀ-ÿ\-\s]+,)?'  # Traductor (opcional)
             r'(?:\s(?P<edition>\d+[a-z]{2}\sed\.)?,)?'  # Edición (opcional)
             r'(?:\s(?P<volume>vol\.\s\d+)?,)?'  # Volumen (opcional)
             r'\s(?P<publisher>[^,]+),'  # Editorial
-            r'\s(?P<year>\d{4})\.',  # Año
+            rf'\s(?P<year>{_YEAR})\.',  # Año
             
             # Artículo de revista
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)(?:\.|,)'  # Autor principal
+            rf'^(?P<author>{_SURNAME},\s[A-Za-zÀ-ÿ\-\s]+)(?:\.|,)'  # Autor principal
             r'(?:,\sand\s[A-Za-zÀ-ÿ\-\s]+)?'  # Co-autor (opcional)
             r'\s[""](?P<title>[^""]+)[""]\.'  # Título del artículo (entre comillas)
             r'\s(?P<journal>[^,]+),'  # Nombre de la revista (en cursiva, no detectable)
             r'\svol\.\s(?P<volume>\d+),'  # Volumen
             r'(?:\sno\.\s(?P<issue>\d+),)?'  # Número (opcional)
-            r'\s(?P<year>\d{4}),'  # Año
+            rf'\s(?P<year>{_YEAR}),'  # Año
             r'\spp\.\s(?P<pages>\d+(?:-\d+)?).',  # Páginas
             
             # Capítulo de libro o ensayo en una colección
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)(?:\.|,)'  # Autor del capítulo
+            rf'^(?P<author>{_SURNAME},\s[A-Za-zÀ-ÿ\-\s]+)(?:\.|,)'  # Autor del capítulo
             r'(?:,\sand\s[A-Za-zÀ-ÿ\-\s]+)?'  # Co-autor (opcional)
             r'\s[""](?P<chapter_title>[^""]+)[""]\.'  # Título del capítulo
             r'\s(?P<book_title>[^,]+),'  # Título del libro (en cursiva, no detectable)
             r'(?:\sedited\sby\s[A-Za-zÀ-ÿ\-\s]+,)?'  # Editor (opcional)
             r'\s(?P<publisher>[^,]+),'  # Editorial
-            r'\s(?P<year>\d{4}),'  # Año
+            rf'\s(?P<year>{_YEAR}),'  # Año
             r'\spp\.\s(?P<pages>\d+(?:-\d+)?).',  # Páginas
             
             # Recurso electrónico / Página web
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)?'  # Autor (opcional)
+            rf'^(?P<author>{_SURNAME},\s[A-Za-zÀ-ÿ\-\s]+)?'  # Autor (opcional)
             r'(?:(?:\.|,)\s)?'  # Puntuación después del autor
             r'(?:[""])?(?P<title>[^""]+)(?:[""])?\.'  # Título (puede estar entre comillas o en cursiva)
             r'\s(?P<site>[^,]+),'  # Nombre del sitio web (en cursiva, no detectable)
             r'(?:\s(?P<publisher>[^,]+),)?'  # Editor/Publicador (opcional)
-            r'(?:\s(?P<date>\d+\s[A-Za-zÀ-ÿ]+\s\d{4}|\d{1,2}\s[A-Za-zÀ-ÿ]+\.?\s\d{4}),)?'  # Fecha completa (opcional)
+            rf'(?:\s(?P<date>\d+\s[A-Za-zÀ-ÿ]+\s{_YEAR}|\d{{1,2}}\s[A-Za-zÀ-ÿ]+\.?\s{_YEAR}),)?'  # Fecha completa (opcional)
             r'(?:\s(?P<url>(?:www|http|https)[^,\s]+))?'  # URL (opcional)
-            r'(?:,\sAccessed\s(?P<access_date>\d+\s[A-Za-zÀ-ÿ]+\s\d{4}|(?:[A-Za-zÀ-ÿ]+\.|[A-Za-zÀ-ÿ]+)\s\d{1,2},\s\d{4}))?'  # Fecha de acceso (opcional)
+            rf'(?:,\sAccessed\s(?P<access_date>\d+\s[A-Za-zÀ-ÿ]+\s{_YEAR}|(?:[A-Za-zÀ-ÿ]+\.|[A-Za-zÀ-ÿ]+)\s\d{{1,2}},\s{_YEAR}))?'  # Fecha de acceso (opcional)
         ]
     
     def _load_chicago_patterns(self):
@@ -205,16 +464,16 @@ class CitationPatterns:
         # Patrones para citas en texto Chicago (autor-fecha)
         self.in_text_patterns['CHICAGO_AUTHOR_DATE'] = [
             # Cita parentética básica (Apellido año)
-            r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s(?P<year>\d{4})(?:,\s(?P<page>\d+(?:-\d+)?))?\)',
+            rf'\((?P<author>{_AUTHOR})\s(?P<year>{_YEAR})(?:,\s(?P<page>\d+(?:-\d+)?))?\)',
             
             # Cita narrativa: Apellido (año)
-            r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s\((?P<year>\d{4})(?:,\s(?P<page>\d+(?:-\d+)?))?\)',
+            rf'(?P<author>{_AUTHOR})\s\((?P<year>{_YEAR})(?:,\s(?P<page>\d+(?:-\d+)?))?\)',
             
             # Dos autores: (Apellido and Apellido año)
-            r'\((?P<author1>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\sand\s(?P<author2>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s(?P<year>\d{4})(?:,\s(?P<page>\d+(?:-\d+)?))?\)',
+            rf'\((?P<author1>{_AUTHOR})\sand\s(?P<author2>{_AUTHOR})\s(?P<year>{_YEAR})(?:,\s(?P<page>\d+(?:-\d+)?))?\)',
             
             # Múltiples citas: (Apellido año; Apellido año)
-            r'\((?:(?:[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s\d{4}(?:,\s\d+(?:-\d+)?)?;\s)+(?:[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s\d{4}(?:,\s\d+(?:-\d+)?)?\)'
+            rf'\((?:(?:{_AUTHOR})\s{_YEAR}(?:,\s\d+(?:-\d+)?)?;\s)+(?:{_AUTHOR})\s{_YEAR}(?:,\s\d+(?:-\d+)?)?\)'
         ]
         
         # Patrones para citas Chicago (notas al pie)
@@ -232,7 +491,7 @@ class CitationPatterns:
         # Patrones para referencias bibliográficas Chicago (bibliografía)
         self.bibliography_patterns['CHICAGO'] = [
             # Libro básico
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)'  # Autor principal
+            rf'^(?P<author>{_SURNAME},\s[A-Za-zÀ-ÿ\-\s]+)'  # Autor principal
             r'(?:,\s[A-Za-zÀ-ÿ\-\s]+)*'  # Autores adicionales (opcional)
             r'(?:,\sand\s[A-Za-zÀ-ÿ\-\s]+)?'  # Último autor (opcional)
             r'(?:\.|,)\s(?P<title>[^\.]+)\.'  # Título (en cursiva, no detectable)
@@ -240,21 +499,21 @@ class CitationPatterns:
             r'(?:\s(?P<volume>Vol\.\s\d+))?'  # Volumen (opcional)
             r'\s(?P<city>[A-Za-zÀ-ÿ\-\s]+):'  # Ciudad
             r'\s(?P<publisher>[^,]+),'  # Editorial
-            r'\s(?P<year>\d{4})\.',  # Año
+            rf'\s(?P<year>{_YEAR})\.',  # Año
             
             # Artículo de revista
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)'  # Autor principal
+            rf'^(?P<author>{_SURNAME},\s[A-Za-zÀ-ÿ\-\s]+)'  # Autor principal
             r'(?:,\s[A-Za-zÀ-ÿ\-\s]+)*'  # Autores adicionales (opcional)
             r'(?:,\sand\s[A-Za-zÀ-ÿ\-\s]+)?'  # Último autor (opcional)
             r'(?:\.|,)\s[""](?P<title>[^""]+)[""]\.'  # Título del artículo
             r'\s(?P<journal>[^""\d]+)'  # Nombre de la revista
             r'\s(?P<volume>\d+)'  # Volumen
             r'(?:,\sno\.\s(?P<issue>\d+))?'  # Número (opcional)
-            r'\s\((?P<year>\d{4})\):'  # Año
+            rf'\s\((?P<year>{_YEAR})\):'  # Año
             r'\s(?P<pages>\d+(?:-\d+)?)\.',  # Páginas
             
             # Capítulo de libro
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)'  # Autor del capítulo
+            rf'^(?P<author>{_SURNAME},\s[A-Za-zÀ-ÿ\-\s]+)'  # Autor del capítulo
             r'(?:,\s[A-Za-zÀ-ÿ\-\s]+)*'  # Autores adicionales (opcional)
             r'(?:,\sand\s[A-Za-zÀ-ÿ\-\s]+)?'  # Último autor (opcional)
             r'(?:\.|,)\s[""](?P<chapter_title>[^""]+)[""]\.'  # Título del capítulo
@@ -263,17 +522,17 @@ class CitationPatterns:
             r'\s(?P<pages>\d+(?:-\d+)?)\.'  # Páginas
             r'\s(?P<city>[A-Za-zÀ-ÿ\-\s]+):'  # Ciudad
             r'\s(?P<publisher>[^,]+),'  # Editorial
-            r'\s(?P<year>\d{4})\.',  # Año
+            rf'\s(?P<year>{_YEAR})\.',  # Año
             
             # Recurso electrónico
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)'  # Autor (opcional)
+            rf'^(?P<author>{_SURNAME},\s[A-Za-zÀ-ÿ\-\s]+)'  # Autor (opcional)
             r'(?:,\s[A-Za-zÀ-ÿ\-\s]+)*'  # Autores adicionales (opcional)
             r'(?:,\sand\s[A-Za-zÀ-ÿ\-\s]+)?'  # Último autor (opcional)
             r'(?:\.|,)\s[""](?P<title>[^""]+)[""]\.'  # Título
             r'\s(?P<site>[^\.]+)\.'  # Nombre del sitio web
-            r'(?:\s(?P<date>[A-Za-zÀ-ÿ]+\s\d+,\s\d{4})\.)?'  # Fecha de publicación (opcional)
+            rf'(?:\s(?P<date>[A-Za-zÀ-ÿ]+\s\d+,\s{_YEAR})\.)?'  # Fecha de publicación (opcional)
             r'(?:\s(?P<url>https?://[^\s]+)\.)?'  # URL (opcional)
-            r'(?:\sAccessed\s(?P<access_date>[A-Za-zÀ-ÿ]+\s\d+,\s\d{4})\.)?'  # Fecha de acceso (opcional)
+            rf'(?:\sAccessed\s(?P<access_date>[A-Za-zÀ-ÿ]+\s\d+,\s{_YEAR})\.)?'  # Fecha de acceso (opcional)
         ]
         
         # Patrones para notas al pie Chicago
@@ -284,7 +543,7 @@ class CitationPatterns:
             r'\s(?P<title>[^(]+)'  # Título (en cursiva, no detectable)
             r'(?:\s\((?P<city>[A-Za-zÀ-ÿ\-\s]+):'  # Ciudad
             r'\s(?P<publisher>[^,]+),'  # Editorial
-            r'\s(?P<year>\d{4})\)),'  # Año
+            rf'\s(?P<year>{_YEAR})\)),'  # Año
             r'\s(?P<page>\d+(?:-\d+)?).',  # Página(s)
             
             # Referencia de artículo en nota
@@ -294,7 +553,7 @@ class CitationPatterns:
             r'\s(?P<journal>[^""\d]+)'  # Nombre de la revista
             r'\s(?P<volume>\d+)'  # Volumen
             r'(?:,\sno\.\s(?P<issue>\d+))?'  # Número (opcional)
-            r'\s\((?P<year>\d{4})\):'  # Año
+            rf'\s\((?P<year>{_YEAR})\):'  # Año
             r'\s(?P<pages>\d+(?:-\d+)?)\.',  # Páginas
             
             # Ibid con página
@@ -313,38 +572,32 @@ class CitationPatterns:
         # Patrones para citas en texto Harvard
         self.in_text_patterns['HARVARD'] = [
             # Cita parentética básica (Apellido, año)
-            r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?),\s(?P<year>\d{4})(?::\s(?P<page>\d+(?:-\d+)?))?\)',
+            rf'\((?P<author>{_AUTHOR}),\s(?P<year>{_YEAR})(?::\s(?P<page>\d+(?:-\d+)?))?\)',
             
             # Cita narrativa: Apellido (año)
-            r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s\((?P<year>\d{4})(?::\s(?P<page>\d+(?:-\d+)?))?\)',
+            rf'(?P<author>{_AUTHOR})\s\((?P<year>{_YEAR})(?::\s(?P<page>\d+(?:-\d+)?))?\)',
             
             # Dos autores: (Apellido and Apellido, año)
-            r'\((?P<author1>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\sand\s(?P<author2>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?),\s(?P<year>\d{4})(?::\s(?P<page>\d+(?:-\d+)?))?\)',
+            rf'\((?P<author1>{_AUTHOR})\sand\s(?P<author2>{_AUTHOR}),\s(?P<year>{_YEAR})(?::\s(?P<page>\d+(?:-\d+)?))?\)',
             
             # Tres o más autores: (Apellido et al., año)
-            r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\set\sal\.,\s(?P<year>\d{4})(?::\s(?P<page>\d+(?:-\d+)?))?\)',
+            rf'\((?P<author>{_AUTHOR})\set\sal\.,\s(?P<year>{_YEAR})(?::\s(?P<page>\d+(?:-\d+)?))?\)',
             
             # Múltiples obras del mismo autor: (Apellido, año; año)
-            r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?),\s(?:\d{4}(?::\s\d+(?:-\d+)?)?;\s)+\d{4}(?::\s\d+(?:-\d+)?)?\)'
+            rf'\((?P<author>{_AUTHOR}),\s(?:{_YEAR}(?::\s\d+(?:-\d+)?)?;\s)+{_YEAR}(?::\s\d+(?:-\d+)?)?\)'
         ]
         
         # Patrones para referencias bibliográficas Harvard
         self.bibliography_patterns['HARVARD'] = [
             # Libro básico
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)'  # Autor principal
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*'  # Autores adicionales (opcional)
-            r'(?:\sand\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?'  # Último autor (opcional)
-            r'\s\((?P<year>\d{4})\)'  # Año
+            _HARVARD_AUTHORS_YEAR +
             r'\s(?P<title>[^\.]+)\.'  # Título (en cursiva, no detectable)
             r'(?:\s(?P<edition>\d+[a-z]{2}\sed\.))?'  # Edición (opcional)
             r'\s(?P<city>[A-Za-zÀ-ÿ\-\s]+):'  # Ciudad
             r'\s(?P<publisher>[^\.]+)\.',  # Editorial
             
             # Artículo de revista
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)'  # Autor principal
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*'  # Autores adicionales (opcional)
-            r'(?:\sand\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?'  # Último autor (opcional)
-            r'\s\((?P<year>\d{4})\)'  # Año
+            _HARVARD_AUTHORS_YEAR +
             r'\s\'(?P<title>[^\']+)\','  # Título del artículo
             r'\s(?P<journal>[^,]+),'  # Nombre de la revista
             r'\s(?P<volume>\d+)'  # Volumen
@@ -352,13 +605,10 @@ class CitationPatterns:
             r'\spp\.\s(?P<pages>\d+(?:-\d+)?)\.',  # Páginas
             
             # Recurso electrónico
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)'  # Autor principal
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*'  # Autores adicionales (opcional)
-            r'(?:\sand\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?'  # Último autor (opcional)
-            r'\s\((?P<year>\d{4})\)'  # Año
+            _HARVARD_AUTHORS_YEAR +
             r'\s(?P<title>[^\.]+)\s\[Online\]\.'  # Título y marcador [Online]
             r'(?:\s(?:Available|Disponible)\s(?:at|en):\s(?P<url>https?://[^\s]+))?'  # URL (opcional)
-            r'(?:\s\[(?:Accessed|Accedido):\s(?P<access_date>\d+\s[A-Za-zÀ-ÿ]+\s\d{4})\])?'  # Fecha de acceso (opcional)
+            rf'(?:\s\[(?:Accessed|Accedido):\s(?P<access_date>\d+\s[A-Za-zÀ-ÿ]+\s{_YEAR})\])?'  # Fecha de acceso (opcional)
         ]
     
     def _load_ieee_patterns(self):
@@ -386,7 +636,7 @@ class CitationPatterns:
             r'(?:\s(?P<edition>\d+[a-z]{2}\sed\.)?,)?'  # Edición (opcional)
             r'\s(?P<city>[A-Za-zÀ-ÿ\-\s]+):'  # Ciudad
             r'\s(?P<publisher>[^,]+),'  # Editorial
-            r'\s(?P<year>\d{4})(?:,\spp\.\s(?P<pages>\d+(?:-\d+)?))?\.',  # Año y páginas (opcional)
+            rf'\s(?P<year>{_YEAR})(?:,\spp\.\s(?P<pages>\d+(?:-\d+)?))?\.',  # Año y páginas (opcional)
             
             # Artículo de revista
             r'^\[(?P<ref_num>\d+)\]\s'  # Número de referencia
@@ -396,16 +646,16 @@ class CitationPatterns:
             r'\svol\.\s(?P<volume>\d+),'  # Volumen
             r'(?:\sno\.\s(?P<issue>\d+),)?'  # Número (opcional)
             r'\spp\.\s(?P<pages>\d+(?:-\d+)?),'  # Páginas
-            r'\s(?P<date>[A-Za-zÀ-ÿ]+\.\s\d{4})\.',  # Fecha (mes+año)
+            rf'\s(?P<date>[A-Za-zÀ-ÿ]+\.\s{_YEAR})\.',  # Fecha (mes+año)
             
             # Recurso electrónico
             r'^\[(?P<ref_num>\d+)\]\s'  # Número de referencia
             r'(?P<author>[A-Za-zÀ-ÿ\-\.\s]+)?'  # Autor(es) (opcional)
             r'(?:,\s)?[""](?P<title>[^""]+)[""]\,'  # Título
             r'(?:\s(?P<site>[^,]+),)?'  # Nombre del sitio (opcional)
-            r'(?:\s(?P<date>[A-Za-zÀ-ÿ]+\.\s\d{1,2},\s\d{4}),)?'  # Fecha (opcional)
+            rf'(?:\s(?P<date>[A-Za-zÀ-ÿ]+\.\s\d{{1,2}},\s{_YEAR}),)?'  # Fecha (opcional)
             r'(?:\s(?:Available|Disponible):\s(?P<url>https?://[^\s]+))?'  # URL (opcional)
-            r'(?:\s\[(?:Accessed|Accedido):\s(?P<access_date>[A-Za-zÀ-ÿ]+\.\s\d{1,2},\s\d{4})\])?'  # Fecha de acceso (opcional)
+            rf'(?:\s\[(?:Accessed|Accedido):\s(?P<access_date>[A-Za-zÀ-ÿ]+\.\s\d{{1,2}},\s{_YEAR})\])?'  # Fecha de acceso (opcional)
         ]
     
     def _load_vancouver_patterns(self):
@@ -430,51 +680,42 @@ class CitationPatterns:
         # Patrones para referencias bibliográficas Vancouver
         self.bibliography_patterns['VANCOUVER'] = [
             # Artículo de revista
-            r'^(?P<ref_num>\d+\.\s)?'  # Número de referencia (opcional)
-            r'(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})'  # Primer autor
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*'  # Autores adicionales
-            r'(?:,\set\sal)?'  # "et al" para muchos autores
+            _VANCOUVER_AUTHORS +
             r'\.\s(?P<title>[^\.]+)\.'  # Título
             r'\s(?P<journal>[^\.]+)\.'  # Nombre de la revista (abreviado)
-            r'\s(?P<year>\d{4})'  # Año
+            rf'\s(?P<year>{_YEAR})'  # Año
             r'(?:;(?P<volume>\d+)(?:\((?P<issue>\d+)\))?:(?P<pages>\d+(?:-\d+)?))?\.',  # Volumen(número):páginas
             
             # Libro
-            r'^(?P<ref_num>\d+\.\s)?'  # Número de referencia (opcional)
-            r'(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})'  # Primer autor
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*'  # Autores adicionales
-            r'(?:,\set\sal)?'  # "et al" para muchos autores
+            _VANCOUVER_AUTHORS +
             r'\.\s(?P<title>[^\.]+)\.'  # Título
             r'(?:\s(?P<edition>\d+[a-z]{2}\sed\.))?'  # Edición (opcional)
             r'\s(?P<city>[A-Za-zÀ-ÿ\-\s]+):'  # Ciudad
             r'\s(?P<publisher>[^;]+);'  # Editorial
-            r'\s(?P<year>\d{4})(?:\.\s(?P<pages>\d+)\sp)?',  # Año y páginas (opcional)
+            rf'\s(?P<year>{_YEAR})(?:\.\s(?P<pages>\d+)\sp)?',  # Año y páginas (opcional)
             
             # Capítulo de libro
-            r'^(?P<ref_num>\d+\.\s)?'  # Número de referencia (opcional)
-            r'(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})'  # Autor del capítulo
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*'  # Autores adicionales
-            r'(?:,\set\sal)?'  # "et al" para muchos autores
+            _VANCOUVER_AUTHORS +  # Autores del capítulo
             r'\.\s(?P<chapter_title>[^\.]+)\.'  # Título del capítulo
-            r'\sIn:\s(?P<editor>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})'  # Editor
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*'  # Editores adicionales
+            rf'\sIn:\s(?P<editor>{_SURNAME}\s[A-Z]{{1,2}})'  # Editor
+            rf'(?:,\s{_SURNAME}\s[A-Z]{{1,2}})*'  # Editores adicionales
             r'(?:,\seditors)?'  # Marcador de editores
             r'\.\s(?P<book_title>[^\.]+)\.'  # Título del libro
             r'(?:\s(?P<edition>\d+[a-z]{2}\sed\.))?'  # Edición (opcional)
             r'\s(?P<city>[A-Za-zÀ-ÿ\-\s]+):'  # Ciudad
             r'\s(?P<publisher>[^;]+);'  # Editorial
-            r'\s(?P<year>\d{4})(?:\.\sp\.\s(?P<pages>\d+(?:-\d+)?))?\.',  # Año y páginas
+            rf'\s(?P<year>{_YEAR})(?:\.\sp\.\s(?P<pages>\d+(?:-\d+)?))?\.',  # Año y páginas
             
             # Recurso electrónico
             r'^(?P<ref_num>\d+\.\s)?'  # Número de referencia (opcional)
-            r'(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})?'  # Autor (opcional)
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*'  # Autores adicionales
+            rf'(?P<author>{_SURNAME}\s[A-Z]{{1,2}})?'  # Autor (opcional)
+            rf'(?:,\s{_SURNAME}\s[A-Z]{{1,2}})*'  # Autores adicionales
             r'(?:,\set\sal)?'  # "et al" para muchos autores
             r'(?:\.)?\s(?P<title>[^\.]+)\s\[Internet\]\.'  # Título y marcador [Internet]
             r'(?:\s(?P<city>[A-Za-zÀ-ÿ\-\s]+):'  # Ciudad (opcional)
             r'\s(?P<publisher>[^;]+);)?'  # Editorial (opcional)
-            r'(?:\s(?P<year>\d{4}))?'  # Año (opcional)
-            r'(?:\s\[(?:cited|consultado)\s(?P<access_date>\d{4}\s[A-Za-zÀ-ÿ]+\s\d{1,2})\])?'  # Fecha de acceso (opcional)
+            rf'(?:\s(?P<year>{_YEAR}))?'  # Año (opcional)
+            rf'(?:\s\[(?:cited|consultado)\s(?P<access_date>{_YEAR}\s[A-Za-zÀ-ÿ]+\s\d{{1,2}})\])?'  # Fecha de acceso (opcional)
             r'(?:\.\sAvailable\sfrom:\s(?P<url>https?://[^\s]+))?'  # URL (opcional)
         ]
     
@@ -485,28 +726,25 @@ class CitationPatterns:
         # Patrones para citas en texto CSE (Sistema nombre-año)
         self.in_text_patterns['CSE'] = [
             # Cita básica (Apellido año)
-            r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s(?P<year>\d{4})\)',
+            rf'\((?P<author>{_AUTHOR})\s(?P<year>{_YEAR})\)',
             
             # Cita narrativa: Apellido año
-            r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s(?P<year>\d{4})',
+            rf'(?P<author>{_AUTHOR})\s(?P<year>{_YEAR})',
             
             # Cita de dos autores (Apellido and Apellido año)
-            r'\((?P<author1>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\sand\s(?P<author2>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s(?P<year>\d{4})\)',
+            rf'\((?P<author1>{_AUTHOR})\sand\s(?P<author2>{_AUTHOR})\s(?P<year>{_YEAR})\)',
             
             # Sistema de cita-secuencia: [n]
             r'\[(?P<ref_num>\d+)\]',
             
             # Sistema de cita-nombre: [Apellido]
-            r'\[(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\]'
+            rf'\[(?P<author>{_AUTHOR})\]'
         ]
         
         # Patrones para referencias bibliográficas CSE
         self.bibliography_patterns['CSE'] = [
             # Artículo de revista (sistema nombre-año)
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})'  # Primer autor
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*'  # Autores adicionales
-            r'(?:,\set\sal)?'  # "et al" para muchos autores
-            r'\.\s(?P<year>\d{4})\.'  # Año
+            _CSE_AUTHORS_YEAR +
             r'\s(?P<title>[^\.]+)\.'  # Título
             r'\s(?P<journal>[^\.]+)\.'  # Nombre de la revista
             r'\s(?P<volume>\d+)'  # Volumen
@@ -514,36 +752,30 @@ class CitationPatterns:
             r':(?P<pages>\d+(?:-\d+)?)\.',  # Páginas
             
             # Libro (sistema nombre-año)
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})'  # Primer autor
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*'  # Autores adicionales
-            r'(?:,\set\sal)?'  # "et al" para muchos autores
-            r'\.\s(?P<year>\d{4})\.'  # Año
+            _CSE_AUTHORS_YEAR +
             r'\s(?P<title>[^\.]+)\.'  # Título
             r'(?:\s(?P<edition>\d+[a-z]{2}\sed\.))?'  # Edición (opcional)
             r'\s(?P<city>[A-Za-zÀ-ÿ\-\s]+)(?:\s\([A-Z]{2}\))?:'  # Ciudad y estado (opcional)
             r'\s(?P<publisher>[^\.]+)(?:\.\s(?P<pages>\d+)\sp)?',  # Editorial y páginas (opcional)
             
             # Artículo de revista (sistema numérico)
-            r'^(?P<ref_num>\d+\.\s)?'  # Número de referencia (sistema numérico)
-            r'(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})'  # Primer autor
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*'  # Autores adicionales
-            r'(?:,\set\sal)?'  # "et al" para muchos autores
+            _VANCOUVER_AUTHORS +  # Sistema numérico
             r'\.\s(?P<title>[^\.]+)\.'  # Título
             r'\s(?P<journal>[^\.]+)\.'  # Nombre de la revista
-            r'\s(?P<year>\d{4})'  # Año
+            rf'\s(?P<year>{_YEAR})'  # Año
             r';(?P<volume>\d+)'  # Volumen
             r'(?:\((?P<issue>\d+)\))?'  # Número (opcional)
             r':(?P<pages>\d+(?:-\d+)?)\.',  # Páginas
             
             # Recurso electrónico (sistema nombre-año)
-            r'^(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})?'  # Autor (opcional)
-            r'(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*'  # Autores adicionales
+            rf'^(?P<author>{_SURNAME}\s[A-Z]{{1,2}})?'  # Autor (opcional)
+            rf'(?:,\s{_SURNAME}\s[A-Z]{{1,2}})*'  # Autores adicionales
             r'(?:,\set\sal)?'  # "et al" para muchos autores
-            r'(?:\.)?\s(?P<year>\d{4})\.'  # Año
+            rf'(?:\.)?\s(?P<year>{_YEAR})\.'  # Año
             r'\s(?P<title>[^\.]+)\s\[Internet\]\.'  # Título y marcador [Internet]
             r'(?:\s(?P<city>[A-Za-zÀ-ÿ\-\s]+)(?:\s\([A-Z]{2}\))?:'  # Ciudad y estado (opcional)
             r'\s(?P<publisher>[^;]+);)?'  # Editorial (opcional)
-            r'(?:\s\[(?:cited|accessed)\s(?P<access_date>\d{4}\s[A-Za-zÀ-ÿ]+\s\d{1,2})\])?'  # Fecha de acceso (opcional)
+            rf'(?:\s\[(?:cited|accessed)\s(?P<access_date>{_YEAR}\s[A-Za-zÀ-ÿ]+\s\d{{1,2}})\])?'  # Fecha de acceso (opcional)
             r'(?:\.\sAvailable\sfrom:\s(?P<url>https?://[^\s]+))?'  # URL (opcional)
         ]
     
@@ -636,29 +868,277 @@ class CitationPatterns:
     
     def _compile_patterns(self):
         """
-        Compila los patrones para mejorar el rendimiento.
+        Prepara la compilación de los patrones. Cada estilo (o categoría especial) se
+        compila la primera vez que se usa, de modo que quien solo necesita un estilo no
+        paga la compilación de los demás.
+        """
+        def compile_list(style, patterns):
+            return [self._compile_pattern(p) for p in patterns]
+        
+        # Patrones in-text, de bibliografía y encabezados
+        self.compiled_in_text = _LazyCompileDict(self.in_text_patterns, compile_list)
+        self.compiled_bibliography = _LazyCompileDict(self.bibliography_patterns, compile_list)
+        self.compiled_headers = _LazyCompileDict(self.bibliography_headers, compile_list)
+        
+        # Patrones especiales
+        self.compiled_special = _LazyCompileDict(
+            self.special_patterns,
+            lambda category, patterns: {term: self._compile_pattern(pattern) for term, pattern in patterns.items()}
+        )
+        
+        # Copias sin grupos de captura, para solo comprobar si hay coincidencias (ver
+        # matches_any)
+        self._nocap_in_text = _LazyCompileDict(
+            self.in_text_patterns, lambda style, patterns: self._compile_without_captures(patterns)
+        )
+        self._nocap_bibliography = _LazyCompileDict(
+            self.bibliography_patterns, lambda style, patterns: self._compile_without_captures(patterns)
+        )
+        
+        # Una alternancia por estilo con todas sus variantes, para recorrer el texto
+        # una sola vez (ver iter_matches)
+        self.in_text_patterns_union = _LazyCompileDict(
+            self.in_text_patterns, lambda style, patterns: self._compile_union(patterns)
+        )
+        self.bibliography_patterns_union = _LazyCompileDict(
+            self.bibliography_patterns,
+            lambda style, patterns: self._compile_union(patterns, self._BIBLIOGRAPHY_SHARED_PREFIXES.get(style))
+        )
+        
+        self._build_header_keywords()
+        
+        # Comprobación previa de cada estilo de bibliografía (None: siempre candidato)
+        self._bib_prelude = {
+            style: re.compile(self._BIBLIOGRAPHY_PRELUDES[style]) if style in self._BIBLIOGRAPHY_PRELUDES else None
+            for style in self.bibliography_patterns
+        }
+    
+    def _build_header_keywords(self):
+        """
+        Reúne los encabezados de bibliografía literales, en minúsculas, con los estilos
+        que los usan, y construye con ellos un autómata de Aho-Corasick si está
+        disponible (ver find_header_spans).
+        """
+        self._header_keywords = {}
+        for style, headers in self.bibliography_headers.items():
+            for header in headers:
+                match = self._LITERAL_HEADER_RE.fullmatch(header)
+                # Los encabezados con sintaxis de regex no entran en el autómata
+                if match and match.group(1) == re.escape(match.group(1)).replace('\\ ', ' '):
+                    keyword = match.group(1)
+                    entry = self._header_keywords.setdefault(keyword.lower(), (keyword, []))
+                    if style not in entry[1]:
+                        entry[1].append(style)
+        
+        self._header_automaton = None
+        if AHOCORASICK_AVAILABLE and self._header_keywords:
+            self._header_automaton = ahocorasick.Automaton()
+            for keyword_lower, (keyword, styles) in self._header_keywords.items():
+                self._header_automaton.add_word(keyword_lower, (keyword_lower, keyword, styles))
+            self._header_automaton.make_automaton()
+    
+    def _compile_pattern(self, pattern: str) -> Any:
+        """
+        Compila un patrón con re2 o con PCRE2 (JIT) si están activados y lo admiten, o
+        con re en otro caso.
+        
+        Args:
+            pattern (str): El patrón a compilar
+            
+        Returns:
+            Any: El patrón compilado (re.Pattern, Re2Pattern o de pcre2), en modo multilínea
+        """
+        if self.use_re2:
+            # re2 no admite lookaround ni referencias hacia atrás
+            compiled = compile_re2(pattern, multiline=True)
+            if compiled is not None:
+                return compiled
+        if self.use_pcre_jit:
+            try:
+                compiled = pcre2.compile(pattern, pcre2.MULTILINE)
+                compiled.jit_compile()
+                return compiled
+            except Exception:
+                # Sintaxis propia de re o JIT no disponible en la plataforma
+                pass
+        return re.compile(pattern, re.MULTILINE)
+    
+    def _compile_without_captures(self, patterns: List[str]) -> List[Any]:
+        """
+        Compila copias de los patrones con sus grupos con nombre convertidos en grupos
+        sin captura, que el motor recorre sin guardar posiciones de grupos.
+        
+        Args:
+            patterns (List[str]): Patrones como cadenas
+            
+        Returns:
+            List[Any]: Patrones compilados sin capturas
+        """
+        return [
+            # Las referencias a grupos (?P=nombre) necesitan el grupo capturado
+            self._compile_pattern(pattern if '(?P=' in pattern else self._CAPTURE_GROUP_RE.sub('(?:', pattern))
+            for pattern in patterns
+        ]
+    
+    def _compile_union(self, patterns: List[str], shared_prefix: Optional[str] = None) -> Optional[Pattern]:
+        """
+        Une las variantes de un estilo en una sola alternancia. Cada variante va en un
+        grupo "variant__i" y sus grupos con nombre se renombran a "nombre__i" para que
+        no se repitan entre variantes.
+        
+        Si se indica un comienzo común, las primeras variantes consecutivas que empiezan
+        por él lo comparten: se prueba una sola vez y después sus restos, en orden. El
+        comienzo debe poder leerse de una sola manera para que gane la misma variante
+        que sin compartirlo. Sus grupos conservan el nombre sin sufijo y el grupo
+        "variant__i" cubre solo el resto de la variante.
+        
+        Args:
+            patterns (List[str]): Patrones del estilo como cadenas
+            shared_prefix (str, optional): Comienzo común de varias variantes
+            
+        Returns:
+            Optional[Pattern]: La alternancia compilada, o None si no se puede construir
+            (por ejemplo, si alguna variante lleva indicadores globales como "(?i)")
+        """
+        if not patterns:
+            return None
+        
+        def variant(i, pattern):
+            renamed = self._GROUP_NAME_RE.sub(lambda m: f'{m.group(1)}{m.group(2)}__{i}', pattern)
+            return f'(?P<{self._VARIANT_GROUP}{i}>{renamed})'
+        
+        shared = []
+        if shared_prefix:
+            start = next((i for i, pattern in enumerate(patterns) if pattern.startswith(shared_prefix)), None)
+            if start is not None:
+                end = start
+                while end < len(patterns) and patterns[end].startswith(shared_prefix):
+                    end += 1
+                if end - start > 1:
+                    shared = range(start, end)
+        
+        branches = []
+        for i, pattern in enumerate(patterns):
+            if shared and i == shared[0]:
+                tails = '|'.join(variant(j, patterns[j][len(shared_prefix):]) for j in shared)
+                branches.append(f'{shared_prefix}(?:{tails})')
+            elif i not in shared:
+                branches.append(variant(i, pattern))
+        try:
+            return self._compile_pattern('|'.join(branches))
+        except re.error:
+            return None
+    
+    def matches_any(self, style: str, text: str, pattern_type: str = 'in_text') -> bool:
+        """
+        Indica si alguna variante de un estilo aparece en el texto, sin extraer grupos.
+        
+        Usa copias de los patrones sin grupos de captura, probadas una a una: así cada
+        variante con un literal inicial conserva la búsqueda rápida de ese literal, que
+        una alternancia de variantes distintas perdería.
+        
+        Args:
+            style (str): Estilo de citación ('APA', 'MLA', etc.)
+            text (str): Texto a analizar
+            pattern_type (str): Tipo de patrón ('in_text' o 'bibliography')
+            
+        Returns:
+            bool: True si alguna variante coincide
+        """
+        if pattern_type == 'in_text':
+            patterns = self._nocap_in_text.get(style, [])
+        elif pattern_type == 'bibliography':
+            patterns = self._nocap_bibliography.get(style, [])
+        else:
+            return False
+        return any(pattern.search(text) for pattern in patterns)
+    
+    def iter_matches(self, style: str, text: str, pattern_type: str = 'in_text') -> Iterator[Tuple[int, re.Match]]:
+        """
+        Recorre el texto una sola vez buscando cualquier variante de un estilo.
+        
+        Las coincidencias no se solapan: en cada posición gana la primera variante que
+        coincide, en el orden de la lista. Los grupos con nombre de la coincidencia
+        llevan el sufijo "__i" de su variante (por ejemplo, "author__0"), salvo los del
+        comienzo que comparten varias variantes de bibliografía (ver _compile_union). Si
+        no hay alternancia para el estilo, se recorre cada variante por separado.
+        
+        Args:
+            style (str): Estilo de citación ('APA', 'MLA', etc.)
+            text (str): Texto a analizar
+            pattern_type (str): Tipo de patrón ('in_text' o 'bibliography')
+            
+        Returns:
+            Iterator[Tuple[int, re.Match]]: Pares (índice de la variante, coincidencia)
         """
-        # Compilar patrones in-text
-        self.compiled_in_text = {}
-        for style, patterns in self.in_text_patterns.items():
-            self.compiled_in_text[style] = [re.compile(p, re.MULTILINE) for p in patterns]
+        if pattern_type == 'in_text':
+            union = self.in_text_patterns_union.get(style)
+        elif pattern_type == 'bibliography':
+            union = self.bibliography_patterns_union.get(style)
+        else:
+            return
         
-        # Compilar patrones de bibliografía
-        self.compiled_bibliography = {}
-        for style, patterns in self.bibliography_patterns.items():
-            self.compiled_bibliography[style] = [re.compile(p, re.MULTILINE) for p in patterns]
+        if union is None:
+            for i, pattern in enumerate(self.get_pattern(style, pattern_type)):
+                for match in pattern.finditer(text):
+                    yield i, match
+            return
         
-        # Compilar encabezados
-        self.compiled_headers = {}
-        for style, patterns in self.bibliography_headers.items():
-            self.compiled_headers[style] = [re.compile(p, re.MULTILINE) for p in patterns]
+        prefix_length = len(self._VARIANT_GROUP)
+        for match in union.finditer(text):
+            # El grupo de la variante es el último en cerrarse
+            yield int(match.lastgroup[prefix_length:]), match
+    
+    def candidate_styles(self, line: str) -> List[str]:
+        """
+        Devuelve los estilos cuyos patrones de bibliografía pueden coincidir al comienzo
+        de una línea, mirando solo sus primeros caracteres. Los estilos descartados no
+        necesitan probar sus patrones sobre esa línea.
         
-        # Compilar patrones especiales
-        self.compiled_special = {}
-        for category, patterns in self.special_patterns.items():
-            self.compiled_special[category] = {}
-            for term, pattern in patterns.items():
-                self.compiled_special[category][term] = re.compile(pattern, re.MULTILINE)
+        Args:
+            line (str): Línea (entrada de bibliografía) a analizar
+            
+        Returns:
+            List[str]: Estilos candidatos, en el orden de bibliography_patterns
+        """
+        return [
+            style for style, prelude in self._bib_prelude.items()
+            if prelude is None or prelude.match(line)
+        ]
+    
+    def find_header_spans(self, text_lower: str) -> Iterator[Tuple[int, Tuple[str, str]]]:
+        """
+        Busca los encabezados de bibliografía literales que ocupan una línea completa,
+        como los patrones (?i)^texto$, recorriendo el texto una sola vez con
+        Aho-Corasick si está disponible. Sirve también para saber qué estilos (e
+        idioma) admite cada encabezado encontrado.
+        
+        Args:
+            text_lower (str): Texto ya pasado a minúsculas con str.lower()
+            
+        Returns:
+            Iterator[Tuple[int, Tuple[str, str]]]: Pares (posición final, exclusiva, del
+            encabezado; (estilo, encabezado)), por posición y con un par por cada estilo
+            que usa el encabezado
+        """
+        if self._header_automaton is not None:
+            found = ((last + 1, value) for last, value in self._header_automaton.iter(text_lower))
+        else:
+            found = []
+            for keyword_lower, (keyword, styles) in self._header_keywords.items():
+                pos = text_lower.find(keyword_lower)
+                while pos >= 0:
+                    found.append((pos + len(keyword_lower), (keyword_lower, keyword, styles)))
+                    pos = text_lower.find(keyword_lower, pos + 1)
+            # En una misma posición final solo puede acabar una línea completa
+            found.sort(key=lambda item: item[0])
+        
+        for end, (keyword_lower, keyword, styles) in found:
+            start = end - len(keyword_lower)
+            if ((start == 0 or text_lower[start - 1] == '\n')
+                    and (end == len(text_lower) or text_lower[end] == '\n')):
+                for style in styles:
+                    yield end, (style, keyword)
     
     def get_pattern(self, style: str, pattern_type: str, index: int = None) -> Union[Pattern, List[Pattern]]:
         """
@@ -706,7 +1186,7 @@ class CitationPatterns:
         Returns:
             Dict[str, List[Pattern]]: Diccionario con patrones por estilo
         """
-        return self.compiled_in_text
+        return dict(self.compiled_in_text)
     
     def get_all_bibliography_patterns(self) -> Dict[str, List[Pattern]]:
         """
@@ -715,7 +1195,7 @@ class CitationPatterns:
         Returns:
             Dict[str, List[Pattern]]: Diccionario con patrones por estilo
         """
-        return self.compiled_bibliography
+        return dict(self.compiled_bibliography)
     
     def get_all_header_patterns(self) -> Dict[str, List[Pattern]]:
         """
@@ -724,7 +1204,7 @@ class CitationPatterns:
         Returns:
             Dict[str, List[Pattern]]: Diccionario con patrones por estilo
         """
-        return self.compiled_headers
+        return dict(self.compiled_headers)
     
     def add_custom_pattern(self, style: str, pattern_type: str, pattern: str) -> bool:
         """
@@ -739,31 +1219,28 @@ class CitationPatterns:
             bool: True si se añadió correctamente, False en caso contrario
         """
         try:
-            compiled_pattern = re.compile(pattern, re.MULTILINE)
+            # Se compila ya para rechazar los patrones inválidos; lo compilado del
+            # estilo se descarta y se vuelve a compilar, con el patrón nuevo, al usarlo
+            self._compile_pattern(pattern)
             
             if pattern_type == 'in_text':
-                if style not in self.in_text_patterns:
-                    self.in_text_patterns[style] = []
-                    self.compiled_in_text[style] = []
-                
-                self.in_text_patterns[style].append(pattern)
-                self.compiled_in_text[style].append(compiled_pattern)
+                self.in_text_patterns.setdefault(style, []).append(pattern)
+                self.compiled_in_text.invalidate(style)
+                self._nocap_in_text.invalidate(style)
+                self.in_text_patterns_union.invalidate(style)
                 
             elif pattern_type == 'bibliography':
-                if style not in self.bibliography_patterns:
-                    self.bibliography_patterns[style] = []
-                    self.compiled_bibliography[style] = []
-                
-                self.bibliography_patterns[style].append(pattern)
-                self.compiled_bibliography[style].append(compiled_pattern)
+                self.bibliography_patterns.setdefault(style, []).append(pattern)
+                self.compiled_bibliography.invalidate(style)
+                self._nocap_bibliography.invalidate(style)
+                self.bibliography_patterns_union.invalidate(style)
+                # El patrón nuevo no tiene por qué empezar como los del estilo
+                self._bib_prelude[style] = None
                 
             elif pattern_type == 'headers':
-                if style not in self.bibliography_headers:
-                    self.bibliography_headers[style] = []
-                    self.compiled_headers[style] = []
-                
-                self.bibliography_headers[style].append(pattern)
-                self.compiled_headers[style].append(compiled_pattern)
+                self.bibliography_headers.setdefault(style, []).append(pattern)
+                self.compiled_headers.invalidate(style)
+                self._build_header_keywords()
                 
             else:
                 return False
@@ -774,10 +1251,40 @@ class CitationPatterns:
             return False
 
 
+# Instancias compartidas, una por combinación de motores (ver get_citation_patterns)
+_shared_patterns = {}
+_shared_patterns_lock = threading.Lock()
+
+
+def get_citation_patterns(use_re2: bool = False, use_pcre_jit: bool = False) -> CitationPatterns:
+    """
+    Devuelve una instancia de CitationPatterns compartida por todo el proceso, creada
+    la primera vez que se pide, para no recompilar los patrones en cada documento.
+    
+    La instancia es común a todos los llamadores: para añadir patrones personalizados
+    con add_custom_pattern debe crearse una propia con CitationPatterns().
+    
+    Args:
+        use_re2 (bool): Si se debe usar re2 para los patrones que lo admitan
+        use_pcre_jit (bool): Si se debe usar PCRE2 con JIT para los patrones que lo admitan
+        
+    Returns:
+        CitationPatterns: La instancia compartida
+    """
+    key = (use_re2, use_pcre_jit)
+    patterns = _shared_patterns.get(key)
+    if patterns is None:
+        with _shared_patterns_lock:
+            patterns = _shared_patterns.get(key)
+            if patterns is None:
+                patterns = _shared_patterns[key] = CitationPatterns(use_re2, use_pcre_jit)
+    return patterns
+
+
 # Ejemplo de uso
 if __name__ == "__main__":
-    # Crear una instancia de patrones
-    patterns = CitationPatterns()
+    # Obtener la instancia compartida de patrones
+    patterns = get_citation_patterns()
     
     # Obtener todos los patrones de citas en texto para APA
     apa_patterns = patterns.get_all_in_text_patterns().get('APA', [])
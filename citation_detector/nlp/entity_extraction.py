@@ -1069,20 +1069,16 @@ class CitationEntityExtractor:
             author = authors[0] if authors else ""
             year = years[0] if years else ""
             
-            # Buscar coincidencias en la bibliografía
-            matches = []
-            for bib_entry in bibliography:
+            # Buscar la primera coincidencia en la bibliografía
+            for bib_idx, bib_entry in enumerate(bibliography):
                 bib_authors = bib_entry.get('authors', [])
                 bib_years = bib_entry.get('year', [])
                 
-                # Verificar coincidencia
+                # Verificar coincidencia y añadir referencia a la entrada bibliográfica
                 if self._is_matching_citation_entities(author, year, bib_authors, bib_years, style):
-                    matches.append(bib_entry)
-            
-            # Añadir referencia a entrada bibliográfica
-            if matches:
-                in_text[i]['bibliography_ref'] = matches[0].get('text', '')
-                in_text[i]['bibliography_idx'] = bibliography.index(matches[0])
+                    in_text[i]['bibliography_ref'] = bib_entry.get('text', '')
+                    in_text[i]['bibliography_idx'] = bib_idx
+                    break
         
         # Combinar las listas
         return in_text + bibliography
@@ -0,0 +1,153 @@
+# Pruebas de CitationStyleDetector
+# test_detector.py
+
+import re
+
+import pytest
+
+from citation_detector.core.detector import CitationStyleDetector, _count_matches, _is_line_anchored
+
+
+@pytest.fixture(scope='module')
+def detector():
+    return CitationStyleDetector()
+
+
+def _authors(entries):
+    return [entry.get('author') for entry in entries]
+
+
+def test_bibliography_entry_wrapped_over_two_lines(detector):
+    text = (
+        "Introducción (Brown, 2018).\n\n"
+        "References\n"
+        "Brown, M. (2018). Contrasting methodologies in social research.\n"
+        "    Research Methods, 12(3), 45-67.\n"
+        "Smith, J. A. (2020). A book title. Penguin.\n"
+    )
+    entries = detector._extract_bibliography_entries(text, 'APA')
+    assert _authors(entries) == ['Brown, M.', 'Smith, J. A.']
+    # La línea de continuación sigue unida a su entrada
+    assert entries[0]['pages'] == '45-67'
+
+
+def test_bibliography_entries_with_list_markers(detector):
+    text = (
+        "Introducción.\n\n"
+        "References\n"
+        "1. Smith, J. A. (2020). A book title. Penguin.\n"
+        "- Brown, M. (2018). Contrasting methodologies. Research Methods, 12(3), 45-67.\n"
+    )
+    entries = detector._extract_bibliography_entries(text, 'APA')
+    assert _authors(entries) == ['Smith, J. A.', 'Brown, M.']
+
+
+def test_bibliography_entries_with_accented_and_particle_surnames(detector):
+    text = (
+        "Introducción (Smith, 2020).\n\n"
+        "References\n"
+        "Smith, J. A. (2020). A book title. Penguin.\n"
+        "Brown, M. (2018). Contrasting methodologies. Research Methods, 12(3), 45-67.\n"
+        "van Dijk, T. (2015). Discourse and power. Palgrave.\n"
+        "Álvarez, J. (2019). Un libro. Planeta.\n"
+    )
+    entries = detector._extract_bibliography_entries(text, 'APA')
+    # Cada línea no sangrada es una entrada, aunque no empiece por una mayúscula ASCII
+    assert [entry['year'] for entry in entries] == ['2020', '2018', '2015', '2019']
+    assert _authors(entries)[:2] == ['Smith, J. A.', 'Brown, M.']
+
+
+def test_bibliography_entries_have_only_matched_fields(detector):
+    text = (
+        "Como dice (Smith, 2020).\n\n"
+        "References\n"
+        "Smith, J. A. (2020). A book title. Penguin.\n"
+    )
+    entries = detector._extract_bibliography_entries(text, 'APA')
+    # Los valores normalizados para las comparaciones no se guardan en las entradas
+    assert entries and not any(key.startswith('_') for entry in entries for key in entry)
+
+
+def test_numbered_bibliography_entries_counted_once(detector):
+    text = (
+        "Introducción.\n\n"
+        "References\n"
+        "1. Doe AB, Roe CD. A title here. J Med. 2001;3(2):4-5.\n"
+        "2. Lee K. Other title. Lancet. 2002;4:5-9.\n"
+    )
+    entries = detector._extract_bibliography_entries(text, 'VANCOUVER')
+    assert [(entry['number'], entry['author']) for entry in entries] == [('1', 'Doe AB'), ('2', 'Lee K')]
+
+
+@pytest.mark.parametrize('source', [
+    r'^Fig\. \d+|see \d+',  # Solo la primera rama está anclada
+    r'^(?P<note>\d+)\.\s',
+    r'^(?:Fig|see) \d+',
+    r'^a|^b',
+    r'^$',
+])
+@pytest.mark.parametrize('start', [0, 3, 20])
+def test_count_matches_equals_findall(source, start):
+    pattern = re.compile(source, re.MULTILINE)
+    text = "Fig. 1 shows it, see 3 and see 4.\nAlso see 5.\n\nFig. 2 here.\n1. Nota\nb"
+    assert _count_matches([pattern], text, start) == len(pattern.findall(text, start))
+
+
+def test_alternated_pattern_is_not_line_anchored():
+    assert not _is_line_anchored(re.compile(r'^Fig\. \d+|see \d+', re.MULTILINE))
+    assert _is_line_anchored(re.compile(r'^(?:Fig|see) \d+', re.MULTILINE))
+
+
+def test_alternated_custom_pattern_counts_every_branch():
+    pattern = re.compile(r'^Fig\. \d+|see \d+', re.MULTILINE)
+    text = "Fig. 1 shows it, see 3 and see 4.\nAlso see 5.\nFig. 2 here."
+    assert _count_matches([pattern], text) == 5
+
+
+def test_re2_patterns_are_compiled_with_re2(detector, capfd):
+    pytest.importorskip('re2')
+    from citation_detector.core.patterns import Re2Pattern
+    
+    re2_detector = CitationStyleDetector(use_re2=True)
+    # Los patrones con ¹ y similares también se traducen para re2
+    assert all(isinstance(pattern, Re2Pattern) for pattern in re2_detector.in_text_patterns['VANCOUVER'])
+    assert isinstance(re2_detector._full_citation_unions['VANCOUVER'], Re2Pattern)
+    assert isinstance(re2_detector._in_text_unions['VANCOUVER'], Re2Pattern)
+    # re2 no escribe errores de compilación en stderr
+    assert capfd.readouterr().err == ''
+    
+    texts = [
+        "Según (Smith, 2020) y (Brown & Lee, 2019, p. 45), además [1], [2-4].\n\n"
+        "References\nSmith, J. A. (2020). A book title. Penguin.\n",
+        # Dígitos no ASCII, superíndices y espacios Unicode
+        "Como dice Smith (2020)¹ y Pérez (٢٠١٩), véase² (Müller 2018, 12).\n"
+        "[1] J. Doe, \"Paper,\" IEEE Trans., vol. 3, pp. 1-5, 2001.\n",
+    ]
+    for text in texts:
+        assert re2_detector.detect_citation_styles(text) == detector.detect_citation_styles(text)
+        assert re2_detector.extract_citations(text) == detector.extract_citations(text)
+
+
+def test_process_pool_matches_serial_detection(detector):
+    # Por encima de _PARALLEL_THRESHOLD los patrones se reparten entre procesos
+    paragraph = "Según (Smith, 2020) y Brown (2019, p. 4), además [1], (Lee 45) y texto¹.\n"
+    text = paragraph * (CitationStyleDetector._PARALLEL_THRESHOLD // len(paragraph) + 1)
+    with CitationStyleDetector(max_workers=2) as parallel:
+        assert parallel.detect_citation_styles(text) == detector.detect_citation_styles(text)
+        pool = parallel._pool
+        assert pool is not None
+    # Al salir del bloque with el pool se cierra y no acepta más trabajos
+    assert parallel._pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(len, text)
+
+
+def test_process_pool_shut_down_when_detector_is_released():
+    import gc
+    
+    parallel = CitationStyleDetector(max_workers=2)
+    pool = parallel._get_pool()
+    del parallel
+    gc.collect()
+    with pytest.raises(RuntimeError):
+        pool.submit(len, '')
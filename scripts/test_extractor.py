@@ -0,0 +1,49 @@
+# Pruebas de CitationExtractor
+# test_extractor.py
+
+import re
+
+import pytest
+
+from citation_detector.core.extractor import CitationExtractor
+
+
+SAMPLE_TEXT = (
+    "Según (Smith, 2020) y García López (2019, p. 4-6), además (Smith 45) y Brown and Lee (12).\n"
+    "(Smith 2020, 45), (Smith and Brown 2018, 12), [1], [2-4] y texto¹ (Lee et al., 2001).\n"
+    "Ávila-Pérez et al. (2018) y (Jones and Lee 112-115)."
+)
+
+
+def test_regex_in_text_patterns_match_re():
+    regex = pytest.importorskip('regex')
+    
+    source = r'\((?:[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?(?:,| &| y) )?[A-Za-zÀ-ÿ\-]+, \d{4}\)'
+    compiled = CitationExtractor._compile_in_text_pattern(source)
+    # Con nombres de autor y sin re2 en medio, el patrón lo compila regex
+    assert isinstance(getattr(compiled, 'fallback', compiled), regex.Pattern)
+    assert compiled.findall(SAMPLE_TEXT) == re.findall(source, SAMPLE_TEXT)
+    
+    # Los cuantificadores posesivos no cambian las coincidencias
+    for patterns in CitationExtractor().in_text_patterns.values():
+        for pattern in patterns:
+            baseline = re.compile(pattern.pattern.replace('++', '+'))
+            assert [match.span() for match in pattern.finditer(SAMPLE_TEXT)] == \
+                [match.span() for match in baseline.finditer(SAMPLE_TEXT)]
+
+
+def test_chicago_headers_do_not_outweigh_in_text_citations():
+    # Los encabezados de Chicago ("Notes", "Bibliography") no suman puntos: decide
+    # la única cita en texto, de APA
+    text = (
+        "Texto (Smith, 2020).\n\n"
+        "Notes\n\n"
+        "Bibliography\n"
+        "Smith, J. (2020). Title. Pub.\n"
+    )
+    assert CitationExtractor()._detect_citation_style(text) == 'APA'
+
+
+def test_chicago_notes_detected_with_header():
+    text = "Texto.\n\nNotes\n1. Smith, Título breve, 23.\nIbid., 4.\nIbid., 7.\n"
+    assert CitationExtractor()._detect_citation_style(text) == 'CHICAGO'
@@ -0,0 +1,342 @@
+# Pruebas de CitationPatterns
+# test_patterns.py
+
+import re
+
+import pytest
+
+from citation_detector.core.patterns import CitationPatterns
+
+
+# Patrones tal y como estaban escritos antes de construirlos con los fragmentos
+# comunes (_SURNAME, _AUTHOR, _YEAR, _PAGE)
+PREVIOUS_IN_TEXT = {
+    'APA': [
+        r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?),\s(?P<year>\d{4})\)',
+        r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?),\s(?P<year>\d{4}),\s(?P<page>p\.?\s\d+(?:-\d+)?)\)',
+        r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s\((?P<year>\d{4})\)',
+        r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?)\s\((?P<year>\d{4}),\s(?P<page>p\.?\s\d+(?:-\d+)?)\)',
+        r'\((?P<author1>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s&\s(?P<author2>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?),\s(?P<year>\d{4})(?:,\s(?P<page>p\.?\s\d+(?:-\d+)?))?\)',
+        r'(?P<author1>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\sy\s(?P<author2>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s\((?P<year>\d{4})(?:,\s(?P<page>p\.?\s\d+(?:-\d+)?))?\)',
+        r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\set\sal\.,\s(?P<year>\d{4})(?:,\s(?P<page>p\.?\s\d+(?:-\d+)?))?\)',
+        r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\set\sal\.\s\((?P<year>\d{4})(?:,\s(?P<page>p\.?\s\d+(?:-\d+)?))?\)',
+        r'\((?:(?:[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?),\s\d{4}(?:,\sp\.?\s\d+(?:-\d+)?)?;\s?)+(?:[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?(?: et al\.)?),\s\d{4}(?:,\sp\.?\s\d+(?:-\d+)?)?\)',
+    ],
+    'MLA': [
+        r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s(?P<page>\d+(?:-\d+)?)\)',
+        r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s\((?P<page>\d+(?:-\d+)?)\)',
+        r'\((?P<author1>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\sand\s(?P<author2>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s(?P<page>\d+(?:-\d+)?)\)',
+        r'(?P<author1>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\sand\s(?P<author2>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s\((?P<page>\d+(?:-\d+)?)\)',
+        r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\set\sal\.\s(?P<page>\d+(?:-\d+)?)\)',
+        r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\set\sal\.\s\((?P<page>\d+(?:-\d+)?)\)',
+        r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?),\s[""](?P<title>[^""]+)[""]\s(?P<page>\d+(?:-\d+)?)\)',
+        r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\)',
+    ],
+    'CHICAGO_AUTHOR_DATE': [
+        r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s(?P<year>\d{4})(?:,\s(?P<page>\d+(?:-\d+)?))?\)',
+        r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s\((?P<year>\d{4})(?:,\s(?P<page>\d+(?:-\d+)?))?\)',
+        r'\((?P<author1>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\sand\s(?P<author2>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s(?P<year>\d{4})(?:,\s(?P<page>\d+(?:-\d+)?))?\)',
+        r'\((?:(?:[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s\d{4}(?:,\s\d+(?:-\d+)?)?;\s)+(?:[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s\d{4}(?:,\s\d+(?:-\d+)?)?\)',
+    ],
+    'CHICAGO_NOTES': [
+        r'(?:^|\s)(?P<note_num>\d+)\.\s',
+        r'(?:^|\s)(?P<term>Ibid\.|Op\.\scit\.|Loc\.\scit\.)(?:,\s(?P<page>\d+(?:-\d+)?))?\.',
+        r'(?P<superscript>[¹²³⁴⁵⁶⁷⁸⁹⁰]+)',
+    ],
+    'HARVARD': [
+        r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?),\s(?P<year>\d{4})(?::\s(?P<page>\d+(?:-\d+)?))?\)',
+        r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s\((?P<year>\d{4})(?::\s(?P<page>\d+(?:-\d+)?))?\)',
+        r'\((?P<author1>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\sand\s(?P<author2>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?),\s(?P<year>\d{4})(?::\s(?P<page>\d+(?:-\d+)?))?\)',
+        r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\set\sal\.,\s(?P<year>\d{4})(?::\s(?P<page>\d+(?:-\d+)?))?\)',
+        r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?),\s(?:\d{4}(?::\s\d+(?:-\d+)?)?;\s)+\d{4}(?::\s\d+(?:-\d+)?)?\)',
+    ],
+    'IEEE': [
+        r'\[(?P<ref_num>\d+)\]',
+        r'\[(?P<ref_nums>\d+(?:,\s*\d+)*)\]',
+        r'\[(?P<ref_num>\d+),\s(?P<text>[^\]]+)\]',
+    ],
+    'VANCOUVER': [
+        r'\((?P<ref_num>\d+)\)',
+        r'\[(?P<ref_num>\d+)\]',
+        r'\[(?P<ref_nums>\d+(?:-\d+|\s*,\s*\d+)*)\]',
+        r'(?P<superscript>[¹²³⁴⁵⁶⁷⁸⁹⁰]+)',
+    ],
+    'CSE': [
+        r'\((?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s(?P<year>\d{4})\)',
+        r'(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s(?P<year>\d{4})',
+        r'\((?P<author1>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\sand\s(?P<author2>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\s(?P<year>\d{4})\)',
+        r'\[(?P<ref_num>\d+)\]',
+        r'\[(?P<author>[A-Za-zÀ-ÿ\-]+(?:\s[A-Za-zÀ-ÿ\-]+)?)\]',
+    ],
+}
+
+PREVIOUS_BIBLIOGRAPHY = {
+    'APA': [
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*(?:,?\s&\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?\s\((?P<year>\d{4})\)\.\s(?P<title>[^\.]+)\.(?:\s\([^)]+\)\.)?(?:\s(?P<edition>\d+[a-zª]+\sed\.))?(?:\s(?P<volume>Vol\.\s\d+))?\s(?P<publisher>[^\.]+)\.',
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*(?:,?\s&\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?\s\((?P<year>\d{4})\)\.\s(?P<title>[^\.]+)\.\s(?P<journal>[^,]+),\s(?P<volume>\d+)(?:\((?P<issue>\d+)\))?,\s(?P<pages>\d+(?:-\d+)?)\.',
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*(?:,?\s&\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?\s\((?P<year>\d{4})\)\.\s(?P<chapter_title>[^\.]+)\.\sEn\s(?:(?P<editor>[A-Za-zÀ-ÿ\-]+)(?:\s[A-Z]\.(?:\s[A-Z]\.)?)?)+(?:(?:,\s|\s&\s)(?:[A-Za-zÀ-ÿ\-]+)(?:\s[A-Z]\.(?:\s[A-Z]\.)?)?)*(?:\s\(Ed[s]?\.\)|\s\(Eds\.\))?,\s(?P<book_title>[^(]+)(?:\s\((?:pp\.|p\.)\s(?P<pages>\d+(?:-\d+)?)\))\.\s(?P<publisher>[^\.]+)\.',
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*(?:,?\s&\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?\s\((?P<year>\d{4})(?:,\s[A-Za-zÀ-ÿ]+\s\d+)?\)\.\s(?P<title>[^\.]+)\.\s(?P<site>[^\.]+)\.(?:\s(?P<url>https?://[^\s]+))?',
+    ],
+    'MLA': [
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)(?:\.|,)(?:,\sand\s[A-Za-zÀ-ÿ\-\s]+)?\s(?P<title>[^\.]+)(?:\.|,)(?:\stranslated\sby\s[A-Za-zÀ-ÿ\-\s]+,)?(?:\s(?P<edition>\d+[a-z]{2}\sed\.)?,)?(?:\s(?P<volume>vol\.\s\d+)?,)?\s(?P<publisher>[^,]+),\s(?P<year>\d{4})\.',
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)(?:\.|,)(?:,\sand\s[A-Za-zÀ-ÿ\-\s]+)?\s[""](?P<title>[^""]+)[""]\.\s(?P<journal>[^,]+),\svol\.\s(?P<volume>\d+),(?:\sno\.\s(?P<issue>\d+),)?\s(?P<year>\d{4}),\spp\.\s(?P<pages>\d+(?:-\d+)?).',
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)(?:\.|,)(?:,\sand\s[A-Za-zÀ-ÿ\-\s]+)?\s[""](?P<chapter_title>[^""]+)[""]\.\s(?P<book_title>[^,]+),(?:\sedited\sby\s[A-Za-zÀ-ÿ\-\s]+,)?\s(?P<publisher>[^,]+),\s(?P<year>\d{4}),\spp\.\s(?P<pages>\d+(?:-\d+)?).',
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)?(?:(?:\.|,)\s)?(?:[""])?(?P<title>[^""]+)(?:[""])?\.\s(?P<site>[^,]+),(?:\s(?P<publisher>[^,]+),)?(?:\s(?P<date>\d+\s[A-Za-zÀ-ÿ]+\s\d{4}|\d{1,2}\s[A-Za-zÀ-ÿ]+\.?\s\d{4}),)?(?:\s(?P<url>(?:www|http|https)[^,\s]+))?(?:,\sAccessed\s(?P<access_date>\d+\s[A-Za-zÀ-ÿ]+\s\d{4}|(?:[A-Za-zÀ-ÿ]+\.|[A-Za-zÀ-ÿ]+)\s\d{1,2},\s\d{4}))?',
+    ],
+    'CHICAGO': [
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)(?:,\s[A-Za-zÀ-ÿ\-\s]+)*(?:,\sand\s[A-Za-zÀ-ÿ\-\s]+)?(?:\.|,)\s(?P<title>[^\.]+)\.(?:\s(?P<edition>\d+[a-z]{2}\sed\.))?(?:\s(?P<volume>Vol\.\s\d+))?\s(?P<city>[A-Za-zÀ-ÿ\-\s]+):\s(?P<publisher>[^,]+),\s(?P<year>\d{4})\.',
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)(?:,\s[A-Za-zÀ-ÿ\-\s]+)*(?:,\sand\s[A-Za-zÀ-ÿ\-\s]+)?(?:\.|,)\s[""](?P<title>[^""]+)[""]\.\s(?P<journal>[^""\d]+)\s(?P<volume>\d+)(?:,\sno\.\s(?P<issue>\d+))?\s\((?P<year>\d{4})\):\s(?P<pages>\d+(?:-\d+)?)\.',
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)(?:,\s[A-Za-zÀ-ÿ\-\s]+)*(?:,\sand\s[A-Za-zÀ-ÿ\-\s]+)?(?:\.|,)\s[""](?P<chapter_title>[^""]+)[""]\.\sIn\s(?P<book_title>[^,]+),(?:\sedited\sby\s[A-Za-zÀ-ÿ\-\s]+(?:,\s[A-Za-zÀ-ÿ\-\s]+)*(?:\sand\s[A-Za-zÀ-ÿ\-\s]+)?,)?\s(?P<pages>\d+(?:-\d+)?)\.\s(?P<city>[A-Za-zÀ-ÿ\-\s]+):\s(?P<publisher>[^,]+),\s(?P<year>\d{4})\.',
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Za-zÀ-ÿ\-\s]+)(?:,\s[A-Za-zÀ-ÿ\-\s]+)*(?:,\sand\s[A-Za-zÀ-ÿ\-\s]+)?(?:\.|,)\s[""](?P<title>[^""]+)[""]\.\s(?P<site>[^\.]+)\.(?:\s(?P<date>[A-Za-zÀ-ÿ]+\s\d+,\s\d{4})\.)?(?:\s(?P<url>https?://[^\s]+)\.)?(?:\sAccessed\s(?P<access_date>[A-Za-zÀ-ÿ]+\s\d+,\s\d{4})\.)?',
+    ],
+    'CHICAGO_NOTES': [
+        r'^(?P<note_num>\d+\.\s)(?P<author>[A-Za-zÀ-ÿ\-\s]+),\s(?P<title>[^(]+)(?:\s\((?P<city>[A-Za-zÀ-ÿ\-\s]+):\s(?P<publisher>[^,]+),\s(?P<year>\d{4})\)),\s(?P<page>\d+(?:-\d+)?).',
+        r'^(?P<note_num>\d+\.\s)(?P<author>[A-Za-zÀ-ÿ\-\s]+),\s[""](?P<title>[^""]+)[""]\,\s(?P<journal>[^""\d]+)\s(?P<volume>\d+)(?:,\sno\.\s(?P<issue>\d+))?\s\((?P<year>\d{4})\):\s(?P<pages>\d+(?:-\d+)?)\.',
+        r'^(?P<note_num>\d+\.\s)(?P<term>Ibid\.),\s(?P<page>\d+(?:-\d+)?).',
+        r'^(?P<note_num>\d+\.\s)(?P<term>Ibid\.)\.',
+    ],
+    'HARVARD': [
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*(?:\sand\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?\s\((?P<year>\d{4})\)\s(?P<title>[^\.]+)\.(?:\s(?P<edition>\d+[a-z]{2}\sed\.))?\s(?P<city>[A-Za-zÀ-ÿ\-\s]+):\s(?P<publisher>[^\.]+)\.',
+        r"^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*(?:\sand\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?\s\((?P<year>\d{4})\)\s\'(?P<title>[^\']+)\',\s(?P<journal>[^,]+),\s(?P<volume>\d+)(?:\((?P<issue>\d+)\))?,\spp\.\s(?P<pages>\d+(?:-\d+)?)\.",
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)(?:,\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)*(?:\sand\s[A-Za-zÀ-ÿ\-]+,\s[A-Z]\.(?:\s[A-Z]\.)?)?\s\((?P<year>\d{4})\)\s(?P<title>[^\.]+)\s\[Online\]\.(?:\s(?:Available|Disponible)\s(?:at|en):\s(?P<url>https?://[^\s]+))?(?:\s\[(?:Accessed|Accedido):\s(?P<access_date>\d+\s[A-Za-zÀ-ÿ]+\s\d{4})\])?',
+    ],
+    'IEEE': [
+        r'^\[(?P<ref_num>\d+)\]\s(?P<author>[A-Za-zÀ-ÿ\-\.\s]+),\s(?P<title>[^,]+),(?:\s(?P<edition>\d+[a-z]{2}\sed\.)?,)?\s(?P<city>[A-Za-zÀ-ÿ\-\s]+):\s(?P<publisher>[^,]+),\s(?P<year>\d{4})(?:,\spp\.\s(?P<pages>\d+(?:-\d+)?))?\.',
+        r'^\[(?P<ref_num>\d+)\]\s(?P<author>[A-Za-zÀ-ÿ\-\.\s]+),\s[""](?P<title>[^""]+)[""]\,\s(?P<journal>[^,]+),\svol\.\s(?P<volume>\d+),(?:\sno\.\s(?P<issue>\d+),)?\spp\.\s(?P<pages>\d+(?:-\d+)?),\s(?P<date>[A-Za-zÀ-ÿ]+\.\s\d{4})\.',
+        r'^\[(?P<ref_num>\d+)\]\s(?P<author>[A-Za-zÀ-ÿ\-\.\s]+)?(?:,\s)?[""](?P<title>[^""]+)[""]\,(?:\s(?P<site>[^,]+),)?(?:\s(?P<date>[A-Za-zÀ-ÿ]+\.\s\d{1,2},\s\d{4}),)?(?:\s(?:Available|Disponible):\s(?P<url>https?://[^\s]+))?(?:\s\[(?:Accessed|Accedido):\s(?P<access_date>[A-Za-zÀ-ÿ]+\.\s\d{1,2},\s\d{4})\])?',
+    ],
+    'VANCOUVER': [
+        r'^(?P<ref_num>\d+\.\s)?(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*(?:,\set\sal)?\.\s(?P<title>[^\.]+)\.\s(?P<journal>[^\.]+)\.\s(?P<year>\d{4})(?:;(?P<volume>\d+)(?:\((?P<issue>\d+)\))?:(?P<pages>\d+(?:-\d+)?))?\.',
+        r'^(?P<ref_num>\d+\.\s)?(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*(?:,\set\sal)?\.\s(?P<title>[^\.]+)\.(?:\s(?P<edition>\d+[a-z]{2}\sed\.))?\s(?P<city>[A-Za-zÀ-ÿ\-\s]+):\s(?P<publisher>[^;]+);\s(?P<year>\d{4})(?:\.\s(?P<pages>\d+)\sp)?',
+        r'^(?P<ref_num>\d+\.\s)?(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*(?:,\set\sal)?\.\s(?P<chapter_title>[^\.]+)\.\sIn:\s(?P<editor>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*(?:,\seditors)?\.\s(?P<book_title>[^\.]+)\.(?:\s(?P<edition>\d+[a-z]{2}\sed\.))?\s(?P<city>[A-Za-zÀ-ÿ\-\s]+):\s(?P<publisher>[^;]+);\s(?P<year>\d{4})(?:\.\sp\.\s(?P<pages>\d+(?:-\d+)?))?\.',
+        r'^(?P<ref_num>\d+\.\s)?(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})?(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*(?:,\set\sal)?(?:\.)?\s(?P<title>[^\.]+)\s\[Internet\]\.(?:\s(?P<city>[A-Za-zÀ-ÿ\-\s]+):\s(?P<publisher>[^;]+);)?(?:\s(?P<year>\d{4}))?(?:\s\[(?:cited|consultado)\s(?P<access_date>\d{4}\s[A-Za-zÀ-ÿ]+\s\d{1,2})\])?(?:\.\sAvailable\sfrom:\s(?P<url>https?://[^\s]+))?',
+    ],
+    'CSE': [
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*(?:,\set\sal)?\.\s(?P<year>\d{4})\.\s(?P<title>[^\.]+)\.\s(?P<journal>[^\.]+)\.\s(?P<volume>\d+)(?:\((?P<issue>\d+)\))?:(?P<pages>\d+(?:-\d+)?)\.',
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*(?:,\set\sal)?\.\s(?P<year>\d{4})\.\s(?P<title>[^\.]+)\.(?:\s(?P<edition>\d+[a-z]{2}\sed\.))?\s(?P<city>[A-Za-zÀ-ÿ\-\s]+)(?:\s\([A-Z]{2}\))?:\s(?P<publisher>[^\.]+)(?:\.\s(?P<pages>\d+)\sp)?',
+        r'^(?P<ref_num>\d+\.\s)?(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*(?:,\set\sal)?\.\s(?P<title>[^\.]+)\.\s(?P<journal>[^\.]+)\.\s(?P<year>\d{4});(?P<volume>\d+)(?:\((?P<issue>\d+)\))?:(?P<pages>\d+(?:-\d+)?)\.',
+        r'^(?P<author>[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})?(?:,\s[A-Za-zÀ-ÿ\-]+\s[A-Z]{1,2})*(?:,\set\sal)?(?:\.)?\s(?P<year>\d{4})\.\s(?P<title>[^\.]+)\s\[Internet\]\.(?:\s(?P<city>[A-Za-zÀ-ÿ\-\s]+)(?:\s\([A-Z]{2}\))?:\s(?P<publisher>[^;]+);)?(?:\s\[(?:cited|accessed)\s(?P<access_date>\d{4}\s[A-Za-zÀ-ÿ]+\s\d{1,2})\])?(?:\.\sAvailable\sfrom:\s(?P<url>https?://[^\s]+))?',
+    ],
+}
+
+
+# Citas de ejemplo que deben encontrar los patrones de cada estilo
+SAMPLE_IN_TEXT = {
+    'APA': ['(Smith, 2020)', '(Smith, 2020, p. 45)', 'García López (2019, p. 4-6)',
+            '(Smith & Brown, 2018)', 'Smith y Brown (2018)', '(Lee et al., 2001)',
+            '(Smith, 2020; Brown et al., 2018, p. 3)'],
+    'MLA': ['(Smith 45)', 'Smith (45-47)', '(Smith and Brown 12)', '(Lee et al. 7)'],
+    'CHICAGO_AUTHOR_DATE': ['(Smith 2020, 45)', '(Smith 2020)', '(Smith and Brown 2018, 12)'],
+    'CHICAGO_NOTES': ['Ibid., 4.', 'Smith, Título breve, 23.'],
+    'HARVARD': ['(Smith, 2020)', '(Smith 2020, p. 45)', 'Smith (2020)'],
+    'IEEE': ['[1]', '[2, 3]', '[4-6]'],
+    'VANCOUVER': ['(1)', '[2]', 'texto¹', '(3-5)'],
+    'CSE': ['(Smith 2020)', '[1]', '(Smith and Brown 2018)'],
+}
+
+SAMPLE_BIBLIOGRAPHY = {
+    'APA': 'Smith, J. A. (2020). A book title. Penguin.\n'
+           'Brown, M. (2018). Contrasting methodologies. Research Methods, 12(3), 45-67.',
+    'MLA': 'Smith, John. A Book Title. Penguin, 2020.',
+    'CHICAGO': 'Smith, John. A Book Title. New York: Penguin, 2020.',
+    'HARVARD': 'Smith, J. (2020) A book title. London: Penguin.',
+    'IEEE': '[1] J. Doe, "A paper title", IEEE Trans. Softw. Eng., vol. 3, no. 2, pp. 1-5, Jan. 2001.',
+    'VANCOUVER': '1. Doe AB, Roe CD. A title here. J Med. 2001;3(2):4-5.',
+    'CSE': 'Smith J. 2020. A book title. New York: Penguin.',
+}
+
+
+@pytest.fixture(scope='module')
+def patterns():
+    return CitationPatterns()
+
+
+def _matches(pattern, text):
+    return [(match.span(), match.groupdict()) for match in pattern.finditer(text)]
+
+
+@pytest.mark.parametrize('style', PREVIOUS_IN_TEXT)
+def test_in_text_sources_unchanged(patterns, style):
+    assert patterns.in_text_patterns[style] == PREVIOUS_IN_TEXT[style]
+
+
+@pytest.mark.parametrize('style', PREVIOUS_BIBLIOGRAPHY)
+def test_bibliography_sources_unchanged(patterns, style):
+    assert patterns.bibliography_patterns[style] == PREVIOUS_BIBLIOGRAPHY[style]
+
+
+@pytest.mark.parametrize('style', SAMPLE_IN_TEXT)
+def test_in_text_samples_match_like_previous_literals(patterns, style):
+    text = ' y '.join(SAMPLE_IN_TEXT[style])
+    found = False
+    for compiled, literal in zip(patterns.get_pattern(style, 'in_text'), PREVIOUS_IN_TEXT[style]):
+        matches = _matches(compiled, text)
+        assert matches == _matches(re.compile(literal, re.MULTILINE), text)
+        found = found or bool(matches)
+    assert found
+
+
+@pytest.mark.parametrize('style', SAMPLE_BIBLIOGRAPHY)
+def test_bibliography_samples_match_like_previous_literals(patterns, style):
+    text = SAMPLE_BIBLIOGRAPHY[style]
+    found = False
+    for compiled, literal in zip(patterns.get_pattern(style, 'bibliography'), PREVIOUS_BIBLIOGRAPHY[style]):
+        matches = _matches(compiled, text)
+        assert matches == _matches(re.compile(literal, re.MULTILINE), text)
+        found = found or bool(matches)
+    assert found
+
+
+# Texto con citas en texto, entradas de bibliografía y encabezados de varios estilos
+SAMPLE_TEXT = (
+    "Según (Smith, 2020) y García López (2019, p. 4-6), además (Smith 45) y [1], [2-4].\n"
+    "Ibid., 4.\n"
+    "(Smith 2020, 45) y texto¹ (Lee et al., 2001).\n\n"
+    "References\n"
+    + SAMPLE_BIBLIOGRAPHY['APA'] + "\n"
+    + SAMPLE_BIBLIOGRAPHY['VANCOUVER'] + "\n"
+    + SAMPLE_BIBLIOGRAPHY['IEEE'] + "\n\n"
+    "BIBLIOGRAFÍA\n"
+    + SAMPLE_BIBLIOGRAPHY['CHICAGO'] + "\n"
+    "Works Cited\n"
+    "  References\n"
+    "Referencias bibliográficas"
+)
+
+PATTERN_TYPES = ('in_text', 'bibliography')
+
+
+def _sources(patterns, pattern_type):
+    return patterns.in_text_patterns if pattern_type == 'in_text' else patterns.bibliography_patterns
+
+
+def _iter_matches_baseline(sources, text):
+    """
+    Coincidencias sin solapamiento en las que gana, en cada posición, la primera
+    variante que coincide, buscando cada variante por separado con re.
+    """
+    compiled = [re.compile(source, re.MULTILINE) for source in sources]
+    result = []
+    pos = 0
+    while pos <= len(text):
+        found = [(match.start(), i, match) for i, pattern in enumerate(compiled)
+                 for match in [pattern.search(text, pos)] if match]
+        if not found:
+            break
+        start = min(start for start, _, _ in found)
+        # En la posición más temprana, la primera variante que coincide en ella
+        i = next(i for i, pattern in enumerate(compiled) if pattern.match(text, start))
+        match = compiled[i].match(text, start)
+        result.append((i, match.span(), match.groupdict()))
+        pos = match.end() if match.end() > start else start + 1
+    return result
+
+
+def _variant_groups(i, match, names):
+    # Los grupos del comienzo compartido no llevan sufijo (ver _compile_union)
+    groups = match.groupdict()
+    return {name: groups[f'{name}__{i}'] if f'{name}__{i}' in groups else groups[name] for name in names}
+
+
+def _iter_matches(patterns, style, text, pattern_type):
+    result = []
+    for i, match in patterns.iter_matches(style, text, pattern_type):
+        names = re.compile(_sources(patterns, pattern_type)[style][i]).groupindex
+        result.append((i, match.span(), _variant_groups(i, match, names)))
+    return result
+
+
+@pytest.mark.parametrize('pattern_type', PATTERN_TYPES)
+def test_matches_any_equals_search(patterns, pattern_type):
+    lines = SAMPLE_TEXT.split('\n') + [SAMPLE_TEXT, '', 'sin citas']
+    for style, sources in _sources(patterns, pattern_type).items():
+        for text in lines:
+            expected = any(re.search(source, text, re.MULTILINE) for source in sources)
+            assert patterns.matches_any(style, text, pattern_type) == expected
+
+
+def test_matches_any_unknown_type(patterns):
+    assert not patterns.matches_any('APA', SAMPLE_TEXT, 'headers')
+
+
+@pytest.mark.parametrize('pattern_type', PATTERN_TYPES)
+def test_iter_matches_equals_finditer(patterns, pattern_type):
+    for style, sources in _sources(patterns, pattern_type).items():
+        assert _iter_matches(patterns, style, SAMPLE_TEXT, pattern_type) == _iter_matches_baseline(sources, SAMPLE_TEXT)
+
+
+def test_iter_matches_finds_each_style(patterns):
+    styles = {style for style in patterns.in_text_patterns if list(patterns.iter_matches(style, SAMPLE_TEXT))}
+    assert {'APA', 'MLA', 'IEEE', 'VANCOUVER', 'CHICAGO_NOTES'} <= styles
+
+
+def test_candidate_styles_keep_matching_styles(patterns):
+    for line in SAMPLE_TEXT.split('\n') + list(SAMPLE_BIBLIOGRAPHY.values()):
+        candidates = patterns.candidate_styles(line)
+        matching = [
+            style for style, sources in patterns.bibliography_patterns.items()
+            if any(re.match(source, line, re.MULTILINE) for source in sources)
+        ]
+        assert set(matching) <= set(candidates)
+        assert candidates == [style for style in patterns.bibliography_patterns if style in candidates]
+
+
+def test_candidate_styles_reject_by_prelude(patterns):
+    assert 'IEEE' not in patterns.candidate_styles('Smith, J. A. (2020). A book title. Penguin.')
+    assert 'APA' not in patterns.candidate_styles('[1] J. Doe, "A paper title", IEEE Trans.')
+
+
+def _header_spans_baseline(patterns, text):
+    expected = []
+    for style, headers in patterns.bibliography_headers.items():
+        for header in headers:
+            literal = CitationPatterns._LITERAL_HEADER_RE.fullmatch(header)
+            if literal and literal.group(1) == re.escape(literal.group(1)).replace('\\ ', ' '):
+                expected.extend((match.end(), (style, literal.group(1)))
+                                for match in re.finditer(header, text, re.MULTILINE))
+    return sorted(expected)
+
+
+def test_find_header_spans_equals_finditer(patterns):
+    found = sorted(patterns.find_header_spans(SAMPLE_TEXT.lower()))
+    assert found == _header_spans_baseline(patterns, SAMPLE_TEXT)
+    assert ('APA', 'References') in [value for _, value in found]
+
+
+def test_find_header_spans_without_automaton(patterns):
+    plain = CitationPatterns()
+    plain._header_automaton = None
+    assert sorted(plain.find_header_spans(SAMPLE_TEXT.lower())) == _header_spans_baseline(plain, SAMPLE_TEXT)
+
+
+def _assert_same_matches(optional, patterns):
+    for pattern_type in PATTERN_TYPES:
+        for style in _sources(patterns, pattern_type):
+            assert optional.matches_any(style, SAMPLE_TEXT, pattern_type) == patterns.matches_any(style, SAMPLE_TEXT, pattern_type)
+            assert _iter_matches(optional, style, SAMPLE_TEXT, pattern_type) == _iter_matches(patterns, style, SAMPLE_TEXT, pattern_type)
+            for compiled, plain in zip(optional.get_pattern(style, pattern_type), patterns.get_pattern(style, pattern_type)):
+                assert _matches(compiled, SAMPLE_TEXT) == _matches(plain, SAMPLE_TEXT)
+
+
+def test_re2_backend_matches_re(patterns):
+    pytest.importorskip('re2')
+    from citation_detector.core.patterns import Re2Pattern
+    
+    optional = CitationPatterns(use_re2=True)
+    assert isinstance(optional.get_pattern('APA', 'in_text', 0), Re2Pattern)
+    _assert_same_matches(optional, patterns)
+
+
+def test_pcre2_backend_matches_re(patterns):
+    pytest.importorskip('pcre2')
+    
+    optional = CitationPatterns(use_pcre_jit=True)
+    assert not isinstance(optional.get_pattern('APA', 'in_text', 0), re.Pattern)
+    _assert_same_matches(optional, patterns)
+
+
+def test_ahocorasick_header_automaton(patterns):
+    pytest.importorskip('ahocorasick')
+    
+    assert patterns._header_automaton is not None
+    assert sorted(patterns.find_header_spans(SAMPLE_TEXT.lower())) == _header_spans_baseline(patterns, SAMPLE_TEXT)